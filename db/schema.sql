@@ -2,6 +2,7 @@
 
 CREATE TABLE IF NOT EXISTS floor_plans (
   id SERIAL PRIMARY KEY,
+  property_id TEXT NOT NULL DEFAULT 'maa-rocky-point',
   name TEXT NOT NULL,
   beds INTEGER NOT NULL,
   baths NUMERIC(3,1) NOT NULL,
@@ -15,6 +16,7 @@ CREATE TABLE IF NOT EXISTS floor_plans (
 
 CREATE TABLE IF NOT EXISTS apartments (
   id SERIAL PRIMARY KEY,
+  property_id TEXT NOT NULL DEFAULT 'maa-rocky-point',
   unit_number TEXT,
   floor_plan_id INTEGER REFERENCES floor_plans(id),
   composite_key TEXT UNIQUE NOT NULL,
@@ -98,9 +100,158 @@ CREATE TABLE IF NOT EXISTS scrape_logs (
   units_removed INTEGER DEFAULT 0,
   error_message TEXT,
   duration_seconds NUMERIC(10,2),
-  github_run_id TEXT
+  github_run_id TEXT,
+  short_circuited BOOLEAN DEFAULT FALSE,
+  phase_timings JSONB,
+  traffic JSONB,
+  source_results JSONB,
+  property_results JSONB
 );
 
+-- Content hash of what each source's parser read on the last fully persisted
+-- run. A run whose hashes all match skips parsing and per-unit writes.
+-- Keyed by work item: the source name for the default property, otherwise
+-- "<property_id>/<source>".
+CREATE TABLE IF NOT EXISTS source_snapshots (
+  source TEXT PRIMARY KEY,
+  content_hash TEXT NOT NULL,
+  unit_count INTEGER DEFAULT 0,
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Aggregates over the units each run saw, written by the scraper so the
+-- dashboard reads precomputed rows instead of scanning apartments and
+-- price_history. Runs that parse nothing new (short-circuited or failed)
+-- carry the latest row forward, so every run date has one. Each group holds {"available", "priced", "min_price",
+-- "median_price", "max_price", "mean_price", "median_price_per_sq_ft"};
+-- by_floor_plan / by_beds are keyed by plan name / bed count, prefixed with
+-- "<property_id>/" outside the default property. partial marks a run that
+-- covered only some properties, whose overall figures leave the rest out.
+-- deltas holds the change in those figures since the latest snapshot from an
+-- earlier date.
+CREATE TABLE IF NOT EXISTS stats_snapshots (
+  id SERIAL PRIMARY KEY,
+  snapshot_date DATE NOT NULL,
+  captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  unit_count INTEGER NOT NULL DEFAULT 0,
+  partial BOOLEAN NOT NULL DEFAULT FALSE,
+  overall JSONB NOT NULL,
+  by_floor_plan JSONB NOT NULL,
+  by_beds JSONB NOT NULL,
+  deltas JSONB
+);
+
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS short_circuited BOOLEAN DEFAULT FALSE;
+-- {"<dotted phase>": {"seconds": ..., "calls": ..., <counts>}} per run.
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS phase_timings JSONB;
+-- Browser requests, blocks and response bytes by resource type and host.
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS traffic JSONB;
+-- {"<source>": {"status": "success|failed|skipped", "attempts": ..., "error": ...}};
+-- read back by the scraper's circuit breaker.
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS source_results JSONB;
+-- {"<property_id>": {"success": ..., "failed": ..., "skipped": ..., "units": ...,
+--   "fetch_seconds": ..., "units_per_second": ...}} per run.
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS property_results JSONB;
+
+-- Multi-property mode. Rows that predate it belong to the original community,
+-- whose composite keys stay unprefixed; other properties' keys start with
+-- "<property_id>:".
+ALTER TABLE floor_plans ADD COLUMN IF NOT EXISTS property_id TEXT NOT NULL DEFAULT 'maa-rocky-point';
+ALTER TABLE apartments ADD COLUMN IF NOT EXISTS property_id TEXT NOT NULL DEFAULT 'maa-rocky-point';
+
 CREATE INDEX IF NOT EXISTS idx_apartments_available ON apartments(is_available);
+CREATE INDEX IF NOT EXISTS idx_apartments_property ON apartments(property_id, is_available);
 CREATE INDEX IF NOT EXISTS idx_apartments_price ON apartments(current_price);
 CREATE INDEX IF NOT EXISTS idx_price_history_apartment ON price_history(apartment_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_stats_snapshots_date ON stats_snapshots(snapshot_date, captured_at);
+
+-- Latest price per apartment. Ordering both DISTINCT ON keys descending lets
+-- Postgres walk idx_price_history_apartment backwards instead of sorting.
+CREATE OR REPLACE VIEW latest_price_history AS
+SELECT DISTINCT ON (apartment_id) apartment_id, price, recorded_at
+FROM price_history
+ORDER BY apartment_id DESC, recorded_at DESC;
+
+-- The apartments with the given composite keys, for the scraper's per-batch
+-- diff. An RPC so the keys travel in the request body: as an IN filter a
+-- batch of keys, quoted where they contain ":", can overflow the URL.
+CREATE OR REPLACE FUNCTION apartments_by_keys(keys TEXT[])
+RETURNS SETOF apartments
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT * FROM apartments WHERE composite_key = ANY(keys);
+$$;
+
+-- Marks every available apartment of the given properties whose key was not
+-- seen in the latest run as unavailable and returns the number of rows changed.
+-- Properties whose sources all failed are left out by the caller. Bumping
+-- updated_at lets incremental exports (scraper/analytics/archive.py) see the
+-- availability change.
+DROP FUNCTION IF EXISTS mark_stale_units(TEXT[]);
+CREATE OR REPLACE FUNCTION mark_stale_units(seen_keys TEXT[], property_ids TEXT[])
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+  WITH updated AS (
+    UPDATE apartments
+    SET is_available = FALSE, updated_at = NOW()
+    WHERE is_available
+      AND property_id = ANY(property_ids)
+      AND NOT (composite_key = ANY(seen_keys))
+    RETURNING 1
+  )
+  SELECT COUNT(*)::INTEGER FROM updated;
+$$;
+
+-- One-off migration for the card number scan (scraper/utils/parsing.py
+-- parse_card_numbers). MAA cards used to take their sq_ft from the first 3-4
+-- digit number on the card, usually the unit number ("Unit B-312" -> 312), and
+-- sq_ft is part of the composite key. After the first run on the new parser
+-- every such unit exists twice: the old row, now unavailable, and a new row
+-- under the corrected key. This folds each old row into its replacement --
+-- same property, unit number, plan, beds and baths, first seen no earlier
+-- than the old row was last seen -- moving its price history, images and
+-- saved entry across and keeping the earlier first_seen_at, then deletes the
+-- old row. Returns the number of rows merged. Run it once, after that first
+-- run. Rows with placeholder unit numbers (Apartments.com's APT-NNN, MAA
+-- cards without a unit number) are left alone: those numbers are card
+-- positions, so an old row can't be matched to its replacement.
+CREATE OR REPLACE FUNCTION merge_rekeyed_apartments()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  merged INTEGER;
+BEGIN
+  CREATE TEMP TABLE rekeyed ON COMMIT DROP AS
+  SELECT DISTINCT ON (prev.id) prev.id AS old_id, cur.id AS new_id, prev.first_seen_at
+  FROM apartments prev
+  JOIN apartments cur
+    ON cur.property_id = prev.property_id
+   AND cur.unit_number = prev.unit_number
+   AND cur.floor_plan_id IS NOT DISTINCT FROM prev.floor_plan_id
+   AND cur.beds = prev.beds
+   AND cur.baths = prev.baths
+   AND cur.composite_key <> prev.composite_key
+   AND cur.first_seen_at >= prev.last_seen_at
+  WHERE NOT prev.is_available
+    AND cur.is_available
+    AND prev.unit_number !~ '^(APT|MAA)-\d{3,}$'
+  ORDER BY prev.id, cur.first_seen_at;
+
+  UPDATE price_history ph SET apartment_id = r.new_id FROM rekeyed r WHERE ph.apartment_id = r.old_id;
+  UPDATE images i SET apartment_id = r.new_id FROM rekeyed r WHERE i.apartment_id = r.old_id;
+  UPDATE saved_apartments s SET apartment_id = r.new_id
+  FROM rekeyed r
+  WHERE s.apartment_id = r.old_id
+    AND NOT EXISTS (SELECT 1 FROM saved_apartments kept WHERE kept.apartment_id = r.new_id);
+  UPDATE apartments a
+  SET first_seen_at = LEAST(a.first_seen_at, r.first_seen_at), updated_at = NOW()
+  FROM rekeyed r
+  WHERE a.id = r.new_id;
+  DELETE FROM apartments a USING rekeyed r WHERE a.id = r.old_id;
+  GET DIAGNOSTICS merged = ROW_COUNT;
+  RETURN merged;
+END;
+$$;
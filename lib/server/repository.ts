@@ -343,8 +343,18 @@ export async function getStats() {
     };
   }
 
-  const [apartmentRows, savedRows] = await Promise.all([
-    supabase.from("apartments").select("id,current_price,is_available"),
+  // Availability and price come from the scraper's latest full
+  // stats_snapshots row; a partial one's overall leaves properties out.
+  const [snapshot, totalRows, savedRows] = await Promise.all([
+    supabase
+      .from("stats_snapshots")
+      .select("overall")
+      .eq("partial", false)
+      .order("snapshot_date", { ascending: false })
+      .order("captured_at", { ascending: false })
+      .limit(1)
+      .maybeSingle(),
+    supabase.from("apartments").select("id", { count: "exact", head: true }),
     supabase.from("saved_apartments").select("id", { count: "exact", head: true }),
   ]);
 
@@ -355,18 +365,14 @@ export async function getStats() {
     saved_count: savedInMemory.size,
   };
 
-  if (apartmentRows.error || !apartmentRows.data) return fallback;
+  if (snapshot.error || !snapshot.data) return fallback;
 
-  const available = apartmentRows.data.filter((row) => row.is_available);
-  const avg =
-    available.length > 0
-      ? available.reduce((sum, row) => sum + toNumber(row.current_price), 0) / available.length
-      : 0;
+  const overall = (snapshot.data.overall ?? {}) as Record<string, unknown>;
 
   return {
-    available_count: available.length,
-    total_count: apartmentRows.data.length,
-    avg_price: Math.round(avg),
+    available_count: toNumber(overall.available),
+    total_count: totalRows.count ?? 0,
+    avg_price: Math.round(toNumber(overall.mean_price)),
     saved_count: savedRows.count ?? 0,
   };
 }
@@ -400,6 +406,38 @@ function getPriceTrendsFromMock() {
   };
 }
 
+type TrendPoint = { date: string; avg_price: number; available_count: number };
+
+// Daily points from the scraper's precomputed stats_snapshots rows; the last
+// snapshot of each day stands for that day.
+function getPriceTrendsFromSnapshots(rows: Record<string, unknown>[]) {
+  const byDate = new Map<string, Record<string, Record<string, unknown>>>();
+  for (const row of rows) {
+    const date = String(row.snapshot_date ?? "");
+    if (!byDate.has(date)) byDate.set(date, (row.by_beds ?? {}) as Record<string, Record<string, unknown>>);
+  }
+
+  const dates = [...byDate.keys()].sort();
+  const result: Record<string, TrendPoint[]> = { "1": [], "2": [], "3": [] };
+  for (const date of dates) {
+    const byBeds = byDate.get(date) ?? {};
+    for (const beds of Object.keys(result)) {
+      const stats = byBeds[beds];
+      if (!stats || stats.mean_price == null) continue;
+      result[beds].push({
+        date,
+        avg_price: Math.round(toNumber(stats.mean_price)),
+        available_count: toNumber(stats.available),
+      });
+    }
+  }
+
+  return {
+    date_range: { start: dates[0], end: dates[dates.length - 1] },
+    trends_by_beds: result,
+  };
+}
+
 export async function getPriceTrends() {
   const supabase = getSupabaseServerClient();
 
@@ -407,6 +445,16 @@ export async function getPriceTrends() {
     return getPriceTrendsFromMock();
   }
 
+  const snapshots = await supabase
+    .from("stats_snapshots")
+    .select("snapshot_date,by_beds")
+    .order("captured_at", { ascending: false })
+    .limit(180);
+
+  if (!snapshots.error && snapshots.data?.length) {
+    return getPriceTrendsFromSnapshots(snapshots.data);
+  }
+
   const { data, error } = await supabase.from("apartments").select("beds,current_price,is_available");
 
   if (error || !data) {
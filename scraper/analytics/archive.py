@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import json
+import os
+import warnings
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Column dtypes per archived table. Timestamps are epoch seconds, missing ids
+# and timestamps are -1.
+PRICE_HISTORY_COLUMNS: dict[str, np.dtype] = {
+    "id": np.dtype(np.int64),
+    "apartment_id": np.dtype(np.int64),
+    "price": np.dtype(np.float64),
+    "recorded_at": np.dtype(np.int64),
+}
+APARTMENT_COLUMNS: dict[str, np.dtype] = {
+    "id": np.dtype(np.int64),
+    "floor_plan_id": np.dtype(np.int64),
+    "beds": np.dtype(np.int64),
+    "is_available": np.dtype(np.bool_),
+    "first_seen_at": np.dtype(np.int64),
+    "last_seen_at": np.dtype(np.int64),
+}
+EXPORT_PAGE_SIZE = 1000
+# price_history ids already past the watermark that a sync re-reads: ids are
+# handed out at insert, so a slow transaction can commit a lower id after a
+# sync has read higher ones.
+PRICE_HISTORY_OVERLAP = 500
+DAY_SECONDS = 86_400
+MISSING = -1
+
+Columns = dict[str, np.ndarray]
+
+
+def _epoch(value: str | None) -> int:
+    if not value:
+        return MISSING
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return int(parsed.timestamp())
+
+
+def _columns(rows: list[dict[str, Any]], dtypes: dict[str, np.dtype], times: tuple[str, ...]) -> Columns:
+    columns: Columns = {}
+    for name, dtype in dtypes.items():
+        if name in times:
+            values = [_epoch(row.get(name)) for row in rows]
+        else:
+            values = [MISSING if row.get(name) is None else row[name] for row in rows]
+        columns[name] = np.asarray(values, dtype=dtype)
+    return columns
+
+
+def rolling_median(values: np.ndarray, window: int) -> np.ndarray:
+    """Median of each ``window``-long run of ``values`` ending at that point; NaN until the window fills."""
+
+    result = np.full(len(values), np.nan)
+    if window < 1 or len(values) < window:
+        return result
+    with warnings.catch_warnings():
+        # Windows with no prices at all are expected and stay NaN.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        result[window - 1 :] = np.nanmedian(sliding_window_view(values, window), axis=1)
+    return result
+
+
+@dataclass(slots=True)
+class ArchiveSync:
+    price_history_rows: int = 0
+    apartment_rows: int = 0
+    watermarks: dict[str, Any] = field(default_factory=dict)
+
+
+class PriceArchive:
+    """Columnar copy of ``price_history`` and ``apartments`` on local disk.
+
+    Each column is a flat binary file read back through ``np.memmap``, so
+    queries over years of history touch only the columns they use and never
+    the database. ``sync`` pulls what changed since the stored watermarks:
+    ``price_history`` is append-only and is appended by ``id``, re-reading the
+    last ``PRICE_HISTORY_OVERLAP`` ids for late commits; ``apartments`` rows
+    are re-read from the ``updated_at`` watermark on (inclusive, since a
+    run stamps all its rows with one time) and merged by ``id``.
+    ``meta.json`` holds the row counts and file generations and is replaced
+    last, so an interrupted sync leaves the previous archive intact.
+    """
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+        self._meta = self._load_meta()
+
+    @property
+    def watermarks(self) -> dict[str, Any]:
+        return dict(self._meta["watermarks"])
+
+    @property
+    def synced_at(self) -> int:
+        """Epoch seconds of the last sync; the "now" for units still on the market."""
+
+        return int(self._meta["synced_at"])
+
+    def table(self, name: str) -> Columns:
+        """The archived table's columns as read-only memory maps."""
+
+        rows = self._meta["rows"].get(name, 0)
+        columns: Columns = {}
+        for column, dtype in self._dtypes(name).items():
+            if rows == 0:
+                columns[column] = np.empty(0, dtype=dtype)
+            else:
+                columns[column] = np.memmap(self._path(name, column), dtype=dtype, mode="r", shape=(rows,))
+        return columns
+
+    def sync(self, supabase: Client, page_size: int = EXPORT_PAGE_SIZE) -> ArchiveSync:
+        """Export ``price_history`` and ``apartments`` rows newer than the watermarks."""
+
+        result = ArchiveSync()
+        watermarks = self._meta["watermarks"]
+
+        last_id = watermarks.get("price_history_id", 0)
+        after_id = max(last_id - PRICE_HISTORY_OVERLAP, 0)
+        archived = np.asarray(self.table("price_history")["id"])
+        known = set(archived[archived > after_id].tolist())
+        while True:
+            rows = (
+                supabase.table("price_history")
+                .select("id,apartment_id,price,recorded_at")
+                .gt("id", after_id)
+                .order("id")
+                .limit(page_size)
+                .execute()
+            ).data or []
+            fresh = [row for row in rows if row["id"] not in known]
+            if fresh:
+                self._append("price_history", _columns(fresh, PRICE_HISTORY_COLUMNS, ("recorded_at",)))
+                result.price_history_rows += len(fresh)
+            if rows:
+                after_id = rows[-1]["id"]
+                last_id = max(last_id, after_id)
+            if len(rows) < page_size:
+                break
+
+        changed: list[dict[str, Any]] = []
+        updated_since = watermarks.get("apartments_updated_at")
+        # Keyset pages over (updated_at, id): ``tie`` is the last row of a full
+        # page, whose timestamp may have more rows left.
+        tie: tuple[str, int] | None = None
+        inclusive = True
+        while True:
+            query = supabase.table("apartments").select(
+                "id,floor_plan_id,beds,is_available,first_seen_at,last_seen_at,updated_at"
+            )
+            if tie is not None:
+                query = query.eq("updated_at", tie[0]).gt("id", tie[1])
+            elif updated_since:
+                query = query.gte("updated_at", updated_since) if inclusive else query.gt("updated_at", updated_since)
+            rows = query.order("updated_at").order("id").limit(page_size).execute().data or []
+            changed.extend(rows)
+            if len(rows) == page_size:
+                tie = (rows[-1]["updated_at"], rows[-1]["id"])
+            elif tie is not None:
+                updated_since, inclusive, tie = tie[0], False, None
+            else:
+                break
+        if changed:
+            self._merge("apartments", _columns(changed, APARTMENT_COLUMNS, ("first_seen_at", "last_seen_at")))
+            result.apartment_rows = len(changed)
+            updated_since = max((row["updated_at"] for row in changed if row.get("updated_at")), default=updated_since)
+
+        watermarks.update(price_history_id=last_id, apartments_updated_at=updated_since)
+        self._meta["synced_at"] = int(datetime.now(UTC).timestamp())
+        self._save_meta()
+        result.watermarks = self.watermarks
+        return result
+
+    def price_series(self, apartment_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Every recorded price of one unit, oldest first, as (datetime64[s] times, prices)."""
+
+        history = self.table("price_history")
+        rows = np.flatnonzero(history["apartment_id"] == apartment_id)
+        rows = rows[np.argsort(history["recorded_at"][rows], kind="stable")]
+        return history["recorded_at"][rows].astype("datetime64[s]"), np.asarray(history["price"][rows])
+
+    def daily_prices(
+        self,
+        floor_plan_id: int | None = None,
+        apartment_ids: list[int] | None = None,
+        start: np.datetime64 | None = None,
+        end: np.datetime64 | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Each selected unit's asking price on each day it was listed.
+
+        Returns ``(days, apartment_ids, prices)`` where ``prices`` is units x
+        days: history only records changes, so each day carries the unit's
+        last recorded price forward, and days off the market are NaN.
+        """
+
+        apartments = self.table("apartments")
+        selected = np.ones(len(apartments["id"]), dtype=bool)
+        if floor_plan_id is not None:
+            selected &= apartments["floor_plan_id"] == floor_plan_id
+        if apartment_ids is not None:
+            selected &= np.isin(apartments["id"], apartment_ids)
+        ids = np.asarray(apartments["id"][selected])
+
+        history = self.table("price_history")
+        keep = np.flatnonzero(np.isin(history["apartment_id"], ids))
+        days_seen = history["recorded_at"][keep] // DAY_SECONDS
+        last = self.synced_at // DAY_SECONDS if end is None else self._day(end)
+        if start is not None:
+            first = self._day(start)
+        else:
+            first = int(days_seen.min()) if keep.size else last + 1
+        days = np.arange(first, last + 1)
+        prices = np.full((ids.size, days.size), np.nan)
+        keep = keep[days_seen <= last]
+        if not keep.size or not days.size:
+            return days.astype("datetime64[D]"), ids, prices
+
+        # Sort observations by (unit, day, id) and key them on a units x days
+        # grid; the last observation at or before each cell is its price.
+        unit = np.searchsorted(ids, history["apartment_id"][keep])
+        offset = np.clip(history["recorded_at"][keep] // DAY_SECONDS - first, 0, None)
+        order = np.lexsort((history["id"][keep], offset, unit))
+        unit, offset, price = unit[order], offset[order], np.asarray(history["price"][keep][order])
+        rows = np.arange(ids.size)[:, None]
+        found = np.searchsorted(unit * days.size + offset, rows * days.size + np.arange(days.size), side="right") - 1
+        found_unit = unit[np.clip(found, 0, None)]
+        prices = np.where((found >= 0) & (found_unit == rows), price[np.clip(found, 0, None)], np.nan)
+
+        listed_from = apartments["first_seen_at"][selected] // DAY_SECONDS
+        listed_to = np.where(
+            apartments["is_available"][selected], last, apartments["last_seen_at"][selected] // DAY_SECONDS
+        )
+        prices[(days < listed_from[:, None]) | (days > listed_to[:, None])] = np.nan
+        return days.astype("datetime64[D]"), ids, prices
+
+    def median_trend(
+        self,
+        floor_plan_id: int | None = None,
+        window: int = 7,
+        start: np.datetime64 | None = None,
+        end: np.datetime64 | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Daily median asking price across listed units and its ``window``-day rolling median."""
+
+        days, _ids, prices = self.daily_prices(floor_plan_id=floor_plan_id, start=start, end=end)
+        daily = np.full(days.size, np.nan)
+        if prices.size:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                daily = np.nanmedian(prices, axis=0)
+        return days, daily, rolling_median(daily, window)
+
+    def days_available(self, floor_plan_id: int | None = None, as_of: np.datetime64 | None = None) -> np.ndarray:
+        """Days each unit has been on the market, up to ``as_of`` (default: last sync) if still listed.
+
+        ``np.percentile`` or ``np.histogram`` of the result gives the
+        time-on-market distribution.
+        """
+
+        apartments = self.table("apartments")
+        selected = apartments["first_seen_at"] != MISSING
+        if floor_plan_id is not None:
+            selected &= apartments["floor_plan_id"] == floor_plan_id
+        now = self.synced_at if as_of is None else int(as_of.astype("datetime64[s]").astype(np.int64))
+        until = np.where(apartments["is_available"], now, apartments["last_seen_at"])[selected]
+        return (until - apartments["first_seen_at"][selected]) / DAY_SECONDS
+
+    def _append(self, name: str, columns: Columns) -> None:
+        rows = self._meta["rows"].get(name, 0)
+        for column, dtype in self._dtypes(name).items():
+            path = self._path(name, column)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "r+b" if path.exists() else "wb") as handle:
+                # Drop any tail an interrupted sync wrote past the recorded count.
+                handle.truncate(rows * dtype.itemsize)
+                handle.seek(0, os.SEEK_END)
+                columns[column].astype(dtype).tofile(handle)
+        self._meta["rows"][name] = rows + len(next(iter(columns.values())))
+
+    def _merge(self, name: str, columns: Columns) -> None:
+        # Later rows win for the same id; the table stays sorted by id. The
+        # result goes to a new file generation that meta.json switches to.
+        current = {column: np.asarray(values) for column, values in self.table(name).items()}
+        merged = {column: np.concatenate((current[column], columns[column])) for column in current}
+        ids = merged["id"][::-1]
+        _unique, last = np.unique(ids, return_index=True)
+        keep = len(ids) - 1 - last
+        generation = self._meta["generations"].get(name, 0) + 1
+        for column, values in merged.items():
+            path = self._path(name, column, generation)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            values[keep].astype(self._dtypes(name)[column]).tofile(path)
+        self._meta["generations"][name] = generation
+        self._meta["rows"][name] = len(keep)
+
+    def _dtypes(self, name: str) -> dict[str, np.dtype]:
+        return {"price_history": PRICE_HISTORY_COLUMNS, "apartments": APARTMENT_COLUMNS}[name]
+
+    def _path(self, name: str, column: str, generation: int | None = None) -> Path:
+        if generation is None:
+            generation = self._meta["generations"].get(name, 0)
+        return self.root / name / f"{column}.{generation}.bin"
+
+    def _day(self, value: np.datetime64) -> int:
+        return int(np.datetime64(value, "D").astype(np.int64))
+
+    def _load_meta(self) -> dict[str, Any]:
+        path = self.root / "meta.json"
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        return {"rows": {}, "generations": {}, "watermarks": {}, "synced_at": 0}
+
+    def _save_meta(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        scratch = self.root / "meta.json.tmp"
+        scratch.write_text(json.dumps(self._meta, indent=2), encoding="utf-8")
+        os.replace(scratch, self.root / "meta.json")
+        current = {self._path(name, column) for name in self._meta["rows"] for column in self._dtypes(name)}
+        for path in self.root.glob("*/*.bin"):
+            if path not in current:
+                path.unlink()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from config import DEFAULT_PROPERTY_ID
+from scrapers.base import ScrapedUnit
+
+GroupStats = dict[str, Any]
+
+# Fields compared against the previous snapshot.
+DELTA_FIELDS = ("available", "median_price", "mean_price", "median_price_per_sq_ft")
+
+
+class _Summary(NamedTuple):
+    count: np.ndarray
+    minimum: np.ndarray
+    median: np.ndarray
+    maximum: np.ndarray
+    mean: np.ndarray
+
+
+@dataclass(slots=True)
+class StatsSnapshot:
+    """Price and availability aggregates over one run's units, keyed by group label.
+
+    ``partial`` marks a snapshot that covers only some properties, so its
+    ``overall`` figures are not comparable with a full one.
+    """
+
+    unit_count: int
+    overall: GroupStats
+    by_floor_plan: dict[str, GroupStats]
+    by_beds: dict[str, GroupStats]
+    partial: bool = False
+    deltas: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> StatsSnapshot:
+        """A stored ``stats_snapshots`` row's aggregates, without its deltas."""
+
+        return cls(
+            unit_count=row.get("unit_count") or 0,
+            overall=row.get("overall") or {},
+            by_floor_plan=row.get("by_floor_plan") or {},
+            by_beds=row.get("by_beds") or {},
+            partial=bool(row.get("partial")),
+        )
+
+
+def _label(property_id: str, label: str) -> str:
+    # Same convention as work keys: bare for the default property.
+    return label if property_id == DEFAULT_PROPERTY_ID else f"{property_id}/{label}"
+
+
+def _summarize(codes: np.ndarray, values: np.ndarray, groups: int) -> _Summary:
+    """Count, min, median, max and mean of ``values`` per group code, NaNs ignored, from one sort."""
+
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    count = np.bincount(codes, minlength=groups)
+    empty = np.full(groups, np.nan)
+    if not values.size:
+        return _Summary(count, empty, empty, empty, empty)
+
+    # Groups are contiguous after the sort, so each one's order statistics
+    # sit at fixed offsets from its start; empty groups are masked to NaN.
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    last = np.clip(start + count - 1, 0, values.size - 1)
+    low = np.clip(start + (count - 1) // 2, 0, values.size - 1)
+    high = np.clip(start + count // 2, 0, values.size - 1)
+    present = count > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(codes, weights=values, minlength=groups) / count
+    return _Summary(
+        count,
+        np.where(present, values[np.clip(start, 0, values.size - 1)], np.nan),
+        np.where(present, (values[low] + values[high]) / 2, np.nan),
+        np.where(present, values[last], np.nan),
+        np.where(present, mean, np.nan),
+    )
+
+
+def _number(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _table(labels: list[str], prices: np.ndarray, per_sq_ft: np.ndarray) -> dict[str, GroupStats]:
+    names, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    groups = len(names)
+    available = np.bincount(codes, minlength=groups)
+    price = _summarize(codes, prices, groups)
+    rate = _summarize(codes, per_sq_ft, groups)
+    return {
+        str(name): {
+            "available": int(available[i]),
+            "priced": int(price.count[i]),
+            "min_price": _number(price.minimum[i]),
+            "median_price": _number(price.median[i]),
+            "max_price": _number(price.maximum[i]),
+            "mean_price": _number(price.mean[i]),
+            "median_price_per_sq_ft": _number(rate.median[i]),
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def compute_stats(units: Sequence[ScrapedUnit], partial: bool = False) -> StatsSnapshot:
+    """Aggregate the currently listed units overall, per floor plan and per bed count.
+
+    Every unit a run sees is on the market, so ``available`` is the group's
+    unit count. Units without a price (or sq_ft) are counted but left out of
+    the price (or price-per-sq-ft) figures.
+    """
+
+    prices = np.array([np.nan if unit.price is None else unit.price for unit in units], dtype=float)
+    sq_ft = np.array([unit.sq_ft or np.nan for unit in units], dtype=float)
+    per_sq_ft = prices / sq_ft
+
+    overall = _table(["all"] * len(units), prices, per_sq_ft).get("all") or {"available": 0, "priced": 0}
+    return StatsSnapshot(
+        unit_count=len(units),
+        overall=overall,
+        by_floor_plan=_table([_label(u.property_id, u.floor_plan_name) for u in units], prices, per_sq_ft),
+        by_beds=_table([_label(u.property_id, str(u.beds)) for u in units], prices, per_sq_ft),
+        partial=partial,
+    )
+
+
+def _delta(current: GroupStats, previous: GroupStats) -> GroupStats:
+    return {
+        name: None
+        if current.get(name) is None or previous.get(name) is None
+        else round(current[name] - previous[name], 2)
+        for name in DELTA_FIELDS
+    }
+
+
+def day_over_day(snapshot: StatsSnapshot, previous: dict[str, Any] | None) -> dict[str, Any]:
+    """Change in each of this snapshot's groups since ``previous`` (a stored row); empty without one.
+
+    Groups that were not listed in ``previous`` have no delta, and neither
+    does ``overall`` when either side is partial.
+    """
+
+    if not previous:
+        return {}
+    comparable = not snapshot.partial and not previous.get("partial")
+    return {
+        "overall": _delta(snapshot.overall, previous.get("overall") or {}) if comparable else {},
+        "by_floor_plan": {
+            label: _delta(stats, previous["by_floor_plan"][label])
+            for label, stats in snapshot.by_floor_plan.items()
+            if label in (previous.get("by_floor_plan") or {})
+        },
+        "by_beds": {
+            label: _delta(stats, previous["by_beds"][label])
+            for label, stats in snapshot.by_beds.items()
+            if label in (previous.get("by_beds") or {})
+        },
+    }
@@ -1,9 +1,34 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from typing import Final
 
 REQUEST_DELAY_SECONDS: Final[tuple[int, int]] = (2, 5)
 STALE_THRESHOLD_HOURS: Final[int] = 18
 MAX_RETRIES: Final[int] = 3
+# A source that failed this many runs in a row is skipped until the cooldown
+# since its last attempt has passed.
+CIRCUIT_FAILURE_THRESHOLD: Final[int] = 3
+CIRCUIT_COOLDOWN_HOURS: Final[int] = 12
+PERSIST_BATCH_SIZE: Final[int] = 200
+# Streaming persistence flushes a batch once it holds PERSIST_BATCH_SIZE units
+# or its first unit has waited this long. Parsing blocks once
+# UNIT_QUEUE_SIZE units are waiting to be written.
+PERSIST_FLUSH_MS: Final[int] = 500
+UNIT_QUEUE_SIZE: Final[int] = 2 * PERSIST_BATCH_SIZE
+# Workers draining the (property x source) queue; they share one browser.
+SOURCE_CONCURRENCY: Final[int] = 2
+SOURCE_TIMEOUT_SECONDS: Final[float] = 240.0
+BROWSER_MAX_PAGES: Final[int] = 4
+READY_TIMEOUT_MS: Final[int] = 20_000
+READY_STABLE_MS: Final[int] = 750
+# After the first availability feed, how long the page must go without another
+# JSON response before the captured feeds count as complete, and the ceiling
+# on that wait.
+FEED_QUIET_MS: Final[int] = 1_000
+FEED_SETTLE_MS: Final[int] = 8_000
+# Per-phase spans logged and saved to scrape_logs.phase_timings; set
+# SCRAPE_PHASE_TIMINGS=0 to turn them into no-ops.
+PHASE_TIMINGS_ENABLED: Final[bool] = os.getenv("SCRAPE_PHASE_TIMINGS", "1") != "0"
 
 USER_AGENTS: Final[list[str]] = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36",
@@ -13,18 +38,91 @@ USER_AGENTS: Final[list[str]] = [
 ]
 
 
+# Resource types no parser needs: aborting them keeps bytes off the proxy.
+BLOCKED_RESOURCE_TYPES: Final[frozenset[str]] = frozenset(
+    {"image", "media", "font", "stylesheet", "manifest", "texttrack"}
+)
+
+# Analytics, ads, chat widgets and session recorders seen on listing pages.
+# A host matches an entry if it equals it or is a subdomain of it.
+BLOCKED_HOSTS: Final[tuple[str, ...]] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "fullstory.com",
+    "intercom.io",
+    "livechatinc.com",
+    "hs-analytics.net",
+    "hs-scripts.com",
+    "hubspot.com",
+    "segment.io",
+    "segment.com",
+    "optimizely.com",
+    "nr-data.net",
+    "newrelic.com",
+    "adsrvr.org",
+    "criteo.com",
+    "tiktok.com",
+    "pinterest.com",
+    "snapchat.com",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "cloudflareinsights.com",
+)
+
+# Bot-check hosts every source must be able to reach.
+CHALLENGE_HOSTS: Final[tuple[str, ...]] = ("challenges.cloudflare.com",)
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingPolicy:
+    """Which browser requests a source lets through.
+
+    ``allowed_domains`` empty means any host not in ``blocked_hosts``;
+    otherwise only those domains (and their subdomains) are fetched.
+    """
+
+    allowed_domains: tuple[str, ...] = ()
+    blocked_resource_types: frozenset[str] = BLOCKED_RESOURCE_TYPES
+    blocked_hosts: tuple[str, ...] = BLOCKED_HOSTS
+
+
 @dataclass(slots=True)
 class ScraperSource:
+    """One site to scrape.
+
+    ``scraper`` is the ``module:Class`` import path of its scraper; the
+    module is imported only when an enabled source is built for a run.
+    """
+
     name: str
     url: str
+    scraper: str = ""
     enabled: bool = True
+    routing: RoutingPolicy = field(default_factory=RoutingPolicy)
 
 
 SOURCES: Final[list[ScraperSource]] = [
-    ScraperSource(name="maa", url="https://www.maac.com/florida/tampa/maa-rocky-point/"),
+    ScraperSource(
+        name="maa",
+        url="https://www.maac.com/florida/tampa/maa-rocky-point/",
+        scraper="scrapers.maa_scraper:MAAScraper",
+        # Availability and floor plan data come from MAA's own hosts and the
+        # SightMap embed; everything else on the page is marketing.
+        routing=RoutingPolicy(allowed_domains=("maac.com", "sightmap.com", *CHALLENGE_HOSTS)),
+    ),
     ScraperSource(
         name="apartments_com",
         url="https://www.apartments.com/maa-rocky-point-tampa-fl/7wemg5w/",
+        scraper="scrapers.apartments_com:ApartmentsComScraper",
+        routing=RoutingPolicy(allowed_domains=("apartments.com", "apartments-cdn.com", *CHALLENGE_HOSTS)),
     ),
     ScraperSource(
         name="rentcafe",
@@ -32,3 +130,47 @@ SOURCES: Final[list[ScraperSource]] = [
         enabled=False,
     ),
 ]
+
+
+def get_source(name: str) -> ScraperSource:
+    for source in SOURCES:
+        if source.name == name:
+            return source
+    raise KeyError(f"unknown source: {name}")
+
+
+# The community the tracker started with. Its composite keys, floor plans and
+# source snapshots predate multi-property mode and stay unprefixed.
+DEFAULT_PROPERTY_ID: Final[str] = "maa-rocky-point"
+
+
+@dataclass(slots=True)
+class PropertyConfig:
+    """A community to track and its listing page on each source.
+
+    ``urls`` maps source name to URL; a source missing from it is not scraped
+    for this property. The default property falls back to each source's
+    ``url``.
+    """
+
+    id: str
+    name: str
+    urls: dict[str, str] = field(default_factory=dict)
+
+    def url_for(self, source: ScraperSource) -> str | None:
+        url = self.urls.get(source.name)
+        if url is None and self.id == DEFAULT_PROPERTY_ID:
+            return source.url
+        return url
+
+
+PROPERTIES: Final[list[PropertyConfig]] = [
+    PropertyConfig(id=DEFAULT_PROPERTY_ID, name="MAA Rocky Point"),
+]
+
+
+def get_property(property_id: str) -> PropertyConfig:
+    for prop in PROPERTIES:
+        if prop.id == property_id:
+            return prop
+    raise KeyError(f"unknown property: {property_id}")
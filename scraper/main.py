@@ -1,21 +1,51 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
-import os
-import re
-from dataclasses import dataclass
+import json
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import structlog
-from supabase import Client
 
-from scrapers.apartments_com import ApartmentsComScraper
-from scrapers.base import ScrapedUnit
-from scrapers.maa_scraper import MAAScraper
-from scrapers.normalizer import normalize_units, summarize_by_source
-from utils.feature_parser import parse_feature_flags
+from config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_PROPERTY_ID,
+    MAX_RETRIES,
+    PERSIST_BATCH_SIZE,
+    PERSIST_FLUSH_MS,
+    PHASE_TIMINGS_ENABLED,
+    SOURCE_CONCURRENCY,
+    SOURCE_TIMEOUT_SECONDS,
+    UNIT_QUEUE_SIZE,
+)
+from persistence.apartments import build_composite_key, mark_stale_units, touch_available_units, upsert_apartments
+from persistence.floor_plans import FloorPlanCache
+from persistence.price_history import PriceObservation, write_price_history
+from persistence.scrape_logs import fetch_recent_source_results
+from persistence.snapshots import (
+    SourceSnapshot,
+    invalidate_source_snapshots,
+    load_source_snapshots,
+    save_source_snapshots,
+)
+from persistence.stats_snapshots import load_stats_snapshot, save_stats_snapshot
+from scrapers.base import FetchResult, ScrapedUnit, SourceBlocked, SourceScraper, work_key
+from scrapers.normalizer import StreamingNormalizer, normalize_units, summarize_by_source, summarize_by_work_item
+from scrapers.registry import build_scraper, build_scrapers
+from utils.fake_supabase import FakeSupabaseClient
+from utils.playwright_context import BrowserPool
+from utils.rate_limit import DomainRateLimiter
+from utils.retry import CircuitBreaker, backoff_delay
 from utils.supabase_client import get_supabase_client
+from utils.timing import PhaseTimings, recording, span
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 logger = structlog.get_logger(__name__)
 
@@ -23,189 +53,547 @@ logger = structlog.get_logger(__name__)
 @dataclass(slots=True)
 class PersistStats:
     new_units: int = 0
+    updated_units: int = 0
+    unchanged_units: int = 0
     price_changes: int = 0
+    failed_rows: int = 0
+    units_removed: int = 0
+    errors: int = 0
 
 
+@dataclass(slots=True)
+class SourceOutcome:
+    source: str
+    property_id: str = DEFAULT_PROPERTY_ID
+    error: str | None = None
+    duration_seconds: float = 0.0
+    fetched: FetchResult | None = None
+    content_hash: str | None = None
+    attempts: int = 0
+    skipped: bool = False
+
+    @property
+    def key(self) -> str:
+        return work_key(self.property_id, self.source)
+
+    @property
+    def status(self) -> str:
+        if self.skipped:
+            return "skipped"
+        return "failed" if self.error is not None else "success"
+
+
+class PropertyProgress:
+    """Counts finished work items per property and logs as each one lands."""
+
+    def __init__(self, outcomes: list[SourceOutcome]) -> None:
+        pending = [outcome for outcome in outcomes if not outcome.skipped]
+        self.total = len(pending)
+        self.remaining = len(pending)
+        self.per_property = Counter(outcome.property_id for outcome in pending)
+        self.finished: Counter[str] = Counter()
+        self.done = asyncio.Event()
+
+    def complete(self, outcome: SourceOutcome) -> None:
+        self.remaining -= 1
+        self.finished[outcome.property_id] += 1
+        logger.info(
+            "work_item_complete",
+            source=outcome.source,
+            property=outcome.property_id,
+            status=outcome.status,
+            attempts=outcome.attempts,
+            property_done=self.finished[outcome.property_id],
+            property_total=self.per_property[outcome.property_id],
+            done=self.total - self.remaining,
+            total=self.total,
+        )
+        if self.remaining == 0:
+            self.done.set()
 
-def slugify(value: str) -> str:
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "-", value)
-    return value.strip("-") or "unknown"
-
-
-def build_composite_key(unit: ScrapedUnit) -> str:
-    baths = str(unit.baths).replace(".", "_")
-    sq_ft = unit.sq_ft or 0
-    return f"{slugify(unit.floor_plan_name)}_{unit.beds}_{baths}_{sq_ft}_{slugify(unit.unit_number)}"
 
+async def fetch_attempt(
+    scraper: SourceScraper,
+    outcome: SourceOutcome,
+    deadline: float,
+    timeout_seconds: float,
+) -> bool:
+    """Make one fetch attempt within ``deadline`` and return whether a retry could help.
+
+    Blocks and an exhausted time budget are final; other errors are transient.
+    """
+
+    loop = asyncio.get_running_loop()
+    outcome.attempts += 1
+    try:
+        with span(f"fetch.{outcome.key}"):
+            outcome.fetched = await asyncio.wait_for(scraper.fetch(), max(deadline - loop.time(), 0))
+        with span(f"hash.{outcome.key}"):
+            outcome.content_hash = scraper.content_digest(outcome.fetched)
+        outcome.error = None
+        logger.info(
+            "source_fetch_complete",
+            source=outcome.source,
+            property=outcome.property_id,
+            attempt=outcome.attempts,
+            content_hash=outcome.content_hash,
+        )
+    except TimeoutError:
+        outcome.error = f"timed out after {timeout_seconds:.0f}s"
+        logger.error(
+            "source_scrape_timeout",
+            source=outcome.source,
+            property=outcome.property_id,
+            timeout=timeout_seconds,
+        )
+    except SourceBlocked as exc:
+        outcome.error = str(exc)
+        logger.error("source_blocked", source=outcome.source, property=outcome.property_id, error=str(exc))
+    except Exception as exc:  # noqa: BLE001
+        outcome.error = str(exc)
+        logger.exception(
+            "source_scrape_failed",
+            source=outcome.source,
+            property=outcome.property_id,
+            attempt=outcome.attempts,
+            error=str(exc),
+        )
+        return True
+    return False
+
+
+async def run_sources(
+    scrapers: list[SourceScraper],
+    concurrency: int = SOURCE_CONCURRENCY,
+    timeout_seconds: float = SOURCE_TIMEOUT_SECONDS,
+    retries: int = MAX_RETRIES,
+    delay: Callable[[int], float] = backoff_delay,
+    skip: dict[str, str] | None = None,
+    rate_limiter: DomainRateLimiter | None = None,
+    completed: asyncio.Queue[SourceOutcome] | None = None,
+) -> list[SourceOutcome]:
+    """Fetch every (property, source) work item through a queue of ``concurrency`` workers.
+
+    Each item gets its own time budget, starting when a worker first picks it
+    up, and failures are captured per item, so a slow or blocked site never
+    holds up the others. A transient failure goes back on the queue once its
+    backoff has passed, leaving the worker free meanwhile. Items whose work key
+    is in ``skip`` are not fetched; their outcome carries the reason.
+    Outcomes keep input order. Each fetched item's outcome is also put on
+    ``completed`` as soon as it is final, so later stages can start on it.
+    """
+
+    skip = skip or {}
+    loop = asyncio.get_running_loop()
+    outcomes = [SourceOutcome(source=scraper.source_name, property_id=scraper.property_id) for scraper in scrapers]
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index, outcome in enumerate(outcomes):
+        reason = skip.get(outcome.key)
+        if reason is not None:
+            logger.warning("source_skipped", source=outcome.source, property=outcome.property_id, reason=reason)
+            outcome.error, outcome.skipped = f"skipped: {reason}", True
+        else:
+            queue.put_nowait(index)
+
+    progress = PropertyProgress(outcomes)
+    started: dict[int, float] = {}
+    if progress.remaining == 0:
+        return outcomes
+
+    def finish(index: int) -> None:
+        outcome = outcomes[index]
+        outcome.duration_seconds = loop.time() - started[index]
+        progress.complete(outcome)
+        if completed is not None:
+            completed.put_nowait(outcome)
+
+    async def worker() -> None:
+        while True:
+            index = await queue.get()
+            scraper, outcome = scrapers[index], outcomes[index]
+            if rate_limiter is not None:
+                await rate_limiter.wait(scraper.source_url)
+            started.setdefault(index, loop.time())
+            deadline = started[index] + timeout_seconds
+            retryable = await fetch_attempt(scraper, outcome, deadline, timeout_seconds)
+
+            pause = delay(outcome.attempts) if retryable and outcome.attempts <= retries else None
+            if pause is None or loop.time() + pause >= deadline:
+                finish(index)
+                continue
+            logger.info(
+                "source_retry_scheduled",
+                source=outcome.source,
+                property=outcome.property_id,
+                attempt=outcome.attempts + 1,
+                delay=round(pause, 2),
+            )
+            loop.call_later(pause, queue.put_nowait, index)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max(concurrency, 1), progress.remaining))]
+    try:
+        await progress.done.wait()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    return outcomes
+
+
+class UnitPersister:
+    """Writes normalized units to Supabase batch by batch over one run.
+
+    Floor plans are read on the first batch and their widened sq ft ranges are
+    written back once by ``close``, so batch size only changes how apartment
+    and price history writes are grouped.
+    """
+
+    def __init__(self, supabase: Client, now_iso: str) -> None:
+        self.supabase = supabase
+        self.now_iso = now_iso
+        self.stats = PersistStats()
+        self.units = 0
+        self.batches = 0
+        self._floor_plans = FloorPlanCache(supabase)
+        self._floor_plans_loaded = False
+
+    def write(self, units: list[ScrapedUnit]) -> None:
+        stats = self.stats
+        self.units += len(units)
+        self.batches += 1
 
-def get_or_create_floor_plan(supabase: Client, unit: ScrapedUnit) -> int | None:
-    query = (
-        supabase.table("floor_plans")
-        .select("id")
-        .eq("name", unit.floor_plan_name)
-        .eq("beds", unit.beds)
-        .eq("baths", unit.baths)
-        .limit(1)
-        .execute()
-    )
+        try:
+            with span("floor_plans"):
+                if not self._floor_plans_loaded:
+                    self._floor_plans.load()
+                    self._floor_plans_loaded = True
+                floor_plan_ids = self._floor_plans.resolve(units)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("floor_plan_lookup_failed", error=str(exc))
+            floor_plan_ids = [None] * len(units)
+            stats.errors += 1
+
+        with span("apartments", units=len(units)):
+            diff = upsert_apartments(self.supabase, units, floor_plan_ids, self.now_iso)
+        stats.updated_units += diff.updated
+        stats.unchanged_units += diff.unchanged
+
+        observations: list[PriceObservation] = []
+        for result in diff.results:
+            if not result.ok:
+                stats.failed_rows += 1
+                logger.error(
+                    "persist_unit_failed",
+                    unit=result.unit.unit_number,
+                    composite_key=result.composite_key,
+                    error=result.error,
+                )
+                continue
+
+            if result.is_new:
+                stats.new_units += 1
+
+            observations.append(
+                PriceObservation(
+                    apartment_id=result.apartment_id,
+                    price=result.unit.price,
+                    move_in_special=result.unit.move_in_special,
+                    source=result.unit.source,
+                )
+            )
 
-    if query.data:
-        return int(query.data[0]["id"])
+        try:
+            with span("price_history", observations=len(observations)):
+                history = write_price_history(self.supabase, observations, self.now_iso)
+            stats.price_changes += history.price_changes
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("price_history_failed", error=str(exc))
+            stats.errors += 1
 
-    insert = (
-        supabase.table("floor_plans")
-        .insert(
-            {
-                "name": unit.floor_plan_name,
-                "beds": unit.beds,
-                "baths": unit.baths,
-                "sq_ft_min": unit.sq_ft,
-                "sq_ft_max": unit.sq_ft,
-            }
+    def close(self) -> PersistStats:
+        stats = self.stats
+        try:
+            with span("floor_plans_flush"):
+                self._floor_plans.flush()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("floor_plan_flush_failed", error=str(exc))
+            stats.errors += 1
+
+        logger.info(
+            "persist_complete",
+            units=self.units,
+            batches=self.batches,
+            new_units=stats.new_units,
+            updated_units=stats.updated_units,
+            unchanged_units=stats.unchanged_units,
+            price_changes=stats.price_changes,
+            failed_rows=stats.failed_rows,
         )
-        .execute()
-    )
+        return stats
 
-    if insert.data:
-        return int(insert.data[0]["id"])
 
-    return None
+def persist_units(supabase: Client, normalized: list[ScrapedUnit], now_iso: str) -> PersistStats:
+    persister = UnitPersister(supabase, now_iso)
+    persister.write(normalized)
+    return persister.close()
 
 
-def ensure_price_history(
-    supabase: Client,
-    apartment_id: int,
-    price: float | None,
-    move_in_special: str | None,
-    source: str,
-) -> bool:
-    if price is None:
-        return False
-
-    latest = (
-        supabase.table("price_history")
-        .select("price")
-        .eq("apartment_id", apartment_id)
-        .order("recorded_at", desc=True)
-        .limit(1)
-        .execute()
-    )
+async def persist_stream(
+    units: asyncio.Queue[ScrapedUnit | None],
+    persister: UnitPersister | None,
+    batch_size: int = PERSIST_BATCH_SIZE,
+    flush_ms: int = PERSIST_FLUSH_MS,
+) -> None:
+    """Drain ``units`` until a ``None`` arrives, writing a batch every
+    ``batch_size`` units or ``flush_ms`` after a batch's first unit.
 
-    previous_price = None
-    if latest.data:
-        previous_price = float(latest.data[0]["price"])
+    Writes run in a worker thread (the Supabase client is synchronous), so the
+    browser and parsers keep going while a batch is in flight. Without a
+    persister the queue is just drained.
+    """
 
-    if previous_price == price:
-        return False
+    loop = asyncio.get_running_loop()
+    batch: list[ScrapedUnit] = []
+    flush_at = 0.0
 
-    supabase.table("price_history").insert(
-        {
-            "apartment_id": apartment_id,
-            "price": price,
-            "move_in_special": move_in_special,
-            "source": source,
-            "recorded_at": datetime.now(UTC).isoformat(),
-        }
-    ).execute()
+    async def flush() -> None:
+        nonlocal batch
+        if batch and persister is not None:
+            with span("persist", units=len(batch)):
+                await asyncio.to_thread(persister.write, batch)
+        batch = []
+
+    while True:
+        try:
+            timeout = max(flush_at - loop.time(), 0) if batch else None
+            unit = await asyncio.wait_for(units.get(), timeout)
+        except TimeoutError:
+            await flush()
+            continue
+        if unit is None:
+            break
+        if not batch:
+            flush_at = loop.time() + flush_ms / 1000
+        batch.append(unit)
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+
+async def stream_outcomes(
+    scrapers: list[SourceScraper],
+    completed: asyncio.Queue[SourceOutcome],
+    expected: int,
+    previous: dict[str, SourceSnapshot],
+    normalizer: StreamingNormalizer,
+    units: asyncio.Queue[ScrapedUnit | None],
+) -> bool:
+    """Parse each fetched work item as it completes and feed its units onward.
 
-    return previous_price is not None and previous_price != price
+    Items whose content hash matches the last run are held back until another
+    item changes or fails: if none does, the whole run short-circuits and this
+    returns True without parsing anything. Items the circuit breaker skipped
+    never reach ``completed``, so one dead site can't keep unchanged ones from
+    short-circuiting. Ends the ``units`` stream either way.
+    """
 
+    by_key = {work_key(scraper.property_id, scraper.source_name): scraper for scraper in scrapers}
+    held: list[SourceOutcome] = []
+    streaming = False
 
-def persist_unit(supabase: Client, unit: ScrapedUnit) -> tuple[bool, bool]:
-    now_iso = datetime.now(UTC).isoformat()
-    floor_plan_id = get_or_create_floor_plan(supabase, unit)
-
-    composite_key = build_composite_key(unit)
-    feature_flags = parse_feature_flags(unit.feature_tags)
-
-    payload: dict[str, Any] = {
-        "unit_number": unit.unit_number,
-        "floor_plan_id": floor_plan_id,
-        "composite_key": composite_key,
-        "beds": unit.beds,
-        "baths": unit.baths,
-        "sq_ft": unit.sq_ft,
-        "current_price": unit.price,
-        "available_date": unit.available_date,
-        "move_in_special": unit.move_in_special,
-        "feature_tags": unit.feature_tags,
-        "source": unit.source,
-        "source_url": unit.source_url,
-        "is_available": True,
-        "last_seen_at": now_iso,
-        "updated_at": now_iso,
-        **feature_flags,
-    }
+    async def emit(ready: list[ScrapedUnit]) -> None:
+        for unit in ready:
+            await units.put(unit)
 
-    existing = (
-        supabase.table("apartments")
-        .select("id,current_price")
-        .eq("composite_key", composite_key)
-        .limit(1)
-        .execute()
+    async def parse(outcome: SourceOutcome) -> None:
+        count = 0
+        try:
+            with span(f"parse.{outcome.key}") as parse_span:
+                async for unit in by_key[outcome.key].stream(outcome.fetched):
+                    count += 1
+                    await emit(normalizer.add(unit))
+                parse_span.add(units=count)
+            logger.info("source_scrape_complete", source=outcome.source, property=outcome.property_id, units=count)
+        except Exception as exc:  # noqa: BLE001
+            # Units already passed on stay written; the failure keeps the
+            # property out of stale marking.
+            outcome.error = f"parse failed: {exc}"
+            logger.exception(
+                "source_parse_failed",
+                source=outcome.source,
+                property=outcome.property_id,
+                units=count,
+                error=str(exc),
+            )
+        outcome.fetched = None
+        await emit(normalizer.finish(outcome.property_id, outcome.source))
+
+    for _ in range(expected):
+        outcome = await completed.get()
+        if not streaming and matches_snapshot(outcome, previous):
+            held.append(outcome)
+            continue
+        if not streaming:
+            streaming = True
+            for waiting in held:
+                await parse(waiting)
+            held.clear()
+        if outcome.error is None:
+            await parse(outcome)
+        else:
+            await emit(normalizer.finish(outcome.property_id, outcome.source))
+
+    await units.put(None)
+    return not streaming and bool(held)
+
+
+def matches_snapshot(outcome: SourceOutcome, previous: dict[str, SourceSnapshot]) -> bool:
+    """True when the item was fetched and hashes the same as on the last fully persisted run."""
+
+    return (
+        outcome.error is None
+        and outcome.key in previous
+        and outcome.content_hash == previous[outcome.key].content_hash
     )
 
-    is_new_unit = False
-    apartment_id: int
 
-    if existing.data:
-        apartment_id = int(existing.data[0]["id"])
-        supabase.table("apartments").update(payload).eq("id", apartment_id).execute()
-    else:
-        is_new_unit = True
-        payload["first_seen_at"] = now_iso
-        insert = supabase.table("apartments").insert(payload).execute()
-        if not insert.data:
-            return False, False
-        apartment_id = int(insert.data[0]["id"])
-
-    price_changed = ensure_price_history(
-        supabase=supabase,
-        apartment_id=apartment_id,
-        price=unit.price,
-        move_in_special=unit.move_in_special,
-        source=unit.source,
-    )
+def source_results(outcomes: list[SourceOutcome]) -> dict[str, dict[str, object]]:
+    """Per-work-item result for ``scrape_logs.source_results``; the circuit breaker reads it back."""
 
-    return is_new_unit, price_changed
+    return {
+        outcome.key: {
+            "status": outcome.status,
+            "attempts": outcome.attempts,
+            "error": outcome.error,
+            "duration_seconds": round(outcome.duration_seconds, 2),
+        }
+        for outcome in outcomes
+    }
 
 
-def mark_stale_units(supabase: Client, seen_composite_keys: set[str]) -> None:
-    rows = supabase.table("apartments").select("id,composite_key").eq("is_available", True).execute()
+def property_results(outcomes: list[SourceOutcome], summary: dict[str, int]) -> dict[str, dict[str, Any]]:
+    """Per-property work item statuses, units and fetch throughput for ``scrape_logs.property_results``.
 
-    for row in rows.data or []:
-        if row["composite_key"] in seen_composite_keys:
-            continue
-        supabase.table("apartments").update({"is_available": False}).eq("id", row["id"]).execute()
+    ``summary`` is the run's unit count per work key.
+    """
+
+    results: dict[str, dict[str, Any]] = {}
+    for outcome in outcomes:
+        entry = results.setdefault(
+            outcome.property_id,
+            {"success": 0, "failed": 0, "skipped": 0, "units": 0, "fetch_seconds": 0.0},
+        )
+        entry[outcome.status] += 1
+        entry["units"] += summary.get(outcome.key, 0)
+        entry["fetch_seconds"] += outcome.duration_seconds
+    for entry in results.values():
+        seconds = entry["fetch_seconds"]
+        entry["fetch_seconds"] = round(seconds, 2)
+        entry["units_per_second"] = round(entry["units"] / seconds, 2) if seconds else None
+    return results
+
+
+def record_stats(
+    supabase: Client, units: list[ScrapedUnit] | None, started_at: datetime, partial: bool = False
+) -> None:
+    """Post-persist stage: store this run's price/availability aggregates for the dashboard.
+
+    ``units`` is None for a run that parsed nothing new; it carries the
+    latest snapshot forward so every run date has one.
+    """
+
+    # NumPy is only needed once a run has units to aggregate.
+    from analytics.stats import StatsSnapshot, compute_stats, day_over_day
+
+    snapshot_date = started_at.date().isoformat()
+    with span("stats", units=len(units) if units is not None else 0):
+        if units is None:
+            latest = load_stats_snapshot(supabase)
+            if latest is None:
+                return
+            snapshot = StatsSnapshot.from_row(latest)
+        else:
+            snapshot = compute_stats(units, partial=partial)
+        snapshot.deltas = day_over_day(snapshot, load_stats_snapshot(supabase, before=snapshot_date))
+        save_stats_snapshot(supabase, snapshot, snapshot_date, started_at.isoformat())
 
 
 async def run_scrape() -> tuple[dict[str, int], str]:
+    if not PHASE_TIMINGS_ENABLED:
+        return await _run_scrape(None)
+    with recording() as timings:
+        return await _run_scrape(timings)
+
+
+async def _run_scrape(timings: PhaseTimings | None) -> tuple[dict[str, int], str]:
     started_at = datetime.now(UTC)
+    supabase = get_supabase_client()
 
-    scrapers = [MAAScraper(), ApartmentsComScraper()]
-    all_units: list[ScrapedUnit] = []
-    source_errors: list[str] = []
-    successful_sources = 0
+    previous_snapshots: dict[str, SourceSnapshot] = {}
+    if supabase:
+        try:
+            previous_snapshots = load_source_snapshots(supabase)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("source_snapshots_load_failed", error=str(exc))
 
-    for scraper in scrapers:
+    breaker: CircuitBreaker | None = None
+    if supabase:
         try:
-            units = await scraper.scrape()
-            logger.info("source_scrape_complete", source=scraper.source_name, units=len(units))
-            all_units.extend(units)
-            successful_sources += 1
+            breaker = CircuitBreaker.from_scrape_logs(
+                fetch_recent_source_results(supabase, limit=CIRCUIT_FAILURE_THRESHOLD * 4)
+            )
         except Exception as exc:  # noqa: BLE001
-            if "blocked" in str(exc).lower() or "closed" in str(exc).lower():
-                # The scraper likely had a page object before it failed
-                # but in this architecture, the context manager closed it.
-                # We will add diagnostic capture inside the scrapers themselves next.
-                pass
-            message = f"{scraper.source_name}: {exc}"
-            source_errors.append(message)
-            logger.exception("source_scrape_failed", source=scraper.source_name, error=str(exc))
-
-    normalized = normalize_units(all_units)
-    summary = summarize_by_source(normalized)
+            logger.exception("circuit_breaker_load_failed", error=str(exc))
+
+    now_iso = datetime.now(UTC).isoformat()
+    # The pool launches Chromium lazily, so a run whose sources are all
+    # skipped never starts a browser.
+    pool = BrowserPool()
+    scrapers = build_scrapers(pool)
+    skip: dict[str, str] = {}
+    if breaker is not None:
+        for scraper in scrapers:
+            key = work_key(scraper.property_id, scraper.source_name)
+            if (reason := breaker.open_reason(key, started_at)) is not None:
+                skip[key] = reason
+    expected = [
+        scraper for scraper in scrapers if work_key(scraper.property_id, scraper.source_name) not in skip
+    ]
+
+    # fetch -> parse/normalize -> persist run as concurrent stages joined by
+    # queues; the unit queue is bounded so parsing waits on slow writes.
+    completed: asyncio.Queue[SourceOutcome] = asyncio.Queue()
+    units: asyncio.Queue[ScrapedUnit | None] = asyncio.Queue(maxsize=UNIT_QUEUE_SIZE)
+    normalizer = StreamingNormalizer((scraper.property_id, scraper.source_name) for scraper in expected)
+    persister = UnitPersister(supabase, now_iso) if supabase else None
+    async with asyncio.TaskGroup() as stages:
+        stages.create_task(persist_stream(units, persister))
+        parsed = stages.create_task(
+            stream_outcomes(scrapers, completed, len(expected), previous_snapshots, normalizer, units)
+        )
+        async with pool:
+            with span("sources", work_items=len(scrapers)):
+                outcomes = await run_sources(
+                    scrapers, skip=skip, rate_limiter=DomainRateLimiter(), completed=completed
+                )
+    short_circuited = parsed.result()
+    traffic = pool.traffic.as_dict()
+    logger.info("browser_traffic", **traffic)
+
+    normalized = normalizer.units()
+    if short_circuited:
+        # Nothing was parsed: carry last run's per-item counts forward.
+        summary = {
+            outcome.key: previous_snapshots[outcome.key].unit_count
+            for outcome in outcomes
+            if not outcome.skipped
+        }
+    else:
+        summary = summarize_by_work_item(normalized)
+    by_property = property_results(outcomes, summary)
+
+    source_errors = [f"{outcome.key}: {outcome.error}" for outcome in outcomes if outcome.error is not None]
+    successful_sources = sum(1 for outcome in outcomes if outcome.error is None)
 
     status = "success"
     if source_errors and successful_sources > 0:
@@ -217,30 +605,73 @@ async def run_scrape() -> tuple[dict[str, int], str]:
         "scrape_complete",
         started_at=started_at.isoformat(),
         completed_at=datetime.now(UTC).isoformat(),
-        units=len(normalized),
+        units=sum(summary.values()),
         summary=summary,
         status=status,
         source_errors=source_errors,
+        short_circuited=short_circuited,
+        properties=by_property,
+        matching=asdict(normalizer.report),
     )
 
-    supabase = get_supabase_client()
-    stats = PersistStats()
-
-    if supabase:
-        seen_keys = set()
-        for unit in normalized:
-            seen_keys.add(build_composite_key(unit))
+    if supabase and persister is not None:
+        current: list[ScrapedUnit] | None = None
+        partial = False
+        if short_circuited:
+            stats = PersistStats()
+            # Properties whose sources were all skipped weren't checked, so
+            # their units keep the last_seen_at of the run that saw them.
+            checked_properties = {outcome.property_id for outcome in outcomes if outcome.status == "success"}
             try:
-                is_new, price_changed = persist_unit(supabase, unit)
-                if is_new:
-                    stats.new_units += 1
-                if price_changed:
-                    stats.price_changes += 1
+                refreshed = touch_available_units(supabase, now_iso, checked_properties) if checked_properties else 0
+                logger.info("content_unchanged", sources=list(summary), refreshed=refreshed)
             except Exception as exc:  # noqa: BLE001
-                logger.exception("persist_unit_failed", unit=unit.unit_number, error=str(exc))
+                logger.exception("touch_available_units_failed", error=str(exc))
+        else:
+            stats = persister.close()
+            seen_keys = {build_composite_key(unit) for unit in normalized}
+            # A property with any failed item (fetch, or parse partway through)
+            # may be missing units, so none of its rows are marked stale.
+            failed_properties = {outcome.property_id for outcome in outcomes if outcome.status == "failed"}
+            fetched_properties = {
+                outcome.property_id for outcome in outcomes if outcome.status == "success"
+            } - failed_properties
+
+            if status != "failed" and seen_keys and fetched_properties:
+                try:
+                    with span("mark_stale"):
+                        stats.units_removed = mark_stale_units(supabase, seen_keys, fetched_properties)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("mark_stale_units_failed", error=str(exc))
+                    stats.errors += 1
+
+            # Only remember hashes for a fully persisted run, otherwise the
+            # next run would short-circuit past the rows that failed.
+            fully_fetched = all(outcome.error is None or outcome.skipped for outcome in outcomes)
+            if fully_fetched and stats.failed_rows == 0 and stats.errors == 0:
+                try:
+                    save_source_snapshots(supabase, outcomes, summary, now_iso)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("source_snapshots_save_failed", error=str(exc))
+            else:
+                # Every fetched item was parsed and may have written rows; its
+                # old hash no longer describes what is stored.
+                written = [outcome.key for outcome in outcomes if outcome.content_hash is not None]
+                try:
+                    invalidate_source_snapshots(supabase, written)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("source_snapshots_invalidate_failed", error=str(exc))
+
+            # Same rule as stale marking: a property with a failed item would
+            # skew its aggregates, so only fully fetched properties count.
+            if status != "failed" and fetched_properties:
+                current = [unit for unit in normalized if unit.property_id in fetched_properties]
+                partial = fetched_properties != {scraper.property_id for scraper in scrapers}
 
-        if status != "failed" and seen_keys:
-            mark_stale_units(supabase, seen_keys)
+        try:
+            record_stats(supabase, current, started_at, partial=partial)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("stats_snapshot_failed", error=str(exc))
 
         supabase.table("scrape_logs").insert(
             {
@@ -248,18 +679,62 @@ async def run_scrape() -> tuple[dict[str, int], str]:
                 "completed_at": datetime.now(UTC).isoformat(),
                 "source": "all",
                 "status": status,
-                "units_found": len(normalized),
+                "units_found": sum(summary.values()),
                 "new_units": stats.new_units,
                 "price_changes": stats.price_changes,
+                "units_removed": stats.units_removed,
+                "short_circuited": short_circuited,
                 "error_message": " | ".join(source_errors) if source_errors else None,
                 "duration_seconds": (datetime.now(UTC) - started_at).total_seconds(),
+                "phase_timings": timings.as_dict() if timings is not None else None,
+                "traffic": traffic,
+                "source_results": source_results(outcomes),
+                "property_results": by_property,
             }
         ).execute()
 
+        if isinstance(supabase, FakeSupabaseClient):
+            logger.info("fake_supabase_round_trips", **supabase.summary())
+
     return summary, status
 
 
+def parse_saved_page(source_name: str, html: str, feeds: list[Any] | None = None) -> list[ScrapedUnit]:
+    """Parse a saved page the way a run would, with no browser or database."""
+
+    scraper = build_scraper(source_name)
+    return normalize_units(scraper.parse(FetchResult(html=html, feeds=feeds or [])))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Scrape every enabled source into Supabase.")
+    parser.add_argument(
+        "--parse",
+        nargs=2,
+        metavar=("SOURCE", "HTML"),
+        help="parse a saved page offline and print its units as JSON; nothing is fetched or written",
+    )
+    parser.add_argument(
+        "--feed",
+        action="append",
+        type=Path,
+        default=[],
+        help="saved JSON availability payload to parse along with --parse (repeatable)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.parse:
+        source_name, html_path = args.parse
+        feeds = [json.loads(path.read_text(encoding="utf-8")) for path in args.feed]
+        units = parse_saved_page(source_name, Path(html_path).read_text(encoding="utf-8"), feeds)
+        print(json.dumps({"summary": summarize_by_source(units), "units": [asdict(unit) for unit in units]}, indent=2))
+        return 0
+    if args.feed:
+        parser.error("--feed needs --parse")
+
+    _summary, status = asyncio.run(run_scrape())
+    return 1 if status == "failed" else 0
+
+
 if __name__ == "__main__":
-    summary, status = asyncio.run(run_scrape())
-    if status == "failed":
-        raise SystemExit(1)
+    raise SystemExit(main())
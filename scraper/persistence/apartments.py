@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from config import DEFAULT_PROPERTY_ID, PERSIST_BATCH_SIZE
+from scrapers.base import ScrapedUnit
+from utils.feature_parser import FLAG_COLUMNS, parse_feature_flags
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True)
+class ApartmentWriteResult:
+    composite_key: str
+    unit: ScrapedUnit
+    apartment_id: int | None = None
+    is_new: bool = False
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.apartment_id is not None
+
+
+@dataclass(slots=True)
+class ApartmentDiff:
+    """What ``upsert_apartments`` found and wrote, by kind of change."""
+
+    results: list[ApartmentWriteResult] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+# Columns the scraper owns, compared against the stored row to decide whether
+# an existing apartment needs an UPDATE. Timestamps are deliberately absent.
+CONTENT_FIELDS: tuple[str, ...] = (
+    "unit_number",
+    "floor_plan_id",
+    "beds",
+    "baths",
+    "sq_ft",
+    "current_price",
+    "available_date",
+    "move_in_special",
+    "feature_tags",
+    "source",
+    "source_url",
+    "is_available",
+    *FLAG_COLUMNS,
+    "view_type",
+)
+_NUMERIC_FIELDS = frozenset({"baths", "current_price"})
+
+
+def slugify(value: str) -> str:
+    value = value.strip().lower()
+    value = re.sub(r"[^a-z0-9]+", "-", value)
+    return value.strip("-") or "unknown"
+
+
+def build_composite_key(unit: ScrapedUnit) -> str:
+    """Stable identity of a unit; units of non-default properties are prefixed with the property id."""
+
+    baths = str(unit.baths).replace(".", "_")
+    sq_ft = unit.sq_ft or 0
+    key = f"{slugify(unit.floor_plan_name)}_{unit.beds}_{baths}_{sq_ft}_{slugify(unit.unit_number)}"
+    return key if unit.property_id == DEFAULT_PROPERTY_ID else f"{unit.property_id}:{key}"
+
+
+def build_apartment_payload(
+    unit: ScrapedUnit,
+    composite_key: str,
+    floor_plan_id: int | None,
+    now_iso: str,
+) -> dict[str, Any]:
+    return {
+        "property_id": unit.property_id,
+        "unit_number": unit.unit_number,
+        "floor_plan_id": floor_plan_id,
+        "composite_key": composite_key,
+        "beds": unit.beds,
+        "baths": unit.baths,
+        "sq_ft": unit.sq_ft,
+        "current_price": unit.price,
+        "available_date": unit.available_date,
+        "move_in_special": unit.move_in_special,
+        "feature_tags": unit.feature_tags,
+        "source": unit.source,
+        "source_url": unit.source_url,
+        "is_available": True,
+        "last_seen_at": now_iso,
+        "updated_at": now_iso,
+        **parse_feature_flags(unit.feature_tags),
+    }
+
+
+def chunked(items: list[Any], size: int) -> list[list[Any]]:
+    size = max(size, 1)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _normalize_value(column: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if column in _NUMERIC_FIELDS:
+        # PostgREST returns NUMERIC as 1820 or 1820.0 depending on scale.
+        return float(value)
+    if column == "feature_tags":
+        return tuple(value)
+    return value
+
+
+def fingerprint(row: dict[str, Any]) -> tuple[Any, ...]:
+    """Comparable snapshot of a row's content columns, stored or about to be."""
+
+    return tuple(_normalize_value(column, row.get(column)) for column in CONTENT_FIELDS)
+
+
+def changed_fields(payload: dict[str, Any], row: dict[str, Any]) -> dict[str, Any]:
+    """Columns of ``payload`` whose value differs from the stored ``row``."""
+
+    return {
+        column: payload[column]
+        for column in CONTENT_FIELDS
+        if _normalize_value(column, payload.get(column)) != _normalize_value(column, row.get(column))
+    }
+
+
+def _fetch_existing(supabase: Client, keys: list[str]) -> dict[str, dict[str, Any]]:
+    # An RPC rather than an ``in_`` filter: a batch of keys, quoted because
+    # property-scoped ones contain ":", can outgrow the URL length limit.
+    response = supabase.rpc("apartments_by_keys", {"keys": keys}).execute()
+    return {row["composite_key"]: row for row in response.data or []}
+
+
+def _upsert_rows(supabase: Client, payloads: list[dict[str, Any]]) -> dict[str, int]:
+    response = supabase.table("apartments").upsert(payloads, on_conflict="composite_key").execute()
+    return {row["composite_key"]: int(row["id"]) for row in response.data or []}
+
+
+def _write_batch(
+    supabase: Client,
+    batch: list[tuple[str, dict[str, Any], ApartmentWriteResult]],
+) -> None:
+    payloads = [payload for _key, payload, _result in batch]
+
+    try:
+        ids = _upsert_rows(supabase, payloads)
+    except Exception as exc:  # noqa: BLE001
+        # One bad row fails the whole statement, so retry row by row to
+        # isolate it instead of dropping the rest of the batch.
+        logger.warning("apartments_batch_upsert_failed", rows=len(batch), error=str(exc))
+        ids = {}
+        for _key, payload, result in batch:
+            try:
+                ids.update(_upsert_rows(supabase, [payload]))
+            except Exception as row_exc:  # noqa: BLE001
+                result.error = str(row_exc)
+
+    for key, _payload, result in batch:
+        if result.error is not None:
+            continue
+        if key in ids:
+            result.apartment_id = ids[key]
+        else:
+            result.error = "upsert returned no row"
+
+
+def _update_changed(
+    supabase: Client,
+    changes: list[tuple[dict[str, Any], ApartmentWriteResult]],
+    now_iso: str,
+) -> None:
+    # Rows with the same changes (a new special across a floor plan, say)
+    # share one UPDATE filtered on their ids.
+    groups: dict[str, tuple[dict[str, Any], list[ApartmentWriteResult]]] = {}
+    for changed, result in changes:
+        group_key = json.dumps(changed, sort_keys=True, default=str)
+        groups.setdefault(group_key, (changed, []))[1].append(result)
+
+    for changed, results in groups.values():
+        try:
+            supabase.table("apartments").update(
+                {**changed, "last_seen_at": now_iso, "updated_at": now_iso}
+            ).in_("id", [result.apartment_id for result in results]).execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("apartments_update_failed", rows=len(results), error=str(exc))
+            for result in results:
+                result.error = str(exc)
+
+
+def _touch_unchanged(supabase: Client, unchanged: list[ApartmentWriteResult], now_iso: str) -> None:
+    if not unchanged:
+        return
+    try:
+        supabase.table("apartments").update({"last_seen_at": now_iso}).in_(
+            "id", [result.apartment_id for result in unchanged]
+        ).execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("apartments_touch_failed", rows=len(unchanged), error=str(exc))
+        for result in unchanged:
+            result.error = str(exc)
+
+
+def upsert_apartments(
+    supabase: Client,
+    units: list[ScrapedUnit],
+    floor_plan_ids: list[int | None],
+    now_iso: str,
+    batch_size: int = PERSIST_BATCH_SIZE,
+) -> ApartmentDiff:
+    """Diff units against their stored rows and write only what changed.
+
+    Per batch of keys this is one SELECT of the stored content columns, then an
+    upsert of the new units, an UPDATE of just the changed columns per distinct
+    change, and a single ``last_seen_at`` touch for every row that matched.
+    Units sharing a composite key collapse to the last one, matching the old
+    per-unit behaviour where later writes overwrote earlier ones.
+    """
+
+    pending: dict[str, tuple[dict[str, Any], ApartmentWriteResult]] = {}
+    for unit, floor_plan_id in zip(units, floor_plan_ids, strict=True):
+        key = build_composite_key(unit)
+        payload = build_apartment_payload(unit, key, floor_plan_id, now_iso)
+        pending[key] = (payload, ApartmentWriteResult(composite_key=key, unit=unit))
+
+    diff = ApartmentDiff()
+
+    for keys in chunked(list(pending), batch_size):
+        try:
+            existing = _fetch_existing(supabase, keys)
+        except Exception as exc:  # noqa: BLE001
+            for key in keys:
+                result = pending[key][1]
+                result.error = f"lookup failed: {exc}"
+                diff.results.append(result)
+            continue
+
+        inserts: list[tuple[str, dict[str, Any], ApartmentWriteResult]] = []
+        changes: list[tuple[dict[str, Any], ApartmentWriteResult]] = []
+        unchanged: list[ApartmentWriteResult] = []
+        for key in keys:
+            payload, result = pending[key]
+            row = existing.get(key)
+            if row is None:
+                result.is_new = True
+                payload["first_seen_at"] = now_iso
+                inserts.append((key, payload, result))
+                continue
+
+            result.apartment_id = int(row["id"])
+            if payload["floor_plan_id"] is None:
+                # A failed floor plan lookup says nothing about the unit's
+                # plan, so the stored one stands.
+                payload["floor_plan_id"] = row.get("floor_plan_id")
+            if fingerprint(payload) == fingerprint(row):
+                unchanged.append(result)
+            else:
+                changes.append((changed_fields(payload, row), result))
+
+        if inserts:
+            _write_batch(supabase, inserts)
+        _update_changed(supabase, changes, now_iso)
+        _touch_unchanged(supabase, unchanged, now_iso)
+
+        diff.inserted += sum(1 for _key, _payload, result in inserts if result.ok)
+        diff.updated += sum(1 for _changed, result in changes if result.ok)
+        diff.unchanged += sum(1 for result in unchanged if result.ok)
+        diff.results.extend(pending[key][1] for key in keys)
+
+    return diff
+
+
+def mark_stale_units(supabase: Client, seen_composite_keys: set[str], property_ids: set[str]) -> int:
+    """Flag every available apartment of ``property_ids`` not seen this run and return how many changed.
+
+    Runs as one ``mark_stale_units`` RPC so the key list travels in the request
+    body rather than as a ``NOT IN`` filter in the URL.
+    """
+
+    response = supabase.rpc(
+        "mark_stale_units",
+        {"seen_keys": sorted(seen_composite_keys), "property_ids": sorted(property_ids)},
+    ).execute()
+    return int(response.data or 0)
+
+
+def touch_available_units(supabase: Client, now_iso: str, property_ids: set[str]) -> int:
+    """Refresh ``last_seen_at`` on every available apartment of ``property_ids`` in one UPDATE.
+
+    Used when every source is unchanged since the last run, in which case the
+    available set of each property checked is exactly what the last run saw.
+    """
+
+    response = (
+        supabase.table("apartments")
+        .update({"last_seen_at": now_iso}, count="exact", returning="minimal")
+        .eq("is_available", True)
+        .in_("property_id", sorted(property_ids))
+        .execute()
+    )
+    return int(response.count or 0)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from config import DEFAULT_PROPERTY_ID
+from scrapers.base import ScrapedUnit
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = structlog.get_logger(__name__)
+
+FloorPlanKey = tuple[str, int, float]
+# Plans are per property: two communities' "Traditional 2x2" are different plans.
+ScopedFloorPlanKey = tuple[str, FloorPlanKey]
+
+
+@dataclass(slots=True)
+class FloorPlanRecord:
+    id: int
+    name: str
+    beds: int
+    baths: float
+    sq_ft_min: int | None = None
+    sq_ft_max: int | None = None
+    property_id: str = DEFAULT_PROPERTY_ID
+    dirty: bool = False
+
+    @property
+    def key(self) -> ScopedFloorPlanKey:
+        return (self.property_id, floor_plan_key(self.name, self.beds, self.baths))
+
+    def widen(self, sq_ft: int | None) -> None:
+        if sq_ft is None:
+            return
+        if self.sq_ft_min is None or sq_ft < self.sq_ft_min:
+            self.sq_ft_min = sq_ft
+            self.dirty = True
+        if self.sq_ft_max is None or sq_ft > self.sq_ft_max:
+            self.sq_ft_max = sq_ft
+            self.dirty = True
+
+
+def floor_plan_key(name: str, beds: int, baths: float) -> FloorPlanKey:
+    return (name, int(beds), float(baths))
+
+
+def scoped_key(unit: ScrapedUnit) -> ScopedFloorPlanKey:
+    return (unit.property_id, floor_plan_key(unit.floor_plan_name, unit.beds, unit.baths))
+
+
+def _sq_ft_range(units: list[ScrapedUnit]) -> tuple[int | None, int | None]:
+    sizes = [unit.sq_ft for unit in units if unit.sq_ft is not None]
+    if not sizes:
+        return None, None
+    return min(sizes), max(sizes)
+
+
+class FloorPlanCache:
+    """Run-scoped view of ``floor_plans``.
+
+    The table is read once, missing plans are created with a single insert and
+    sq ft ranges are widened in memory until ``flush`` writes them back.
+    """
+
+    def __init__(self, supabase: Client) -> None:
+        self._supabase = supabase
+        self._plans: dict[ScopedFloorPlanKey, FloorPlanRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def load(self) -> None:
+        rows = (
+            self._supabase.table("floor_plans")
+            .select("id,property_id,name,beds,baths,sq_ft_min,sq_ft_max")
+            .order("id")
+            .execute()
+        )
+        self._plans.clear()
+        for row in rows.data or []:
+            record = self._record_from_row(row)
+            # Keep the oldest plan if the table has duplicates for a key.
+            self._plans.setdefault(record.key, record)
+
+    def get(self, unit: ScrapedUnit) -> FloorPlanRecord | None:
+        return self._plans.get(scoped_key(unit))
+
+    def resolve(self, units: list[ScrapedUnit]) -> list[int | None]:
+        """Return a floor plan id per unit, creating unknown plans in one insert."""
+
+        missing: dict[ScopedFloorPlanKey, list[ScrapedUnit]] = {}
+        for unit in units:
+            key = scoped_key(unit)
+            record = self._plans.get(key)
+            if record is None:
+                missing.setdefault(key, []).append(unit)
+            else:
+                record.widen(unit.sq_ft)
+
+        if missing:
+            self._create(missing)
+
+        ids: list[int | None] = []
+        for unit in units:
+            record = self.get(unit)
+            ids.append(record.id if record else None)
+        return ids
+
+    def flush(self) -> int:
+        """Write widened sq ft ranges back in one upsert and return the row count."""
+
+        dirty = [record for record in self._plans.values() if record.dirty]
+        if not dirty:
+            return 0
+
+        now_iso = datetime.now(UTC).isoformat()
+        self._supabase.table("floor_plans").upsert(
+            [
+                {
+                    "id": record.id,
+                    "property_id": record.property_id,
+                    "name": record.name,
+                    "beds": record.beds,
+                    "baths": record.baths,
+                    "sq_ft_min": record.sq_ft_min,
+                    "sq_ft_max": record.sq_ft_max,
+                    "updated_at": now_iso,
+                }
+                for record in dirty
+            ],
+            on_conflict="id",
+        ).execute()
+
+        for record in dirty:
+            record.dirty = False
+        return len(dirty)
+
+    def _create(self, missing: dict[ScopedFloorPlanKey, list[ScrapedUnit]]) -> None:
+        payloads: list[dict[str, Any]] = []
+        for (property_id, (name, beds, baths)), units in missing.items():
+            sq_ft_min, sq_ft_max = _sq_ft_range(units)
+            payloads.append(
+                {
+                    "property_id": property_id,
+                    "name": name,
+                    "beds": beds,
+                    "baths": baths,
+                    "sq_ft_min": sq_ft_min,
+                    "sq_ft_max": sq_ft_max,
+                }
+            )
+
+        try:
+            insert = self._supabase.table("floor_plans").insert(payloads).execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("floor_plan_insert_failed", plans=len(payloads), error=str(exc))
+            return
+
+        for row in insert.data or []:
+            record = self._record_from_row(row)
+            self._plans.setdefault(record.key, record)
+
+    @staticmethod
+    def _record_from_row(row: dict[str, Any]) -> FloorPlanRecord:
+        return FloorPlanRecord(
+            id=int(row["id"]),
+            name=row["name"],
+            beds=int(row["beds"]),
+            baths=float(row["baths"]),
+            sq_ft_min=row.get("sq_ft_min"),
+            sq_ft_max=row.get("sq_ft_max"),
+            property_id=row.get("property_id") or DEFAULT_PROPERTY_ID,
+        )
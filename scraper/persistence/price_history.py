@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from config import PERSIST_BATCH_SIZE
+from persistence.apartments import chunked
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+@dataclass(slots=True)
+class PriceObservation:
+    apartment_id: int
+    price: float | None
+    move_in_special: str | None
+    source: str
+
+
+@dataclass(slots=True)
+class PriceHistoryResult:
+    inserted: int = 0
+    changed_apartment_ids: list[int] = field(default_factory=list)
+
+    @property
+    def price_changes(self) -> int:
+        return len(self.changed_apartment_ids)
+
+
+def fetch_latest_prices(
+    supabase: Client,
+    apartment_ids: list[int],
+    batch_size: int = PERSIST_BATCH_SIZE,
+) -> dict[int, float]:
+    """Latest recorded price per apartment, read from the ``latest_price_history`` view."""
+
+    latest: dict[int, float] = {}
+    for ids in chunked(apartment_ids, batch_size):
+        rows = (
+            supabase.table("latest_price_history")
+            .select("apartment_id,price")
+            .in_("apartment_id", ids)
+            .execute()
+        )
+        for row in rows.data or []:
+            latest[int(row["apartment_id"])] = float(row["price"])
+    return latest
+
+
+def write_price_history(
+    supabase: Client,
+    observations: list[PriceObservation],
+    now_iso: str,
+    batch_size: int = PERSIST_BATCH_SIZE,
+) -> PriceHistoryResult:
+    """Diff observed prices against the latest history and bulk-insert the changes.
+
+    A unit with no history gets its first row without counting as a price
+    change; units whose price moved also get ``last_price_change_at`` stamped.
+    """
+
+    priced = [obs for obs in observations if obs.price is not None]
+    result = PriceHistoryResult()
+    if not priced:
+        return result
+
+    latest = fetch_latest_prices(supabase, [obs.apartment_id for obs in priced], batch_size)
+
+    rows = []
+    for obs in priced:
+        previous = latest.get(obs.apartment_id)
+        if previous == obs.price:
+            continue
+        rows.append(
+            {
+                "apartment_id": obs.apartment_id,
+                "price": obs.price,
+                "move_in_special": obs.move_in_special,
+                "source": obs.source,
+                "recorded_at": now_iso,
+            }
+        )
+        if previous is not None:
+            result.changed_apartment_ids.append(obs.apartment_id)
+
+    for batch in chunked(rows, batch_size):
+        supabase.table("price_history").insert(batch).execute()
+        result.inserted += len(batch)
+
+    for ids in chunked(result.changed_apartment_ids, batch_size):
+        supabase.table("apartments").update({"last_price_change_at": now_iso}).in_("id", ids).execute()
+
+    return result
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+def fetch_recent_source_results(supabase: Client, limit: int) -> list[dict[str, Any]]:
+    """The last ``limit`` runs' per-source results, newest first."""
+
+    rows = (
+        supabase.table("scrape_logs")
+        .select("started_at,source_results")
+        .order("started_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return list(rows.data or [])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+class HashedOutcome(Protocol):
+    error: str | None
+    content_hash: str | None
+
+    @property
+    def key(self) -> str: ...
+
+
+@dataclass(slots=True)
+class SourceSnapshot:
+    # Work key: the source name for the default property, else "<property>/<source>".
+    source: str
+    content_hash: str
+    unit_count: int = 0
+
+
+def load_source_snapshots(supabase: Client) -> dict[str, SourceSnapshot]:
+    rows = supabase.table("source_snapshots").select("source,content_hash,unit_count").execute()
+    return {
+        row["source"]: SourceSnapshot(
+            source=row["source"],
+            content_hash=row["content_hash"],
+            unit_count=int(row.get("unit_count") or 0),
+        )
+        for row in rows.data or []
+    }
+
+
+def save_source_snapshots(
+    supabase: Client,
+    outcomes: Iterable[HashedOutcome],
+    unit_counts: dict[str, int],
+    now_iso: str,
+) -> None:
+    rows = [
+        {
+            "source": outcome.key,
+            "content_hash": outcome.content_hash,
+            "unit_count": unit_counts.get(outcome.key, 0),
+            "updated_at": now_iso,
+        }
+        for outcome in outcomes
+        if outcome.error is None and outcome.content_hash
+    ]
+    if rows:
+        supabase.table("source_snapshots").upsert(rows, on_conflict="source").execute()
+
+
+def invalidate_source_snapshots(supabase: Client, keys: Iterable[str]) -> None:
+    """Forget the stored hashes of work items whose rows a run changed without saving snapshots.
+
+    Otherwise a later run whose page hashes back to the old content would
+    short-circuit and leave this run's rows in place.
+    """
+
+    keys = sorted(keys)
+    if keys:
+        supabase.table("source_snapshots").delete(returning="minimal").in_("source", keys).execute()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+    from analytics.stats import StatsSnapshot
+
+
+def load_stats_snapshot(supabase: Client, before: str | None = None) -> dict[str, Any] | None:
+    """The latest snapshot, or the latest dated before ``before`` (YYYY-MM-DD), if any."""
+
+    query = supabase.table("stats_snapshots").select("snapshot_date,unit_count,partial,overall,by_floor_plan,by_beds")
+    if before is not None:
+        query = query.lt("snapshot_date", before)
+    rows = query.order("snapshot_date", desc=True).order("captured_at", desc=True).limit(1).execute()
+    return rows.data[0] if rows.data else None
+
+
+def save_stats_snapshot(supabase: Client, snapshot: StatsSnapshot, snapshot_date: str, captured_at: str) -> None:
+    supabase.table("stats_snapshots").insert(
+        {"snapshot_date": snapshot_date, "captured_at": captured_at, **asdict(snapshot)},
+        returning="minimal",
+    ).execute()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
+from scrapers.base import ScrapedUnit, synthetic_unit_number
+from utils.html_parsing import CardSnapshot, HtmlElement, card_snapshot, class_contains, element_text, parse_document
+from utils.parsing import parse_card_numbers
+from utils.timing import span
+
+SOURCE_NAME = "apartments_com"
+MAX_CARDS = 60
+
+CARD_CSS = "article, [class*='pricing'], [class*='unitCard']"
+
+# XPath form of CARD_CSS; lxml returns the union in document order, like
+# querySelectorAll.
+CARD_XPATH = f"//article | //*[{class_contains('pricing')}] | //*[{class_contains('unitCard')}]"
+
+_BEDS = re.compile(r"(\d+)\s*(?:bed|br)", re.IGNORECASE)
+_BATHS = re.compile(r"(\d(?:\.\d)?)\s*(?:bath|ba)", re.IGNORECASE)
+_FLOOR_PLAN = re.compile(r"([0-9]x[0-9](?:\.[0-9])?)")
+
+
+def _parse_beds_and_baths(text: str) -> tuple[int, float]:
+    beds_match = _BEDS.search(text)
+    baths_match = _BATHS.search(text)
+    beds = int(beds_match.group(1)) if beds_match else 0
+    baths = float(baths_match.group(1)) if baths_match else 0.0
+    return beds, baths
+
+
+def is_blocked(title: str, html: str) -> bool:
+    title = title.lower()
+    return "access denied" in title or "cloudflare" in title or "you have been blocked" in html.lower()
+
+
+def parse_card(text: str, index: int, source_url: str) -> ScrapedUnit | None:
+    price, sq_ft = parse_card_numbers(text)
+    beds, baths = _parse_beds_and_baths(text)
+    if beds == 0 and baths == 0.0 and price is None:
+        return None
+
+    floor_plan = _FLOOR_PLAN.search(text)
+
+    return ScrapedUnit(
+        unit_number=synthetic_unit_number(index),
+        floor_plan_name=floor_plan.group(1) if floor_plan else "Unknown",
+        beds=beds,
+        baths=baths,
+        sq_ft=sq_ft,
+        price=price,
+        available_date=None,
+        move_in_special=None,
+        feature_tags=[],
+        source=SOURCE_NAME,
+        source_url=source_url,
+    )
+
+
+def _card_elements(html: str) -> list[HtmlElement]:
+    tree = parse_document(html)
+    if tree is None:
+        return []
+    return tree.xpath(CARD_XPATH)[:MAX_CARDS]
+
+
+def card_texts(html: str) -> list[str]:
+    return [element_text(card) for card in _card_elements(html)]
+
+
+def cards(html: str, source_url: str) -> list[CardSnapshot]:
+    """Each card's text and unit link."""
+
+    return [card_snapshot(card, source_url) for card in _card_elements(html)]
+
+
+def parse_html(html: str, source_url: str) -> list[ScrapedUnit]:
+    """Parse a rendered Apartments.com listing into units without a browser."""
+
+    return list(iter_html(html, source_url))
+
+
+def iter_html(html: str, source_url: str) -> Iterator[ScrapedUnit]:
+    """``parse_html`` one card at a time."""
+
+    with span("cards") as cards_span:
+        snapshots = cards(html, source_url)
+        cards_span.add(cards=len(snapshots))
+
+    for i, card in enumerate(snapshots):
+        if not card.text:
+            continue
+        unit = parse_card(card.text, i, card.href or source_url)
+        if unit is not None:
+            yield unit
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Protocol
+import asyncio
+import re
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from config import DEFAULT_PROPERTY_ID
+
+# Listings without a unit number are numbered by their position on the page;
+# these placeholders never identify the same home across sources.
+SYNTHETIC_UNIT_PATTERN = re.compile(r"APT-\d{3,}")
 
 
 @dataclass(slots=True)
@@ -17,10 +26,65 @@ class ScrapedUnit:
     feature_tags: list[str]
     source: str
     source_url: str
+    property_id: str = DEFAULT_PROPERTY_ID
+
+
+def work_key(property_id: str, source: str) -> str:
+    """Identifies one (property, source) work item in snapshots and scrape logs.
+
+    The default property's items are keyed by source name alone, as they were
+    before multi-property mode.
+    """
+
+    return source if property_id == DEFAULT_PROPERTY_ID else f"{property_id}/{source}"
+
+
+def synthetic_unit_number(index: int) -> str:
+    """Placeholder unit number for the ``index``-th (0-based) listing on a page."""
+
+    return f"APT-{index + 1:03d}"
+
+
+class SourceBlocked(RuntimeError):
+    """The site served a bot check instead of listings; retrying won't help."""
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """What a scraper brought back from the site: rendered HTML and any JSON
+    availability payloads captured off the network while the page loaded."""
+
+    html: str
+    feeds: list[Any] = field(default_factory=list)
 
 
 class SourceScraper(Protocol):
     source_name: str
+    source_url: str
+    property_id: str
+
+    async def fetch(self) -> FetchResult:
+        ...
+
+    def parse(self, fetched: FetchResult) -> list[ScrapedUnit]:
+        ...
+
+    def stream(self, fetched: FetchResult) -> AsyncIterator[ScrapedUnit]:
+        ...
+
+    def content_digest(self, fetched: FetchResult) -> str:
+        ...
 
     async def scrape(self) -> list[ScrapedUnit]:
         ...
+
+
+async def stream_units(units: Iterable[ScrapedUnit], yield_every: int = 25) -> AsyncIterator[ScrapedUnit]:
+    """Yield ``units`` as they are produced, handing the event loop to other
+    tasks every ``yield_every`` units so downstream stages run while a large
+    page is still being parsed."""
+
+    for count, unit in enumerate(units, 1):
+        yield unit
+        if count % yield_every == 0:
+            await asyncio.sleep(0)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from scrapers.base import ScrapedUnit
+from utils.parsing import normalize_sq_ft, parse_price
+
+# Field aliases seen across property-management availability APIs. The first
+# alias present on a record wins.
+UNIT_NUMBER_KEYS = ("unitNumber", "unit_number", "unitName", "unitId", "apartmentName", "unit")
+FLOOR_PLAN_KEYS = ("floorplanName", "floorPlanName", "floor_plan_name", "floorplan", "floorPlan", "planName")
+BEDS_KEYS = ("beds", "bedrooms", "bedroomCount", "numberOfBeds", "bed")
+BATHS_KEYS = ("baths", "bathrooms", "bathroomCount", "numberOfBaths", "bath")
+SQ_FT_KEYS = ("sqft", "sqFt", "squareFeet", "square_feet", "sq_ft", "area")
+PRICE_KEYS = ("rent", "price", "minRent", "marketRent", "effectiveRent", "rentAmount", "amount")
+AVAILABLE_KEYS = ("availableDate", "available_date", "availabilityDate", "dateAvailable", "moveInDate")
+SPECIAL_KEYS = ("moveInSpecial", "move_in_special", "special", "specials", "concession")
+FEATURE_KEYS = ("amenities", "features", "unitAmenities", "featureTags")
+PLAN_CONTEXT_KEYS = ("name", *FLOOR_PLAN_KEYS)
+# Deciding whether a response is an availability feed at all uses only the
+# unambiguous aliases: "unit"/"unitId" and "price"/"amount" also turn up in
+# carts, analytics and pricing widgets.
+FEED_UNIT_NUMBER_KEYS = ("unitNumber", "unit_number", "unitName", "apartmentName")
+FEED_RENT_KEYS = ("rent", "minRent", "marketRent", "effectiveRent", "rentAmount")
+
+
+def _first(record: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def _as_text(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, Mapping):
+        value = _first(value, ("name", "title", "description", "text"))
+    elif isinstance(value, list):
+        value = next((_as_text(item) for item in value if _as_text(item)), None)
+    return str(value).strip() if value is not None else None
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, Mapping):
+        return _as_number(_first(value, ("min", "amount", "value")))
+    return parse_price(str(value)) if value is not None else None
+
+
+def _as_sq_ft(value: Any) -> int | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    return normalize_sq_ft(str(value)) if value is not None else None
+
+
+def _feature_tags(value: Any) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    tags = (_as_text(item) for item in value)
+    return [tag for tag in tags if tag]
+
+
+def _is_unit_record(record: Mapping[str, Any]) -> bool:
+    if not isinstance(_first(record, UNIT_NUMBER_KEYS), (str, int)):
+        return False
+    return _first(record, PRICE_KEYS) is not None or _first(record, BEDS_KEYS) is not None
+
+
+def _walk(node: Any, context: dict[str, Any]) -> Iterator[tuple[Mapping[str, Any], dict[str, Any]]]:
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk(item, context)
+        return
+    if not isinstance(node, Mapping):
+        return
+
+    if _is_unit_record(node):
+        yield node, context
+        return
+
+    # Floor plan records usually wrap their units; carry plan-level fields down
+    # so units that omit them still get a plan name, beds and baths.
+    child_context = dict(context)
+    plan_name = _first(node, PLAN_CONTEXT_KEYS)
+    if isinstance(plan_name, str):
+        child_context["floor_plan_name"] = plan_name
+    for field, keys in (("beds", BEDS_KEYS), ("baths", BATHS_KEYS), ("sq_ft", SQ_FT_KEYS)):
+        value = _first(node, keys)
+        if value is not None:
+            child_context[field] = value
+
+    for value in node.values():
+        if isinstance(value, (list, Mapping)):
+            yield from _walk(value, child_context)
+
+
+def _is_feed_record(record: Mapping[str, Any], context: dict[str, Any]) -> bool:
+    if not isinstance(_first(record, FEED_UNIT_NUMBER_KEYS), (str, int)):
+        return False
+    if _first(record, FEED_RENT_KEYS) is None:
+        return False
+    return _first(record, BEDS_KEYS) is not None or context.get("beds") is not None
+
+
+def looks_like_availability(payload: Any) -> bool:
+    """True when a JSON payload has a record with a unit number, rent and bedroom count.
+
+    The bedroom count may come from the enclosing floor plan.
+    """
+
+    return any(_is_feed_record(record, context) for record, context in _walk(payload, {}))
+
+
+def units_from_payload(payload: Any, source: str, source_url: str) -> list[ScrapedUnit]:
+    """Build units straight from an availability JSON payload."""
+
+    units: list[ScrapedUnit] = []
+    for record, context in _walk(payload, {}):
+        beds = _as_number(_first(record, BEDS_KEYS) or context.get("beds"))
+        baths = _as_number(_first(record, BATHS_KEYS) or context.get("baths"))
+        price = _as_number(_first(record, PRICE_KEYS))
+        if not beds and not baths and price is None:
+            continue
+
+        units.append(
+            ScrapedUnit(
+                unit_number=(_as_text(_first(record, UNIT_NUMBER_KEYS)) or "").upper(),
+                floor_plan_name=(
+                    _as_text(_first(record, FLOOR_PLAN_KEYS))
+                    or context.get("floor_plan_name")
+                    or "Unknown Floor Plan"
+                ),
+                beds=int(beds or 0),
+                baths=float(baths or 0.0),
+                sq_ft=_as_sq_ft(_first(record, SQ_FT_KEYS) or context.get("sq_ft")),
+                price=price,
+                available_date=_as_text(_first(record, AVAILABLE_KEYS)),
+                move_in_special=_as_text(_first(record, SPECIAL_KEYS)),
+                feature_tags=_feature_tags(_first(record, FEATURE_KEYS)),
+                source=source,
+                source_url=source_url,
+            )
+        )
+    return units
+
+
+def units_from_feeds(feeds: list[Any], source: str, source_url: str) -> list[ScrapedUnit]:
+    units: list[ScrapedUnit] = []
+    for payload in feeds:
+        units.extend(units_from_payload(payload, source, source_url))
+    return units
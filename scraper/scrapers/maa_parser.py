@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator, Sequence
+
+from scrapers.base import ScrapedUnit
+from utils.feature_parser import match_known_tags
+from utils.html_parsing import (
+    CardSnapshot,
+    HtmlElement,
+    card_snapshot,
+    class_contains,
+    element_text,
+    has_class,
+    parse_document,
+    select_first,
+)
+from utils.parsing import parse_card_numbers
+from utils.timing import span
+
+SOURCE_NAME = "maa"
+
+# Any of the card selectors below; used to tell when the live page has rendered.
+CARD_CSS = ", ".join(
+    [
+        "[data-testid='unit-card']",
+        "[data-testid='available-unit-card']",
+        ".unit-card",
+        ".fp-unit-card",
+        "[class*='unit'][class*='card']",
+        "[class*='available'][class*='card']",
+    ]
+)
+
+# XPath equivalents of the card selectors, tried in priority order.
+CARD_XPATHS = [
+    "//*[@data-testid='unit-card']",
+    "//*[@data-testid='available-unit-card']",
+    f"//*[{has_class('unit-card')}]",
+    f"//*[{has_class('fp-unit-card')}]",
+    f"//*[{class_contains('unit')} and {class_contains('card')}]",
+    f"//*[{class_contains('available')} and {class_contains('card')}]",
+    "//article",
+]
+
+
+_UNIT_NUMBER_PATTERNS = (
+    re.compile(r"unit\s*([a-z0-9\-]+)"),
+    re.compile(r"home\s*#?\s*([a-z0-9\-]+)"),
+    re.compile(r"apt\.?\s*([a-z0-9\-]+)"),
+)
+_FLOOR_PLAN_PATTERNS = (
+    re.compile(r"((?:traditional|townhome|floor\s*plan)[^\n\r|]*)"),
+    re.compile(r"([0-9]x[0-9](?:\.[0-9])?[^\n\r|]*)"),
+)
+_BEDS_PATTERNS = (re.compile(r"(\d+)\s*(?:bed|br)"), re.compile(r"(\d+)x\d"))
+_BATHS_PATTERNS = (re.compile(r"(\d(?:\.\d)?)\s*(?:bath|ba)"), re.compile(r"\d+x(\d(?:\.\d)?)"))
+_AVAILABLE_PATTERNS = (
+    re.compile(r"available\s*(?:on|now)?\s*([a-z0-9\-/ ,]+)"),
+    re.compile(r"move\s*in\s*([a-z0-9\-/ ,]+)"),
+)
+_SPECIAL_PATTERNS = (re.compile(r"(\d+\s*weeks?\s*free)"), re.compile(r"(look-and-lease[^\n\r]*)"))
+
+
+# Non-ASCII letters that re.IGNORECASE treats as i/s. Folding them up front
+# keeps the lowered text the same length as the original, so match offsets
+# index both.
+_IGNORECASE_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def _lower(text: str) -> str:
+    return text.translate(_IGNORECASE_EXTRAS).lower()
+
+
+def _extract_first(patterns: Sequence[re.Pattern[str]], lowered: str, text: str) -> str | None:
+    """Search the lowercased text, but return the match from the original text."""
+
+    for pattern in patterns:
+        match = pattern.search(lowered)
+        if match:
+            return text[match.start(1) : match.end(1)].strip()
+    return None
+
+
+def is_blocked(title: str, html: str) -> bool:
+    return "cloudflare" in title.lower() or "you have been blocked" in html.lower()
+
+
+def parse_card(card_text: str, index: int, source_url: str) -> ScrapedUnit | None:
+    lowered = _lower(card_text)
+
+    beds_value = _extract_first(_BEDS_PATTERNS, lowered, card_text)
+    baths_value = _extract_first(_BATHS_PATTERNS, lowered, card_text)
+    beds = int(beds_value) if beds_value else 0
+    baths = float(baths_value) if baths_value else 0.0
+    price, sq_ft = parse_card_numbers(card_text)
+
+    if beds == 0 and baths == 0.0 and price is None:
+        return None
+
+    unit_number = _extract_first(_UNIT_NUMBER_PATTERNS, lowered, card_text)
+
+    return ScrapedUnit(
+        unit_number=unit_number.upper() if unit_number else f"MAA-{index + 1:03d}",
+        floor_plan_name=_extract_first(_FLOOR_PLAN_PATTERNS, lowered, card_text) or "Unknown Floor Plan",
+        beds=beds,
+        baths=baths,
+        sq_ft=sq_ft,
+        price=price,
+        available_date=_extract_first(_AVAILABLE_PATTERNS, lowered, card_text),
+        move_in_special=_extract_first(_SPECIAL_PATTERNS, lowered, card_text),
+        feature_tags=match_known_tags(lowered),
+        source=SOURCE_NAME,
+        source_url=source_url,
+    )
+
+
+def _card_elements(html: str) -> list[HtmlElement]:
+    tree = parse_document(html)
+    if tree is None:
+        return []
+    return select_first(tree, CARD_XPATHS)
+
+
+def card_texts(html: str) -> list[str]:
+    return [element_text(card) for card in _card_elements(html)]
+
+
+def cards(html: str, source_url: str) -> list[CardSnapshot]:
+    """Each card's text and unit link."""
+
+    return [card_snapshot(card, source_url) for card in _card_elements(html)]
+
+
+def parse_html(html: str, source_url: str) -> list[ScrapedUnit]:
+    """Parse a rendered MAA community page into units without a browser."""
+
+    return list(iter_html(html, source_url))
+
+
+def iter_html(html: str, source_url: str) -> Iterator[ScrapedUnit]:
+    """``parse_html`` one card at a time."""
+
+    with span("cards") as cards_span:
+        snapshots = cards(html, source_url)
+        cards_span.add(cards=len(snapshots))
+
+    for i, card in enumerate(snapshots):
+        if not card.text:
+            continue
+        # A card's own link points at the unit rather than the whole listing.
+        unit = parse_card(card.text, i, card.href or source_url)
+        if unit is not None:
+            yield unit
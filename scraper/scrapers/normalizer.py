@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import re
 from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from difflib import SequenceMatcher
 
-from scrapers.base import ScrapedUnit
+from scrapers.base import SYNTHETIC_UNIT_PATTERN, ScrapedUnit, work_key
 
 SOURCE_PRIORITY = {
     "maa": 0,
@@ -10,28 +14,279 @@ SOURCE_PRIORITY = {
     "rentcafe": 2,
 }
 
+# Cross-source matching compares a unit only with units of the same property
+# and bed/bath count whose sq_ft and price fall in the same or a neighbouring
+# band, so reconciliation stays near-linear in the number of units.
+MATCH_SQ_FT_BAND = 50
+MATCH_PRICE_BAND = 100
+# Minimum ``similarity`` for two listings to count as the same home.
+MATCH_THRESHOLD = 0.75
+
+_PLAN_CODE = re.compile(r"(\d)\s*x\s*(\d(?:\.\d)?)", re.IGNORECASE)
+
+BlockKey = tuple[str, int, float, int | None, int | None]
+
+
+def _rank(unit: ScrapedUnit) -> int:
+    return SOURCE_PRIORITY.get(unit.source, 99)
+
 
 def _score(unit: ScrapedUnit) -> tuple[int, int, int]:
     return (
-        SOURCE_PRIORITY.get(unit.source, 99),
+        _rank(unit),
         0 if unit.price is not None else 1,
         0 if unit.sq_ft is not None else 1,
     )
 
 
-def normalize_units(units: list[ScrapedUnit]) -> list[ScrapedUnit]:
-    """Deduplicate by floor plan + unit number and prefer higher-quality records."""
+def _dedupe_key(unit: ScrapedUnit) -> str:
+    return f"{unit.property_id}::{unit.floor_plan_name.strip().lower()}::{unit.unit_number.strip().lower()}"
+
+
+def _band(value: float | None, width: int) -> int | None:
+    return None if value is None else int(value // width)
+
+
+def _block_key(unit: ScrapedUnit) -> BlockKey:
+    return (
+        unit.property_id,
+        unit.beds,
+        unit.baths,
+        _band(unit.sq_ft, MATCH_SQ_FT_BAND),
+        _band(unit.price, MATCH_PRICE_BAND),
+    )
+
+
+def _neighbour_keys(key: BlockKey) -> list[BlockKey]:
+    # Neighbouring bands catch pairs that straddle a band edge; a missing
+    # value only ever meets other missing values.
+    property_id, beds, baths, sq_ft_band, price_band = key
+    sq_ft_bands = [None] if sq_ft_band is None else [sq_ft_band - 1, sq_ft_band, sq_ft_band + 1]
+    price_bands = [None] if price_band is None else [price_band - 1, price_band, price_band + 1]
+    return [(property_id, beds, baths, sq_ft, price) for sq_ft in sq_ft_bands for price in price_bands]
+
+
+def _unit_number(unit: ScrapedUnit) -> str | None:
+    number = unit.unit_number.strip()
+    if not number or SYNTHETIC_UNIT_PATTERN.fullmatch(number):
+        return None
+    return number.lower()
+
+
+def _closeness(a: float | None, b: float | None, width: int) -> float:
+    if a is None or b is None:
+        return 0.5
+    return max(0.0, 1 - abs(a - b) / width)
+
+
+def _plan_similarity(a: str, b: str) -> float:
+    code_a, code_b = _PLAN_CODE.search(a), _PLAN_CODE.search(b)
+    if code_a and code_b:
+        return 1.0 if code_a.groups() == code_b.groups() else 0.0
+    return SequenceMatcher(None, a.strip().lower(), b.strip().lower()).ratio()
+
+
+def similarity(a: ScrapedUnit, b: ScrapedUnit) -> float:
+    """How likely two listings with the same bed/bath count are the same home, from 0 to 1.
+
+    Real unit numbers settle it outright; placeholders such as Apartments.com's
+    ``APT-001`` say nothing, so the score falls back to sq_ft, price, the
+    ``NxM`` code in the floor plan name and the availability date.
+    """
+
+    number_a, number_b = _unit_number(a), _unit_number(b)
+    if number_a and number_b:
+        return 1.0 if number_a == number_b else 0.0
+    if a.available_date and b.available_date:
+        dates = 1.0 if a.available_date == b.available_date else 0.0
+    else:
+        dates = 0.5
+    return (
+        0.4 * _closeness(a.sq_ft, b.sq_ft, MATCH_SQ_FT_BAND)
+        + 0.35 * _closeness(a.price, b.price, MATCH_PRICE_BAND)
+        + 0.15 * _plan_similarity(a.floor_plan_name, b.floor_plan_name)
+        + 0.1 * dates
+    )
+
+
+@dataclass(slots=True)
+class MatchReport:
+    # Units folded into a higher-priority source's record.
+    matched: int = 0
+    # Units from a lower-priority source that listed no counterpart.
+    unmatched: int = 0
+    # Similarity scores computed; stays near the unit count thanks to blocking.
+    comparisons: int = 0
+
+
+class UnitMatcher:
+    """Blocking index that matches listings of the same home across sources.
+
+    Feed units best source first: ``match`` returns the indexed unit from a
+    higher-priority source that ``unit`` duplicates, or indexes ``unit`` and
+    returns None. Each indexed unit absorbs at most one unit per other source.
+    """
+
+    def __init__(self) -> None:
+        self.report = MatchReport()
+        self._buckets: defaultdict[BlockKey, list[ScrapedUnit]] = defaultdict(list)
+        self._claimed: set[tuple[str, str]] = set()
+        self._best_rank: dict[str, int] = {}
+        # Per dedupe key, what ``match`` did with that key's record, so a
+        # replaced record can be taken back out.
+        self._indexed: dict[str, tuple[BlockKey, ScrapedUnit]] = {}
+        self._claims: dict[str, tuple[str, str]] = {}
+        self._unmatched: set[str] = set()
+
+    def match(self, unit: ScrapedUnit) -> ScrapedUnit | None:
+        rank = _rank(unit)
+        block = _block_key(unit)
+        best: ScrapedUnit | None = None
+        best_score = 0.0
+        for key in _neighbour_keys(block):
+            for candidate in self._buckets.get(key, ()):
+                if _rank(candidate) >= rank or (_dedupe_key(candidate), unit.source) in self._claimed:
+                    continue
+                self.report.comparisons += 1
+                score = similarity(unit, candidate)
+                if score >= MATCH_THRESHOLD and score > best_score:
+                    best, best_score = candidate, score
+
+        key = _dedupe_key(unit)
+        if best is not None:
+            claim = (_dedupe_key(best), unit.source)
+            self._claimed.add(claim)
+            self._claims[key] = claim
+            self.report.matched += 1
+            return best
+        if self._best_rank.get(unit.property_id, rank) < rank:
+            self._unmatched.add(key)
+            self.report.unmatched += 1
+        self._best_rank[unit.property_id] = min(rank, self._best_rank.get(unit.property_id, rank))
+        self._buckets[block].append(unit)
+        self._indexed[key] = (block, unit)
+        return None
+
+    def discard(self, unit: ScrapedUnit) -> None:
+        """Undo ``match`` for a record that a better one for the same key replaces."""
+
+        key = _dedupe_key(unit)
+        entry = self._indexed.get(key)
+        if entry is not None and entry[1] is unit:
+            del self._indexed[key]
+            bucket = self._buckets[entry[0]]
+            bucket[:] = [indexed for indexed in bucket if indexed is not unit]
+        claim = self._claims.pop(key, None)
+        if claim is not None:
+            self._claimed.discard(claim)
+            self.report.matched -= 1
+        if key in self._unmatched:
+            self._unmatched.discard(key)
+            self.report.unmatched -= 1
+
+
+def reconcile_units(units: list[ScrapedUnit]) -> tuple[list[ScrapedUnit], MatchReport]:
+    """``normalize_units`` plus the cross-source match counts."""
 
     index: dict[str, ScrapedUnit] = {}
 
     for unit in units:
-        key = f"{unit.floor_plan_name.strip().lower()}::{unit.unit_number.strip().lower()}"
+        key = _dedupe_key(unit)
         existing = index.get(key)
 
         if existing is None or _score(unit) < _score(existing):
             index[key] = unit
 
-    return list(index.values())
+    matcher = UnitMatcher()
+    merged: set[str] = set()
+    for key, unit in sorted(index.items(), key=lambda item: _rank(item[1])):
+        if matcher.match(unit) is not None:
+            merged.add(key)
+    return [unit for key, unit in index.items() if key not in merged], matcher.report
+
+
+def normalize_units(units: list[ScrapedUnit]) -> list[ScrapedUnit]:
+    """Deduplicate by property + floor plan + unit number and prefer higher-quality records.
+
+    Listings of the same home that the key can't join (other sources' plan
+    names and unit numbers rarely agree) are then matched by ``UnitMatcher``;
+    ``SOURCE_PRIORITY`` picks which record survives.
+    """
+
+    return reconcile_units(units)[0]
+
+
+class StreamingNormalizer:
+    """``normalize_units`` for units arriving source by source.
+
+    ``add`` returns the units that are safe to persist now. A unit is held
+    while a higher-priority source for its property is still pending, since
+    that source may list a better record for the same unit; ``finish``
+    releases what a completed (or failed) source was holding back. A
+    same-priority record that beats one already released is released too, so
+    the last write for a unit is always its best record. Released units go
+    through the same cross-source matching, and ones that duplicate a better
+    source's record are dropped instead. ``units()`` ends up equal to
+    ``normalize_units`` over everything added.
+    """
+
+    def __init__(self, pending: Iterable[tuple[str, str]]) -> None:
+        self._pending: dict[str, set[str]] = defaultdict(set)
+        for property_id, source in pending:
+            self._pending[property_id].add(source)
+        self._index: dict[str, ScrapedUnit] = {}
+        # Ordered (dict keys) so held units are matched in arrival order.
+        self._held: defaultdict[str, dict[str, None]] = defaultdict(dict)
+        self._matcher = UnitMatcher()
+        self._merged: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._index) - len(self._merged)
+
+    @property
+    def report(self) -> MatchReport:
+        return self._matcher.report
+
+    def add(self, unit: ScrapedUnit) -> list[ScrapedUnit]:
+        key = _dedupe_key(unit)
+        existing = self._index.get(key)
+        if existing is not None:
+            if _score(unit) >= _score(existing):
+                return []
+            self._matcher.discard(existing)
+        self._index[key] = unit
+        if self._outranked(unit):
+            self._held[unit.property_id][key] = None
+            return []
+        self._held[unit.property_id].pop(key, None)
+        return self._release(key, unit)
+
+    def finish(self, property_id: str, source: str) -> list[ScrapedUnit]:
+        """Mark a work item done and return the held units it no longer outranks."""
+
+        self._pending[property_id].discard(source)
+        ready: list[ScrapedUnit] = []
+        held = self._held[property_id]
+        for key in list(held):
+            unit = self._index[key]
+            if not self._outranked(unit):
+                del held[key]
+                ready.extend(self._release(key, unit))
+        return ready
+
+    def units(self) -> list[ScrapedUnit]:
+        return [unit for key, unit in self._index.items() if key not in self._merged]
+
+    def _release(self, key: str, unit: ScrapedUnit) -> list[ScrapedUnit]:
+        if self._matcher.match(unit) is not None:
+            self._merged.add(key)
+            return []
+        self._merged.discard(key)
+        return [unit]
+
+    def _outranked(self, unit: ScrapedUnit) -> bool:
+        rank = SOURCE_PRIORITY.get(unit.source, 99)
+        return any(SOURCE_PRIORITY.get(source, 99) < rank for source in self._pending[unit.property_id])
 
 
 def summarize_by_source(units: list[ScrapedUnit]) -> dict[str, int]:
@@ -39,3 +294,12 @@ def summarize_by_source(units: list[ScrapedUnit]) -> dict[str, int]:
     for unit in units:
         counts[unit.source] += 1
     return dict(counts)
+
+
+def summarize_by_work_item(units: list[ScrapedUnit]) -> dict[str, int]:
+    """Unit counts per (property, source) work key; equal to ``summarize_by_source`` for the default property."""
+
+    counts: dict[str, int] = defaultdict(int)
+    for unit in units:
+        counts[work_key(unit.property_id, unit.source)] += 1
+    return dict(counts)
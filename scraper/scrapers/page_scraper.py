@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable, Iterator
+from types import ModuleType
+from typing import ClassVar
+
+from config import DEFAULT_PROPERTY_ID, PropertyConfig, ScraperSource, get_property, get_source
+from scrapers.base import FetchResult, ScrapedUnit, SourceBlocked, stream_units
+from scrapers.feed_parser import looks_like_availability, units_from_feeds
+from scrapers.snapshot import content_digest
+from utils.playwright_context import BrowserPool, Readiness, browser_page, goto_with_feed
+from utils.timing import span
+
+
+class PageScraper:
+    """Scraper for a listing page read through the availability feed or its rendered cards.
+
+    Subclasses name a parser module, which provides ``SOURCE_NAME``,
+    ``CARD_CSS``, ``is_blocked``, ``iter_html`` and ``card_texts``, and the
+    ``SourceBlocked`` message raised when the page is a bot challenge.
+    """
+
+    parser: ClassVar[ModuleType]
+    block_message: ClassVar[str]
+    source_name: ClassVar[str]
+    readiness: ClassVar[Readiness]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.source_name = cls.parser.SOURCE_NAME
+        cls.readiness = Readiness(selector=cls.parser.CARD_CSS, network_idle=True)
+
+    def __init__(
+        self,
+        pool: BrowserPool | None = None,
+        source: ScraperSource | None = None,
+        property_config: PropertyConfig | None = None,
+    ) -> None:
+        self.pool = pool
+        self.source = source or get_source(self.source_name)
+        target = property_config or get_property(DEFAULT_PROPERTY_ID)
+        url = target.url_for(self.source)
+        if url is None:
+            raise ValueError(f"property {target.id} has no {self.source_name} url")
+        self.property_id = target.id
+        self.source_url = url
+
+    async def fetch(self) -> FetchResult:
+        """Load the page, preferring the availability feed over rendered HTML."""
+
+        async with browser_page(self.pool, self.source.routing) as (_context, page):
+            feeds = await goto_with_feed(page, self.source_url, looks_like_availability, self.readiness)
+            with span("content") as content_span:
+                html = await page.content()
+                content_span.add(html_bytes=len(html))
+            if feeds:
+                return FetchResult(html=html, feeds=feeds)
+
+            title = await page.title()
+            if self.parser.is_blocked(title, html):
+                from utils.playwright_context import upload_block_snapshot
+                from utils.supabase_client import get_supabase_client
+                sb = get_supabase_client()
+                if sb:
+                    with span("block_snapshot"):
+                        await upload_block_snapshot(sb, self.source_name, page)
+                raise SourceBlocked(self.block_message)
+
+            return FetchResult(html=html)
+
+    def parse(self, fetched: FetchResult) -> list[ScrapedUnit]:
+        return list(self.iter_units(fetched))
+
+    def stream(self, fetched: FetchResult) -> AsyncIterator[ScrapedUnit]:
+        return stream_units(self.iter_units(fetched))
+
+    def iter_units(self, fetched: FetchResult) -> Iterator[ScrapedUnit]:
+        """Units from the availability feed if it has any, else from the page's cards."""
+
+        units: Iterable[ScrapedUnit] = ()
+        if fetched.feeds:
+            with span("feeds", feeds=len(fetched.feeds)):
+                units = units_from_feeds(fetched.feeds, self.source_name, self.source_url)
+        for unit in units or self.parser.iter_html(fetched.html, self.source_url):
+            unit.property_id = self.property_id
+            yield unit
+
+    def content_digest(self, fetched: FetchResult) -> str:
+        return content_digest(fetched, self.parser.card_texts)
+
+    async def scrape(self) -> list[ScrapedUnit]:
+        return self.parse(await self.fetch())
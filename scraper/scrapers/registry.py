@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from config import PROPERTIES, SOURCES, PropertyConfig, ScraperSource, get_source
+from scrapers.base import SourceScraper
+
+if TYPE_CHECKING:
+    from utils.playwright_context import BrowserPool
+
+
+def enabled_sources(sources: list[ScraperSource] | None = None) -> list[ScraperSource]:
+    return [source for source in (SOURCES if sources is None else sources) if source.enabled]
+
+
+def load_scraper_class(source: ScraperSource) -> type[Any]:
+    """Import the scraper class named by ``source.scraper`` (``module:Class``)."""
+
+    module_name, _, class_name = source.scraper.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"source {source.name} has no scraper import path (module:Class)")
+    return getattr(import_module(module_name), class_name)
+
+
+def build_scraper(name: str, pool: BrowserPool | None = None) -> SourceScraper:
+    """One scraper by source name, enabled or not (for fixtures and debugging)."""
+
+    source = get_source(name)
+    return load_scraper_class(source)(pool, source)
+
+
+def build_scrapers(
+    pool: BrowserPool | None = None,
+    sources: list[ScraperSource] | None = None,
+    properties: list[PropertyConfig] | None = None,
+) -> list[SourceScraper]:
+    """A scraper per (property, enabled source) pair, sharing ``pool``.
+
+    Ordered property by property so consecutive work items hit different
+    sites. Sources a property has no URL for are left out.
+    """
+
+    classes = [(source, load_scraper_class(source)) for source in enabled_sources(sources)]
+    return [
+        scraper_class(pool, source, prop)
+        for prop in (PROPERTIES if properties is None else properties)
+        for source, scraper_class in classes
+        if prop.url_for(source) is not None
+    ]
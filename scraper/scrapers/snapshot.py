@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+
+from scrapers.base import FetchResult
+from utils.image_handler import hash_bytes
+
+
+def content_digest(fetched: FetchResult, card_texts: Callable[[str], list[str]]) -> str:
+    """Hash the part of a fetch the parser actually reads.
+
+    That is the availability feed when one was captured, otherwise the card
+    text. The rest of the page (scripts, tracking ids, ads) changes on every
+    load and would defeat the comparison.
+    """
+
+    if fetched.feeds:
+        content = json.dumps(fetched.feeds, sort_keys=True, separators=(",", ":"), default=str)
+    else:
+        content = "\x1e".join(card_texts(fetched.html))
+    return hash_bytes(content.encode("utf-8"))
@@ -0,0 +1,311 @@
+"""Offline benchmark of the scrape pipeline stages.
+
+Runs every stage against the captured fixtures and a synthetic MAA page
+inflated to ``--cards`` unit cards, then writes per-stage throughput and
+tracemalloc peak memory to JSON so runs can be compared across commits::
+
+    python scripts/benchmark.py --cards 10000 --output bench.json
+    python scripts/benchmark.py --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from persistence.apartments import build_composite_key, slugify, upsert_apartments  # noqa: E402
+from persistence.floor_plans import FloorPlanCache  # noqa: E402
+from persistence.price_history import PriceObservation, write_price_history  # noqa: E402
+from scrapers import apartments_com_parser, maa_parser  # noqa: E402
+from scrapers.base import ScrapedUnit  # noqa: E402
+from scrapers.normalizer import normalize_units  # noqa: E402
+from utils.fake_supabase import FakeSupabaseClient  # noqa: E402
+from utils.feature_parser import parse_feature_flags  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+NOW_ISO = "2026-01-01T00:00:00+00:00"
+
+_PLANS = (("Traditional 1x1", 1, 1), ("Traditional 2x2", 2, 2), ("Townhome 3x2.5", 3, 2.5), ("Floor Plan C1", 2, 1))
+_TAGS = (
+    "Top Floor", "Wood Burning Fireplace", "Attached Garage", "Sunroom", "Balcony",
+    "Courtyard View", "Garden View", "Kitchen and Bath Upgrade", "Smart Home Technology",
+    "End Unit", "Washer/Dryer",
+)
+_SPECIALS = ("", "6 weeks free", "Look-and-Lease special: $500 off")
+
+
+def synthetic_maa_page(cards: int, seed: int = 7) -> str:
+    """The captured MAA fixture with ``cards`` unit cards injected into its body.
+
+    The fixture supplies realistic page chrome (scripts, styles, nested
+    wrappers) for the card XPaths to wade through.
+    """
+
+    rnd = random.Random(seed)
+    parts: list[str] = []
+    for i in range(cards):
+        plan, beds, baths = rnd.choice(_PLANS)
+        tags = " | ".join(rnd.sample(_TAGS, rnd.randint(0, 4)))
+        special = rnd.choice(_SPECIALS)
+        parts.append(
+            '<div data-testid="unit-card" class="unit-card">'
+            f"<span>${rnd.randint(1400, 3200):,}</span><span>/mo</span>"
+            f"<h3>Unit {chr(65 + i % 6)}-{i:05d}</h3>"
+            f"<p>{plan}</p>"
+            f"<ul><li>{beds} Beds</li><li>{baths} Baths</li><li>{rnd.randint(650, 1600):,} sq ft</li></ul>"
+            f"<p>Available {rnd.choice(('Now', 'Mar 15, 2026', '04/01/2026'))}</p>"
+            f"<p>{tags}</p>"
+            f"<p>{special}</p>"
+            "</div>"
+        )
+
+    html = (FIXTURES / "maa_rocky_point_page.html").read_text(encoding="utf-8")
+    return html.replace("<body>", "<body><main>" + "".join(parts) + "</main>", 1)
+
+
+def cross_listed(units: list[ScrapedUnit], share: float = 0.5) -> list[ScrapedUnit]:
+    """Units plus lower-priority copies of a share of them, as a second source would list them."""
+
+    copies = [replace(unit, source="apartments_com") for unit in units[: int(len(units) * share)]]
+    return units + copies
+
+
+def persist(client: FakeSupabaseClient, units: list[ScrapedUnit]) -> None:
+    floor_plans = FloorPlanCache(client)
+    floor_plans.load()
+    floor_plan_ids = floor_plans.resolve(units)
+    diff = upsert_apartments(client, units, floor_plan_ids, NOW_ISO)
+    observations = [
+        PriceObservation(result.apartment_id, result.unit.price, result.unit.move_in_special, result.unit.source)
+        for result in diff.results
+        if result.ok
+    ]
+    write_price_history(client, observations, NOW_ISO)
+    floor_plans.flush()
+
+
+@dataclass(slots=True)
+class StageResult:
+    items: int
+    seconds: float
+    items_per_second: float
+    peak_bytes: int
+
+
+def measure(func: Callable[[], int], repeat: int) -> StageResult:
+    """Best-of-``repeat`` wall time, then one more run under tracemalloc for peak memory.
+
+    ``func`` returns how many items it processed. Timing and memory are taken
+    on separate runs because tracemalloc slows allocation-heavy code severalfold.
+    """
+
+    best = float("inf")
+    items = 0
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        items = func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        func()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return StageResult(
+        items=items,
+        seconds=round(best, 6),
+        items_per_second=round(items / best, 1) if best > 0 else 0.0,
+        peak_bytes=peak,
+    )
+
+
+def build_stages(cards: int, notes: dict[str, dict[str, Any]]) -> dict[str, Callable[[], Callable[[], int]]]:
+    """Stage name to a setup that builds the stage's input and returns the timed callable.
+
+    The callable returns how many items it processed. Inputs are built on
+    first use and shared, so ``--only`` pays just for the stages it runs.
+    Persistence stages also record the fake client's per-table round trips in
+    ``notes``.
+    """
+
+    @cache
+    def fixture_pages() -> list[tuple[Any, str]]:
+        return [
+            (maa_parser, (FIXTURES / "maa_rocky_point_page.html").read_text(encoding="utf-8")),
+            (apartments_com_parser, (FIXTURES / "apartments_com_page.html").read_text(encoding="utf-8")),
+        ]
+
+    @cache
+    def page() -> str:
+        return synthetic_maa_page(cards)
+
+    @cache
+    def listed() -> list[ScrapedUnit]:
+        return cross_listed(maa_parser.parse_html(page(), "https://example.com/maa"))
+
+    @cache
+    def normalized() -> list[ScrapedUnit]:
+        return normalize_units(listed())
+
+    def fixtures() -> Callable[[], int]:
+        pages = fixture_pages()
+
+        def run() -> int:
+            for parser, html in pages:
+                parser.parse_html(html, "https://example.com")
+            return len(pages)
+
+        return run
+
+    def parse_cards() -> Callable[[], int]:
+        texts = maa_parser.card_texts(page())
+
+        def run() -> int:
+            for i, text in enumerate(texts):
+                maa_parser.parse_card(text, i, "https://example.com/maa")
+            return len(texts)
+
+        return run
+
+    def persist_cold() -> Callable[[], int]:
+        units = normalized()
+
+        def run() -> int:
+            client = FakeSupabaseClient()
+            persist(client, units)
+            notes["persist_cold"] = client.summary()
+            return len(units)
+
+        return run
+
+    def persist_warm() -> Callable[[], int]:
+        # Second pass over the same units with one in twenty repriced: every
+        # row exists, so this measures the diff path rather than inserts.
+        units = normalized()
+        repriced = [
+            replace(unit, price=(unit.price or 0) + 25) if i % 20 == 0 else unit for i, unit in enumerate(units)
+        ]
+
+        def run() -> int:
+            client = FakeSupabaseClient()
+            persist(client, units)
+            client.reset_stats()
+            persist(client, repriced)
+            notes["persist_warm"] = client.summary()
+            return len(units)
+
+        return run
+
+    def over_units(count: Callable[[list[ScrapedUnit]], int]) -> Callable[[], Callable[[], int]]:
+        def setup() -> Callable[[], int]:
+            units = normalized()
+            return lambda: count(units)
+
+        return setup
+
+    def maa_page(count: Callable[[str], int]) -> Callable[[], Callable[[], int]]:
+        def setup() -> Callable[[], int]:
+            html = page()
+            return lambda: count(html)
+
+        return setup
+
+    def normalize() -> Callable[[], int]:
+        units = listed()
+        return lambda: (normalize_units(units), len(units))[1]
+
+    return {
+        "fixture_pages": fixtures,
+        "maa_card_texts": maa_page(lambda html: len(maa_parser.card_texts(html))),
+        "maa_parse_card": parse_cards,
+        "maa_parse_html": maa_page(lambda html: len(maa_parser.parse_html(html, "https://example.com/maa"))),
+        "normalize_units": normalize,
+        "build_composite_key": over_units(lambda units: len([build_composite_key(unit) for unit in units])),
+        "slugify": over_units(lambda units: len([slugify(unit.floor_plan_name) for unit in units])),
+        "parse_feature_flags": over_units(
+            lambda units: len([parse_feature_flags(unit.feature_tags) for unit in units])
+        ),
+        "persist_cold": persist_cold,
+        "persist_warm": persist_warm,
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    for name, stage in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before or not before["items_per_second"]:
+            print(f"{name:36} {stage['items_per_second']:>14,.0f}/s  (new)")
+            continue
+        ratio = stage["items_per_second"] / before["items_per_second"]
+        print(f"{name:36} {stage['items_per_second']:>14,.0f}/s  {ratio:5.2f}x  peak {stage['peak_bytes']:>12,} B")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10_000, help="unit cards in the synthetic MAA page")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--only", nargs="*", help="run just these stages")
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+    parser.add_argument("--baseline", type=Path, help="earlier output to print speedups against")
+    args = parser.parse_args(argv)
+
+    notes: dict[str, dict[str, Any]] = {}
+    stages = build_stages(args.cards, notes)
+    selected = args.only or list(stages)
+    unknown = sorted(set(selected) - set(stages))
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    results: dict[str, Any] = {
+        "meta": {
+            "revision": git_revision(),
+            "recorded_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cards": args.cards,
+            "repeat": args.repeat,
+        },
+        "stages": {},
+    }
+    for name in selected:
+        stage = measure(stages[name](), args.repeat)
+        results["stages"][name] = {**asdict(stage), **notes.get(name, {})}
+        print(f"{name:36} {stage.items:>8} items  {stage.items_per_second:>14,.0f}/s  peak {stage.peak_bytes:>12,} B")
+
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
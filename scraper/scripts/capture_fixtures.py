@@ -3,7 +3,8 @@ from __future__ import annotations
 import asyncio
 from pathlib import Path
 
-from utils.playwright_context import browser_page
+from config import RoutingPolicy
+from utils.playwright_context import BrowserPool, Readiness, wait_until_ready
 
 SOURCES = {
     "maa_rocky_point_page": "https://www.maac.com/florida/tampa/maa-rocky-point/",
@@ -11,20 +12,24 @@ SOURCES = {
     "rentcafe_page": "https://www.rentcafe.com/apartments/fl/tampa/maa-rocky-point/default.aspx",
 }
 
+# Keep stylesheets so the screenshots look like the page; heavy media stays blocked.
+ROUTING = RoutingPolicy(blocked_resource_types=frozenset({"image", "media", "font"}))
+
 
 async def capture() -> None:
     fixtures_dir = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
     fixtures_dir.mkdir(parents=True, exist_ok=True)
 
-    async with browser_page() as (_context, page):
+    async with BrowserPool() as pool:
         for name, url in SOURCES.items():
-            await page.goto(url, wait_until="domcontentloaded", timeout=120_000)
-            await page.wait_for_timeout(5000)
-
-            html = await page.content()
-            (fixtures_dir / f"{name}.html").write_text(html, encoding="utf-8")
-            await page.screenshot(path=str(fixtures_dir / f"{name}.png"), full_page=True)
-            print(f"Captured fixture: {name}")
+            async with pool.page(ROUTING) as (_context, page):
+                await page.goto(url, wait_until="domcontentloaded", timeout=120_000)
+                await wait_until_ready(page, Readiness(network_idle=True, timeout_ms=30_000))
+
+                html = await page.content()
+                (fixtures_dir / f"{name}.html").write_text(html, encoding="utf-8")
+                await page.screenshot(path=str(fixtures_dir / f"{name}.png"), full_page=True)
+                print(f"Captured fixture: {name}")
 
 
 if __name__ == "__main__":
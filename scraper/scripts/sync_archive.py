@@ -0,0 +1,41 @@
+"""Export new price_history and apartments rows into the local columnar archive.
+
+Run after scrapes (or on its own schedule) to keep the archive current, then
+query it offline with ``analytics.archive.PriceArchive``::
+
+    python scripts/sync_archive.py --archive data/price_archive
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from analytics.archive import EXPORT_PAGE_SIZE, PriceArchive  # noqa: E402
+from utils.supabase_client import get_supabase_client  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, default=ROOT / "data" / "price_archive", help="archive directory")
+    parser.add_argument("--page-size", type=int, default=EXPORT_PAGE_SIZE, help="rows fetched per request")
+    args = parser.parse_args(argv)
+
+    supabase = get_supabase_client()
+    if supabase is None:
+        parser.error("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set")
+
+    result = PriceArchive(args.archive).sync(supabase, page_size=args.page_size)
+    print(json.dumps(asdict(result), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
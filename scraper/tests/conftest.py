@@ -1,6 +1,18 @@
 import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+import pytest
+
+TESTS = Path(__file__).resolve().parent
+ROOT = TESTS.parent
+# ROOT for the scraper's modules, TESTS for shared test helpers (helpers.py).
+for path in (ROOT, TESTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from utils.fake_supabase import FakeSupabaseClient  # noqa: E402
+
+
+@pytest.fixture
+def fake_supabase() -> FakeSupabaseClient:
+    return FakeSupabaseClient()
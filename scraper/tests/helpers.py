@@ -0,0 +1,21 @@
+from scrapers.base import ScrapedUnit
+
+
+def make_unit(**overrides) -> ScrapedUnit:
+    """A two-bed MAA unit; pass any ``ScrapedUnit`` field to change it."""
+
+    fields = dict(
+        unit_number="B-312",
+        floor_plan_name="Traditional 2x2",
+        beds=2,
+        baths=2.0,
+        sq_ft=1134,
+        price=1820,
+        available_date=None,
+        move_in_special=None,
+        feature_tags=[],
+        source="maa",
+        source_url="https://example.com",
+    )
+    fields.update(overrides)
+    return ScrapedUnit(**fields)
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from analytics.archive import PriceArchive, rolling_median
+from utils.fake_supabase import FakeSupabaseClient
+
+
+def apartment(apartment_id: int, plan: int, first: str, last: str, available: bool = True, updated: str = "") -> dict:
+    return {
+        "id": apartment_id,
+        "composite_key": f"unit-{apartment_id}",
+        "floor_plan_id": plan,
+        "beds": 2,
+        "is_available": available,
+        "first_seen_at": first,
+        "last_seen_at": last,
+        "updated_at": updated or last,
+    }
+
+
+def observation(row_id: int, apartment_id: int, price: float, day: str) -> dict:
+    return {"id": row_id, "apartment_id": apartment_id, "price": price, "recorded_at": f"{day}T06:00:00+00:00"}
+
+
+@pytest.fixture
+def client():
+    return FakeSupabaseClient(
+        tables={
+            "apartments": [
+                apartment(1, 10, "2026-03-01T06:00:00+00:00", "2026-03-05T06:00:00+00:00"),
+                apartment(2, 10, "2026-03-02T06:00:00+00:00", "2026-03-03T06:00:00+00:00", available=False),
+                apartment(3, 20, "2026-03-01T06:00:00+00:00", "2026-03-05T06:00:00+00:00"),
+            ],
+            "price_history": [
+                observation(1, 1, 1800, "2026-03-01"),
+                observation(2, 2, 1900, "2026-03-02"),
+                observation(3, 3, 2500, "2026-03-01"),
+                observation(4, 1, 1700, "2026-03-03"),
+            ],
+        }
+    )
+
+
+def test_sync_exports_only_rows_past_the_watermarks(tmp_path, client):
+    first = PriceArchive(tmp_path).sync(client, page_size=2)
+    assert (first.price_history_rows, first.apartment_rows) == (4, 3)
+    assert first.watermarks["price_history_id"] == 4
+
+    client.table("price_history").insert(observation(5, 3, 2450, "2026-03-04")).execute()
+    client.table("apartments").update({"is_available": False, "updated_at": "2026-03-06T06:00:00+00:00"}).eq(
+        "id", 3
+    ).execute()
+    client.reset_stats()
+
+    archive = PriceArchive(tmp_path)
+    second = archive.sync(client, page_size=2)
+    # Unit 1 is re-read: it carries the watermark's own timestamp.
+    assert (second.price_history_rows, second.apartment_rows) == (1, 2)
+
+    reopened = PriceArchive(tmp_path)
+    assert list(reopened.table("price_history")["id"]) == [1, 2, 3, 4, 5]
+    assert list(reopened.table("apartments")["is_available"]) == [True, False, False]
+    times, prices = reopened.price_series(3)
+    assert list(prices) == [2500, 2450] and str(times[0]) == "2026-03-01T06:00:00"
+
+
+def test_sync_picks_up_rows_committed_late(tmp_path):
+    run = "2026-03-05T06:00:00+00:00"
+    client = FakeSupabaseClient(
+        tables={
+            "apartments": [apartment(i, 10, run, run) for i in (1, 2, 3)],
+            "price_history": [observation(1, 1, 1800, "2026-03-05"), observation(3, 3, 1900, "2026-03-05")],
+        }
+    )
+    archive = PriceArchive(tmp_path)
+    archive.sync(client, page_size=2)
+
+    # The same run's later writes: one more unit at the same updated_at, and
+    # price row 2 whose transaction committed after row 3 was exported.
+    client.table("apartments").insert(apartment(4, 10, run, run)).execute()
+    client.table("price_history").insert(observation(2, 2, 1850, "2026-03-05")).execute()
+    second = archive.sync(client, page_size=2)
+
+    assert second.price_history_rows == 1 and second.watermarks["price_history_id"] == 3
+    assert sorted(archive.table("price_history")["id"]) == [1, 2, 3]
+    assert list(archive.table("apartments")["id"]) == [1, 2, 3, 4]
+
+
+def test_daily_prices_carry_changes_forward_while_listed(tmp_path, client):
+    archive = PriceArchive(tmp_path)
+    archive.sync(client)
+
+    days, ids, prices = archive.daily_prices(floor_plan_id=10, end=np.datetime64("2026-03-05"))
+    assert [str(day) for day in days] == ["2026-03-01", "2026-03-02", "2026-03-03", "2026-03-04", "2026-03-05"]
+    assert list(ids) == [1, 2]
+    np.testing.assert_array_equal(prices[0], [1800, 1800, 1700, 1700, 1700])
+    np.testing.assert_array_equal(prices[1], [np.nan, 1900, 1900, np.nan, np.nan])
+
+    _days, daily, rolling = archive.median_trend(floor_plan_id=10, window=2, end=np.datetime64("2026-03-05"))
+    np.testing.assert_array_equal(daily, [1800, 1850, 1800, 1700, 1700])
+    np.testing.assert_array_equal(rolling, [np.nan, 1825, 1825, 1750, 1700])
+
+
+def test_days_available_counts_to_last_sighting_or_as_of(tmp_path, client):
+    archive = PriceArchive(tmp_path)
+    archive.sync(client)
+
+    days = archive.days_available(as_of=np.datetime64("2026-03-11T06:00:00"))
+    np.testing.assert_array_equal(days, [10, 1, 10])
+    assert list(archive.days_available(floor_plan_id=20, as_of=np.datetime64("2026-03-02T06:00:00"))) == [1]
+
+
+def test_rolling_median_ignores_gaps():
+    np.testing.assert_array_equal(rolling_median(np.array([1.0, np.nan, 3.0, 5.0]), 2), [np.nan, 1, 3, 4])
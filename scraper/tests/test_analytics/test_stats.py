@@ -0,0 +1,88 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from analytics.stats import compute_stats, day_over_day
+from helpers import make_unit
+from main import record_stats
+from utils.fake_supabase import FakeSupabaseClient
+
+
+UNITS = [
+    make_unit(floor_plan_name="A1", beds=1, sq_ft=750, price=1400),
+    make_unit(floor_plan_name="A1", beds=1, sq_ft=750, price=1500),
+    make_unit(floor_plan_name="A1", beds=1, sq_ft=None, price=1450),
+    make_unit(floor_plan_name="B2", beds=2, sq_ft=1134, price=1820),
+    make_unit(floor_plan_name="B2", beds=2, sq_ft=1134, price=None),
+    make_unit(floor_plan_name="B2", beds=2, sq_ft=1000, price=2000, property_id="maa-westshore"),
+]
+
+
+def test_compute_stats_groups_by_plan_and_beds():
+    stats = compute_stats(UNITS)
+
+    assert stats.unit_count == 6
+    a1 = stats.by_floor_plan["A1"]
+    assert (a1["available"], a1["priced"]) == (3, 3)
+    assert (a1["min_price"], a1["median_price"], a1["max_price"]) == (1400, 1450, 1500)
+    assert a1["median_price_per_sq_ft"] == pytest.approx(1.93, abs=0.01)
+
+    b2 = stats.by_floor_plan["B2"]
+    assert (b2["available"], b2["priced"], b2["median_price"]) == (2, 1, 1820)
+    assert stats.by_floor_plan["maa-westshore/B2"]["median_price_per_sq_ft"] == 2.0
+    assert set(stats.by_beds) == {"1", "2", "maa-westshore/2"}
+    assert (stats.overall["available"], stats.overall["median_price"]) == (6, 1500)
+
+
+def test_day_over_day_compares_groups_listed_both_days():
+    yesterday = {
+        "overall": {"available": 7, "median_price": 1480},
+        "by_floor_plan": {"A1": {"available": 4, "median_price": 1400}},
+    }
+    deltas = day_over_day(compute_stats(UNITS), yesterday)
+
+    assert deltas["overall"]["available"] == -1 and deltas["overall"]["median_price"] == 20
+    assert deltas["by_floor_plan"] == {
+        "A1": {"available": -1, "median_price": 50, "mean_price": None, "median_price_per_sq_ft": None}
+    }
+    assert deltas["by_beds"] == {}
+    assert day_over_day(compute_stats(UNITS), None) == {}
+
+
+def test_record_stats_compares_against_the_latest_earlier_snapshot():
+    client = FakeSupabaseClient()
+    record_stats(client, UNITS[:3], datetime(2026, 3, 1, 6, tzinfo=UTC))
+    # No run on 3-02; 3-03's deltas are against 3-01, not an empty day.
+    record_stats(client, UNITS[:2], datetime(2026, 3, 3, 6, tzinfo=UTC))
+    record_stats(client, UNITS[:1], datetime(2026, 3, 3, 18, tzinfo=UTC))
+
+    first, second, third = client.rows("stats_snapshots")
+    assert first["snapshot_date"] == "2026-03-01" and first["deltas"] == {}
+    assert second["unit_count"] == 2
+    assert second["deltas"]["by_floor_plan"]["A1"]["available"] == -1
+    assert third["deltas"]["by_floor_plan"]["A1"]["available"] == -2
+
+
+def test_runs_that_parse_nothing_carry_the_latest_snapshot_forward():
+    client = FakeSupabaseClient()
+    record_stats(client, None, datetime(2026, 3, 1, 6, tzinfo=UTC))
+    assert client.rows("stats_snapshots") == []
+
+    record_stats(client, UNITS, datetime(2026, 3, 1, 6, tzinfo=UTC))
+    record_stats(client, None, datetime(2026, 3, 2, 6, tzinfo=UTC))
+
+    full, carried = client.rows("stats_snapshots")
+    assert carried["snapshot_date"] == "2026-03-02"
+    assert (carried["unit_count"], carried["by_beds"]) == (full["unit_count"], full["by_beds"])
+    assert carried["deltas"]["overall"]["available"] == 0
+
+
+def test_partial_snapshots_have_no_overall_delta():
+    client = FakeSupabaseClient()
+    record_stats(client, UNITS, datetime(2026, 3, 1, 6, tzinfo=UTC))
+    westshore_only = [unit for unit in UNITS if unit.property_id == "maa-westshore"]
+    record_stats(client, westshore_only, datetime(2026, 3, 2, 6, tzinfo=UTC), partial=True)
+
+    _full, partial = client.rows("stats_snapshots")
+    assert partial["partial"] and partial["deltas"]["overall"] == {}
+    assert partial["deltas"]["by_beds"]["maa-westshore/2"]["available"] == 0
@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from main import parse_saved_page
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURE = ROOT / "tests" / "fixtures" / "maa_rocky_point_page.html"
+
+PROBE = """
+import sys
+import main
+main.main(["--parse", "maa", sys.argv[1]])
+heavy = sorted({m.split(".")[0] for m in sys.modules} & {"playwright", "playwright_stealth", "supabase", "httpx"})
+print(heavy, file=sys.stderr)
+"""
+
+
+def test_parse_saved_page_uses_feeds():
+    feed = {
+        "units": [
+            {"unit_number": "B-312", "floor_plan": "Traditional 2x2", "beds": 2, "baths": 2, "rent": 1820},
+        ]
+    }
+
+    units = parse_saved_page("maa", "<html></html>", [feed])
+
+    assert [(unit.unit_number, unit.price, unit.source) for unit in units] == [("B-312", 1820, "maa")]
+
+
+def test_parse_only_cli_loads_no_browser_or_database():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, str(FIXTURE)], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert json.loads(result.stdout)["summary"] == {}
+    assert result.stderr.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,47 @@
+from dataclasses import replace
+
+from helpers import make_unit
+from main import persist_units
+from utils.fake_supabase import FakeSupabaseClient
+
+NOW_ISO = "2026-01-01T00:00:00+00:00"
+
+
+def make_units(count):
+    return [
+        make_unit(unit_number=f"A-{i:04d}", price=1800 + i, feature_tags=["Sunroom"])
+        for i in range(count)
+    ]
+
+
+def test_first_run_round_trips_scale_with_batches_not_units():
+    client = FakeSupabaseClient()
+
+    stats = persist_units(client, make_units(450), NOW_ISO)
+
+    assert stats.new_units == 450
+    # floor_plans: load + insert; per 200-key batch: key lookup, upsert,
+    # latest prices, history insert.
+    assert client.summary()["tables"] == {
+        "apartments": {"requests": 3, "rows_read": 0, "rows_written": 450},
+        "floor_plans": {"requests": 2, "rows_read": 0, "rows_written": 1},
+        "latest_price_history": {"requests": 3, "rows_read": 0, "rows_written": 0},
+        "price_history": {"requests": 3, "rows_read": 0, "rows_written": 450},
+        "rpc:apartments_by_keys": {"requests": 3, "rows_read": 0, "rows_written": 0},
+    }
+
+
+def test_unchanged_rerun_only_touches_last_seen():
+    client = FakeSupabaseClient()
+    units = make_units(450)
+    persist_units(client, units, NOW_ISO)
+    client.reset_stats()
+
+    stats = persist_units(client, [replace(unit) for unit in units], "2026-01-02T00:00:00+00:00")
+
+    assert (stats.new_units, stats.updated_units, stats.unchanged_units, stats.price_changes) == (0, 0, 450, 0)
+    tables = client.summary()["tables"]
+    assert tables["apartments"]["requests"] == 3
+    assert tables["rpc:apartments_by_keys"]["requests"] == 3
+    assert "price_history" not in tables
+    assert client.round_trips == 10
@@ -0,0 +1,198 @@
+import asyncio
+
+import pytest
+
+from config import DEFAULT_PROPERTY_ID
+from helpers import make_unit
+from main import property_results, run_sources, source_results, stream_outcomes
+from persistence.snapshots import SourceSnapshot
+from scrapers.base import FetchResult, ScrapedUnit, SourceBlocked, stream_units
+from scrapers.normalizer import StreamingNormalizer
+
+
+class StubScraper:
+    def __init__(
+        self,
+        source_name: str,
+        delay: float = 0.0,
+        error: Exception | None = None,
+        property_id: str = DEFAULT_PROPERTY_ID,
+    ):
+        self.source_name = source_name
+        self.source_url = f"https://{source_name}.example.com/"
+        self.property_id = property_id
+        self.delay = delay
+        self.error = error
+
+    async def fetch(self) -> FetchResult:
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return FetchResult(html=f"<p>{self.source_name}</p>")
+
+    def parse(self, fetched: FetchResult) -> list[ScrapedUnit]:
+        return [make_unit(source=self.source_name, unit_number=f"{self.source_name}-1")]
+
+    def stream(self, fetched: FetchResult):
+        return stream_units(self.parse(fetched))
+
+    def content_digest(self, fetched: FetchResult) -> str:
+        return f"hash-{self.source_name}"
+
+
+async def fetch_and_stream(scrapers, previous, skip=None):
+    """Run the fetch and parse stages the way ``_run_scrape`` wires them; returns (outcomes, short-circuited, units)."""
+
+    skip = skip or {}
+    expected = [scraper for scraper in scrapers if scraper.source_name not in skip]
+    completed, units = asyncio.Queue(), asyncio.Queue()
+    normalizer = StreamingNormalizer((scraper.property_id, scraper.source_name) for scraper in expected)
+    outcomes = await run_sources(scrapers, skip=skip, completed=completed)
+    short_circuited = await stream_outcomes(scrapers, completed, len(expected), previous, normalizer, units)
+    streamed = []
+    while (unit := units.get_nowait()) is not None:
+        streamed.append(unit)
+    return outcomes, short_circuited, streamed
+
+
+@pytest.mark.asyncio
+async def test_run_sources_isolates_failures_and_timeouts():
+    scrapers = [
+        StubScraper("maa"),
+        StubScraper("apartments_com", error=SourceBlocked("apartments_com_blocked")),
+        StubScraper("rentcafe", delay=5),
+    ]
+    outcomes = await run_sources(scrapers, concurrency=3, timeout_seconds=0.1)
+
+    assert [outcome.source for outcome in outcomes] == ["maa", "apartments_com", "rentcafe"]
+    assert outcomes[0].error is None and outcomes[0].fetched is not None
+    assert outcomes[0].content_hash == "hash-maa"
+    assert outcomes[1].error == "apartments_com_blocked"
+    assert outcomes[1].attempts == 1
+    assert outcomes[2].error is not None and "timed out" in outcomes[2].error
+    assert outcomes[1].fetched is None and outcomes[2].fetched is None
+
+
+@pytest.mark.asyncio
+async def test_run_sources_respects_concurrency_limit():
+    running = 0
+    peak = 0
+
+    class CountingScraper(StubScraper):
+        async def fetch(self) -> FetchResult:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return FetchResult(html="")
+
+    await run_sources([CountingScraper(f"s{i}") for i in range(5)], concurrency=2)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_short_circuit_requires_every_fetched_item_to_match():
+    previous = {
+        "maa": SourceSnapshot("maa", "hash-maa", 12),
+        "apartments_com": SourceSnapshot("apartments_com", "hash-apartments_com", 3),
+    }
+    scrapers = [StubScraper("maa"), StubScraper("apartments_com")]
+
+    _outcomes, short_circuited, streamed = await fetch_and_stream(scrapers, previous)
+    assert short_circuited and streamed == []
+
+    changed = {**previous, "apartments_com": SourceSnapshot("apartments_com", "stale")}
+    _outcomes, short_circuited, streamed = await fetch_and_stream(scrapers, changed)
+    # One change means everything is parsed, unchanged items included.
+    assert not short_circuited
+    assert sorted(unit.source for unit in streamed) == ["apartments_com", "maa"]
+
+    failing = [StubScraper("maa"), StubScraper("apartments_com", error=SourceBlocked("x"))]
+    _outcomes, short_circuited, streamed = await fetch_and_stream(failing, previous)
+    assert not short_circuited and [unit.source for unit in streamed] == ["maa"]
+
+
+class FlakyScraper(StubScraper):
+    def __init__(self, source_name: str, failures: int):
+        super().__init__(source_name)
+        self.failures = failures
+        self.calls = 0
+
+    async def fetch(self) -> FetchResult:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("net::ERR_TIMED_OUT")
+        return await super().fetch()
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_with_backoff():
+    delays = []
+
+    def delay(attempt):
+        delays.append(attempt)
+        return 0.0
+
+    recovers, gives_up = FlakyScraper("maa", failures=2), FlakyScraper("apartments_com", failures=9)
+    outcomes = await run_sources([recovers, gives_up], retries=3, delay=delay)
+
+    assert (outcomes[0].error, outcomes[0].attempts, outcomes[0].status) == (None, 3, "success")
+    assert (outcomes[1].error, outcomes[1].attempts, outcomes[1].status) == ("net::ERR_TIMED_OUT", 4, "failed")
+    assert sorted(delays) == [1, 1, 2, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_the_time_budget_would_run_out():
+    scraper = FlakyScraper("maa", failures=9)
+    outcomes = await run_sources([scraper], timeout_seconds=1, retries=3, delay=lambda attempt: 5.0)
+
+    assert scraper.calls == 1 and outcomes[0].attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_skipped_sources_are_not_fetched_and_do_not_block_short_circuit():
+    skipped = FlakyScraper("apartments_com", failures=9)
+    previous = {"maa": SourceSnapshot("maa", "hash-maa", 12)}
+    outcomes, short_circuited, _streamed = await fetch_and_stream(
+        [StubScraper("maa"), skipped], previous, skip={"apartments_com": "circuit open"}
+    )
+
+    assert skipped.calls == 0
+    assert (outcomes[1].status, outcomes[1].error) == ("skipped", "skipped: circuit open")
+    assert short_circuited
+    assert source_results(outcomes)["apartments_com"]["status"] == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_work_items_are_keyed_and_reported_per_property():
+    scrapers = [
+        StubScraper("maa"),
+        StubScraper("maa", property_id="maa-westshore"),
+        StubScraper("apartments_com", property_id="maa-westshore", error=SourceBlocked("blocked")),
+    ]
+    outcomes = await run_sources(scrapers, concurrency=2, skip={"maa-westshore/maa": "circuit open"})
+
+    assert [outcome.key for outcome in outcomes] == ["maa", "maa-westshore/maa", "maa-westshore/apartments_com"]
+    assert [outcome.status for outcome in outcomes] == ["success", "skipped", "failed"]
+    assert set(source_results(outcomes)) == {"maa", "maa-westshore/maa", "maa-westshore/apartments_com"}
+
+    report = property_results(outcomes, {"maa": 12})
+    assert report[DEFAULT_PROPERTY_ID]["success"] == 1 and report[DEFAULT_PROPERTY_ID]["units"] == 12
+    assert (report["maa-westshore"]["skipped"], report["maa-westshore"]["failed"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_retries_free_the_worker_for_other_items():
+    order = []
+
+    class Recording(FlakyScraper):
+        async def fetch(self) -> FetchResult:
+            order.append(self.source_name)
+            return await super().fetch()
+
+    flaky, steady = Recording("maa", failures=1), Recording("apartments_com", failures=0)
+    outcomes = await run_sources([flaky, steady], concurrency=1, delay=lambda attempt: 0.05)
+
+    assert order == ["maa", "apartments_com", "maa"]
+    assert [outcome.status for outcome in outcomes] == ["success", "success"]
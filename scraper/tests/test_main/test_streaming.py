@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+import main
+from helpers import make_unit
+from scrapers.base import FetchResult, ScrapedUnit, SourceBlocked, stream_units
+from utils.fake_supabase import FakeSupabaseClient
+
+
+class StreamingStub:
+    property_id = "maa-rocky-point"
+
+    def __init__(
+        self, source_name: str, unit_numbers: list[str], fail_after: int | None = None, price: float = 1820
+    ):
+        self.source_name = source_name
+        self.source_url = f"https://{source_name}.example.com/"
+        self.unit_numbers = unit_numbers
+        self.fail_after = fail_after
+        self.price = price
+
+    async def fetch(self) -> FetchResult:
+        return FetchResult(html=f"{self.price}:" + ",".join(self.unit_numbers))
+
+    def content_digest(self, fetched: FetchResult) -> str:
+        return fetched.html
+
+    def iter_units(self, fetched: FetchResult):
+        price, _, listed = fetched.html.partition(":")
+        for count, unit_number in enumerate(listed.split(","), 1):
+            yield make_unit(source=self.source_name, unit_number=unit_number, price=float(price))
+            if count == self.fail_after:
+                raise ValueError("card layout changed")
+
+    def parse(self, fetched: FetchResult) -> list[ScrapedUnit]:
+        return list(self.iter_units(fetched))
+
+    def stream(self, fetched: FetchResult):
+        return stream_units(self.iter_units(fetched))
+
+
+class RecordingPersister:
+    def __init__(self):
+        self.batches = []
+
+    def write(self, units):
+        self.batches.append(len(units))
+
+
+@pytest.mark.asyncio
+async def test_persist_stream_flushes_on_size_and_on_time():
+    queue = asyncio.Queue(maxsize=4)
+    persister = RecordingPersister()
+    consumer = asyncio.create_task(main.persist_stream(queue, persister, batch_size=3, flush_ms=20))
+
+    for unit_number in ("A", "B", "C", "D"):
+        await queue.put(make_unit(unit_number=unit_number))
+    await asyncio.sleep(0.1)
+    assert persister.batches == [3, 1]
+
+    await queue.put(make_unit(unit_number="E"))
+    await queue.put(None)
+    await consumer
+    assert persister.batches == [3, 1, 1]
+
+
+def run_with(monkeypatch, client, scrapers):
+    monkeypatch.setattr(main, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(main, "build_scrapers", lambda pool: scrapers)
+    return asyncio.run(main._run_scrape(None))
+
+
+def available_units(client):
+    return sorted(row["unit_number"] for row in client.rows("apartments") if row["is_available"])
+
+
+def test_source_failing_partway_keeps_its_units_and_skips_stale_marking(monkeypatch):
+    client = FakeSupabaseClient()
+    run_with(monkeypatch, client, [StreamingStub("maa", ["A-1", "X-9"])])
+
+    summary, status = run_with(
+        monkeypatch,
+        client,
+        [StreamingStub("maa", ["A-1", "A-2", "A-3"], fail_after=2), StreamingStub("apartments_com", ["B-1"])],
+    )
+
+    assert status == "partial"
+    assert summary == {"maa": 2, "apartments_com": 1}
+    # X-9 wasn't seen, but maa broke before listing everything, so it stays.
+    assert available_units(client) == ["A-1", "A-2", "B-1", "X-9"]
+    log = client.rows("scrape_logs")[-1]
+    assert log["source_results"]["maa"]["error"] == "parse failed: card layout changed"
+
+    _summary, status = run_with(
+        monkeypatch, client, [StreamingStub("maa", ["A-1", "A-2"]), StreamingStub("apartments_com", ["B-1"])]
+    )
+    assert status == "success"
+    assert available_units(client) == ["A-1", "A-2", "B-1"]
+
+
+def test_unchanged_sources_short_circuit_without_parsing(monkeypatch):
+    client = FakeSupabaseClient()
+    run_with(monkeypatch, client, [StreamingStub("maa", ["A-1"]), StreamingStub("apartments_com", ["B-1"])])
+    writes = client.stats["apartments"].rows_written
+
+    summary, status = run_with(
+        monkeypatch, client, [StreamingStub("maa", ["A-1"]), StreamingStub("apartments_com", ["B-1"])]
+    )
+
+    assert (summary, status) == ({"maa": 1, "apartments_com": 1}, "success")
+    assert client.rows("scrape_logs")[-1]["short_circuited"] is True
+    assert client.stats["apartments"].rows_written == writes + 2  # last_seen_at touch only
+    parsed, carried = client.rows("stats_snapshots")
+    assert (carried["unit_count"], carried["by_beds"]) == (parsed["unit_count"], parsed["by_beds"])
+
+
+class BlockedStub(StreamingStub):
+    async def fetch(self) -> FetchResult:
+        raise SourceBlocked(f"{self.source_name}_blocked")
+
+
+def test_reverted_content_is_written_after_a_run_that_saved_no_snapshots(monkeypatch):
+    client = FakeSupabaseClient()
+    run_with(monkeypatch, client, [StreamingStub("maa", ["A-1"]), StreamingStub("apartments_com", ["B-1"])])
+
+    # maa's new price is written, but the failed source keeps this run's
+    # hashes from being saved.
+    _summary, status = run_with(
+        monkeypatch, client, [StreamingStub("maa", ["A-1"], price=1900), BlockedStub("apartments_com", ["B-1"])]
+    )
+    assert status == "partial"
+    assert "maa" not in {row["source"] for row in client.rows("source_snapshots")}
+
+    # Back to the first run's page: its hash must not short-circuit past the
+    # price written in between.
+    run_with(monkeypatch, client, [StreamingStub("maa", ["A-1"]), StreamingStub("apartments_com", ["B-1"])])
+
+    assert client.rows("scrape_logs")[-1]["short_circuited"] is False
+    unit = next(row for row in client.rows("apartments") if row["unit_number"] == "A-1")
+    assert unit["current_price"] == 1820
+    history = [row["price"] for row in client.rows("price_history") if row["apartment_id"] == unit["id"]]
+    assert history == [1820, 1900, 1820]
@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+
+from helpers import make_unit
+from persistence.apartments import (
+    build_apartment_payload,
+    build_composite_key,
+    changed_fields,
+    fingerprint,
+    mark_stale_units,
+    touch_available_units,
+    upsert_apartments,
+)
+
+
+def test_build_composite_key():
+    assert build_composite_key(make_unit()) == "traditional-2x2_2_2_0_1134_b-312"
+    assert build_composite_key(make_unit(sq_ft=None, baths=2.5)) == "traditional-2x2_2_2_5_0_b-312"
+    westshore = make_unit(property_id="maa-westshore")
+    assert build_composite_key(westshore) == "maa-westshore:traditional-2x2_2_2_0_1134_b-312"
+
+
+def test_build_apartment_payload_includes_feature_flags():
+    unit = make_unit(feature_tags=["Top Floor", "Sunroom"])
+    payload = build_apartment_payload(unit, "key", 7, "2026-01-01T00:00:00+00:00")
+
+    assert payload["composite_key"] == "key"
+    assert payload["floor_plan_id"] == 7
+    assert payload["current_price"] == 1820
+    assert payload["is_top_floor"] is True
+    assert payload["has_sunroom"] is True
+    assert "first_seen_at" not in payload
+
+
+class RecordingQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = None
+        self.payload = None
+        self.filters = []
+
+    def upsert(self, payload, on_conflict=None):
+        self.op, self.payload = "upsert", payload
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    def execute(self):
+        self.client.calls.append((self.table, self.op, self.payload, self.filters))
+        if self.op == "upsert":
+            return SimpleNamespace(
+                data=[{"id": 100 + i, "composite_key": row["composite_key"]} for i, row in enumerate(self.payload)]
+            )
+        return SimpleNamespace(data=[])
+
+
+class RecordingClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def table(self, name):
+        return RecordingQuery(self, name)
+
+    def rpc(self, name, params):
+        self.calls.append((name, "rpc", params, []))
+        data = list(self.rows) if name == "apartments_by_keys" else 3
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=data))
+
+
+def stored_row(unit, apartment_id, **overrides):
+    key = build_composite_key(unit)
+    row = build_apartment_payload(unit, key, 7, "2026-01-01T00:00:00+00:00")
+    row.update(id=apartment_id, first_seen_at="2026-01-01T00:00:00+00:00", **overrides)
+    return row
+
+
+def test_fingerprint_ignores_timestamps_and_numeric_formatting():
+    unit = make_unit(price=1820.0)
+    payload = build_apartment_payload(unit, "key", 7, "2026-02-01T00:00:00+00:00")
+    stored = stored_row(unit, 1, current_price=1820, baths="2.0", last_seen_at="2026-01-01T00:00:00+00:00")
+
+    assert fingerprint(payload) == fingerprint(stored)
+    assert changed_fields(payload, stored) == {}
+    assert changed_fields(payload, {**stored, "current_price": 1795}) == {"current_price": 1820.0}
+
+
+def test_upsert_apartments_writes_only_the_diff():
+    unchanged = make_unit(unit_number="A-101")
+    repriced = make_unit(unit_number="A-102", price=1790)
+    fresh = make_unit(unit_number="A-103")
+    client = RecordingClient([stored_row(unchanged, 1), stored_row(make_unit(unit_number="A-102"), 2)])
+
+    diff = upsert_apartments(client, [unchanged, repriced, fresh], [7, 7, 7], "2026-02-01T00:00:00+00:00")
+
+    assert (diff.inserted, diff.updated, diff.unchanged) == (1, 1, 1)
+    assert [result.apartment_id for result in diff.results] == [1, 2, 100]
+
+    lookup = client.calls[0]
+    assert lookup[:2] == ("apartments_by_keys", "rpc")
+    assert sorted(lookup[2]["keys"]) == sorted(build_composite_key(unit) for unit in (unchanged, repriced, fresh))
+    writes = [(op, payload, filters) for _table, op, payload, filters in client.calls if op != "rpc"]
+    assert len(writes) == 3
+    upsert, update, touch = writes
+    assert [row["unit_number"] for row in upsert[1]] == ["A-103"]
+    assert update[1] == {
+        "current_price": 1790,
+        "last_seen_at": "2026-02-01T00:00:00+00:00",
+        "updated_at": "2026-02-01T00:00:00+00:00",
+    }
+    assert update[2] == [("id", [2])]
+    assert touch[1] == {"last_seen_at": "2026-02-01T00:00:00+00:00"}
+    assert touch[2] == [("id", [1])]
+
+
+def test_failed_floor_plan_lookup_keeps_the_stored_plan():
+    unchanged = make_unit(unit_number="A-101")
+    repriced = make_unit(unit_number="A-102", price=1790)
+    client = RecordingClient([stored_row(unchanged, 1), stored_row(make_unit(unit_number="A-102"), 2)])
+
+    diff = upsert_apartments(client, [unchanged, repriced], [None, None], "2026-02-01T00:00:00+00:00")
+
+    assert (diff.inserted, diff.updated, diff.unchanged) == (0, 1, 1)
+    updates = [payload for _table, op, payload, _filters in client.calls if op == "update"]
+    update = next(payload for payload in updates if "updated_at" in payload)
+    assert "floor_plan_id" not in update and update["current_price"] == 1790
+
+
+def test_touch_available_units_only_refreshes_the_checked_properties(fake_supabase):
+    old = "2026-01-01T00:00:00+00:00"
+    rows = [("maa-rocky-point", True), ("maa-westshore", True), ("maa-rocky-point", False)]
+    fake_supabase.table("apartments").insert(
+        [
+            {"composite_key": f"k{i}", "property_id": property_id, "is_available": available, "last_seen_at": old}
+            for i, (property_id, available) in enumerate(rows)
+        ]
+    ).execute()
+
+    assert touch_available_units(fake_supabase, "2026-02-01T00:00:00+00:00", {"maa-rocky-point"}) == 1
+    assert [row["last_seen_at"] for row in fake_supabase.rows("apartments")] == ["2026-02-01T00:00:00+00:00", old, old]
+
+
+def test_mark_stale_units_sends_the_seen_keys_and_property_scope_in_one_rpc():
+    client = RecordingClient([])
+
+    removed = mark_stale_units(client, {"key-b", "key-a"}, {"maa-westshore", "maa-rocky-point"})
+
+    assert removed == 3
+    assert client.calls == [
+        (
+            "mark_stale_units",
+            "rpc",
+            {"seen_keys": ["key-a", "key-b"], "property_ids": ["maa-rocky-point", "maa-westshore"]},
+            [],
+        )
+    ]
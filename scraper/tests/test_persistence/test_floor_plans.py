@@ -0,0 +1,33 @@
+from helpers import make_unit
+from persistence.floor_plans import FloorPlanCache, FloorPlanRecord, floor_plan_key
+from utils.fake_supabase import FakeSupabaseClient
+
+
+def test_floor_plan_key_normalizes_numeric_types():
+    assert floor_plan_key("Traditional 2x2", "2", "2.0") == ("Traditional 2x2", 2, 2.0)
+
+
+def test_widen_tracks_sq_ft_range():
+    record = FloorPlanRecord(id=1, name="Traditional 2x2", beds=2, baths=2.0, sq_ft_min=1100, sq_ft_max=1134)
+
+    record.widen(1120)
+    assert record.dirty is False
+
+    record.widen(None)
+    record.widen(1200)
+    assert (record.sq_ft_min, record.sq_ft_max) == (1100, 1200)
+    assert record.dirty is True
+
+
+def test_floor_plans_are_scoped_by_property():
+    # A plan stored before multi-property mode has no property_id column value.
+    client = FakeSupabaseClient(
+        tables={"floor_plans": [{"id": 1, "name": "Traditional 2x2", "beds": 2, "baths": 2.0, "sq_ft_min": 1134}]}
+    )
+    cache = FloorPlanCache(client)
+    cache.load()
+
+    ids = cache.resolve([make_unit(sq_ft=1134), make_unit(property_id="maa-westshore", sq_ft=1090)])
+
+    assert ids[0] == 1 and ids[1] not in (None, 1)
+    assert client.rows("floor_plans")[1]["property_id"] == "maa-westshore"
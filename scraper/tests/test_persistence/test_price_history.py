@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from persistence.price_history import PriceObservation, write_price_history
+
+NOW_ISO = "2026-02-01T00:00:00+00:00"
+
+
+class RecordingQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = None
+        self.payload = None
+        self.filters = []
+
+    def select(self, columns):
+        self.op = "select"
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    def execute(self):
+        self.client.calls.append((self.table, self.op, self.payload, self.filters))
+        if self.op == "select":
+            ids = set(self.filters[0][1])
+            return SimpleNamespace(data=[row for row in self.client.latest if row["apartment_id"] in ids])
+        return SimpleNamespace(data=[])
+
+
+class RecordingClient:
+    def __init__(self, latest):
+        self.latest = latest
+        self.calls = []
+
+    def table(self, name):
+        return RecordingQuery(self, name)
+
+
+def observe(apartment_id: int, price: float | None) -> PriceObservation:
+    return PriceObservation(apartment_id=apartment_id, price=price, move_in_special=None, source="maa")
+
+
+def seeded():
+    return RecordingClient([{"apartment_id": 1, "price": 1820}, {"apartment_id": 2, "price": 1900}])
+
+
+def test_unchanged_prices_insert_nothing():
+    client = seeded()
+
+    result = write_price_history(client, [observe(1, 1820.0), observe(2, 1900), observe(3, None)], NOW_ISO)
+
+    assert (result.inserted, result.price_changes) == (0, 0)
+    # One read of the latest prices, for the priced units only.
+    assert client.calls == [("latest_price_history", "select", None, [("apartment_id", [1, 2])])]
+
+
+def test_changed_price_inserts_one_row_and_stamps_the_apartment():
+    client = seeded()
+
+    result = write_price_history(client, [observe(1, 1795), observe(2, 1900)], NOW_ISO)
+
+    assert (result.inserted, result.changed_apartment_ids) == (1, [1])
+    writes = [(table, op, payload, filters) for table, op, payload, filters in client.calls if op != "select"]
+    assert writes == [
+        (
+            "price_history",
+            "insert",
+            [{"apartment_id": 1, "price": 1795, "move_in_special": None, "source": "maa", "recorded_at": NOW_ISO}],
+            [],
+        ),
+        ("apartments", "update", {"last_price_change_at": NOW_ISO}, [("id", [1])]),
+    ]
+
+
+def test_first_price_is_recorded_without_counting_as_a_change():
+    client = seeded()
+
+    result = write_price_history(client, [observe(3, 2100)], NOW_ISO)
+
+    assert (result.inserted, result.price_changes) == (1, 0)
+    assert [op for _table, op, _payload, _filters in client.calls] == ["select", "insert"]
@@ -1,4 +1,4 @@
-from utils.feature_parser import parse_feature_flags
+from utils.feature_parser import match_known_tags, parse_feature_flags
 
 
 def test_parse_feature_flags():
@@ -18,3 +18,20 @@ def test_parse_feature_flags():
     assert flags["is_renovated"] is True
     assert flags["has_sunroom"] is True
     assert flags["has_garage"] is False
+
+
+def test_parse_feature_flags_matches_unknown_tags_by_keyword():
+    flags = parse_feature_flags(["Kitchen Upgrade Package", "Private Attached Garage", "In-unit Washer", "Pool View"])
+
+    assert flags["is_renovated"] is True
+    assert flags["has_garage"] is True
+    assert flags["has_washer_dryer"] is True
+    assert flags["view_type"] == "pool"
+    assert flags["has_balcony"] is False
+
+
+def test_match_known_tags_keeps_vocabulary_order():
+    text = "sunroom | bay view | top floor | end unit | detached garage"
+
+    assert match_known_tags(text) == ["Top Floor", "Detached Garage", "Sunroom", "Bay View", "End Unit"]
+    assert parse_feature_flags(match_known_tags(text))["view_type"] == "bay"
@@ -0,0 +1,62 @@
+from persistence.apartments import build_composite_key
+from scrapers import maa_parser
+from scrapers.feed_parser import looks_like_availability, units_from_feeds, units_from_payload
+
+FEED = {
+    "data": {
+        "floorplans": [
+            {
+                "name": "Traditional 2x2",
+                "beds": 2,
+                "baths": "2",
+                "sqft": "1,134",
+                "units": [
+                    {
+                        "unitNumber": "b-312",
+                        "rent": {"min": 1820, "max": 1890},
+                        "availableDate": "2026-03-15",
+                        "amenities": [{"name": "Top Floor"}, "Sunroom"],
+                        "specials": [{"title": "6 weeks free"}],
+                    },
+                    {"unitNumber": "b-314", "rent": "$1,845", "squareFeet": 1140},
+                ],
+            }
+        ]
+    }
+}
+
+
+def test_units_from_payload_inherits_floor_plan_fields():
+    units = units_from_payload(FEED, "maa", "https://example.com")
+
+    assert [unit.unit_number for unit in units] == ["B-312", "B-314"]
+    first, second = units
+    assert first.floor_plan_name == "Traditional 2x2"
+    assert (first.beds, first.baths, first.sq_ft, first.price) == (2, 2.0, 1134, 1820)
+    assert first.available_date == "2026-03-15"
+    assert first.move_in_special == "6 weeks free"
+    assert first.feature_tags == ["Top Floor", "Sunroom"]
+    assert (second.sq_ft, second.price) == (1140, 1845)
+
+
+def test_looks_like_availability_ignores_unrelated_json():
+    assert looks_like_availability(FEED)
+    assert not looks_like_availability({"units": [{"id": 1}], "analytics": {"page": "home"}})
+    assert not looks_like_availability({"cart": [{"unitId": "sku-4411", "price": 19.99, "qty": 2}]})
+    assert not looks_like_availability({"lineItems": [{"unit": "ea", "amount": 1200, "bedrooms": 1}]})
+    assert not looks_like_availability({"units": [{"unitNumber": "B-312", "rent": 1820}]})
+    assert units_from_feeds([{"config": True}, FEED], "maa", "https://example.com")[0].unit_number == "B-312"
+
+
+def test_feed_and_dom_produce_the_same_composite_key():
+    page = """
+    <div data-testid="unit-card">
+      <h3>Unit B-312</h3><p>Traditional 2x2</p>
+      <ul><li>2 Beds</li><li>2 Baths</li><li>1,134 sq ft</li></ul>
+      <span>$1,820</span><span>/mo</span>
+    </div>
+    """
+    (from_dom,) = maa_parser.parse_html(page, "https://example.com/maa")
+    from_feed = units_from_payload(FEED, "maa", "https://example.com/maa")[0]
+
+    assert build_composite_key(from_dom) == build_composite_key(from_feed)
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+from scrapers import apartments_com_parser, maa_parser
+from scrapers.base import FetchResult
+from scrapers.snapshot import content_digest
+from utils.html_parsing import element_text, page_title, parse_document
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+MAA_PAGE = """
+<html><head><title>MAA Rocky Point</title></head><body>
+  <div data-testid="unit-card">
+    <h3><a href="/units/b-312">Unit B-312</a></h3>
+    <p>Traditional 2x2</p>
+    <ul><li>2 Beds</li><li>2 Baths</li><li>1,134 sq ft</li></ul>
+    <span>$1,820</span><span>/mo</span>
+    <p>Available Mar 15, 2026</p>
+    <p>Top Floor | Sunroom | Wood Burning Fireplace</p>
+    <p>6 weeks free</p>
+  </div>
+  <div data-testid="unit-card"><p>Call for details</p></div>
+  <article><p>Unit Z-999 3 bed 2 bath $2,500</p></article>
+</body></html>
+"""
+
+APARTMENTS_COM_PAGE = """
+<html><body>
+  <div class="pricingGridItem"><span>$1,830</span> <span>2x2</span> <span>2 Beds</span>
+    <span>2 Baths</span></div>
+  <article><p>No pricing here</p></article>
+</body></html>
+"""
+
+
+def test_element_text_breaks_lines_on_blocks():
+    tree = parse_document("<div><p>Unit  B-312</p><span>$1,820</span><span>/mo</span><script>x()</script></div>")
+    assert element_text(tree.find(".//div")) == "Unit B-312\n$1,820/mo"
+
+
+def test_maa_parse_html_uses_first_matching_selector():
+    units = maa_parser.parse_html(MAA_PAGE, "https://example.com/maa")
+
+    assert len(units) == 1
+    unit = units[0]
+    assert unit.unit_number == "B-312"
+    assert unit.floor_plan_name == "Traditional 2x2"
+    assert (unit.beds, unit.baths) == (2, 2.0)
+    assert (unit.price, unit.sq_ft) == (1820, 1134)
+    assert unit.available_date == "Mar 15, 2026"
+    assert unit.move_in_special == "6 weeks free"
+    assert unit.feature_tags == ["Top Floor", "Wood Burning Fireplace", "Sunroom"]
+    assert unit.source == "maa"
+    assert unit.source_url == "https://example.com/units/b-312"
+
+
+def test_cards_keep_the_unit_link():
+    first, empty = maa_parser.cards(MAA_PAGE, "https://example.com/maa")
+
+    assert first.href == "https://example.com/units/b-312"
+    assert first.text.startswith("Unit B-312\nTraditional 2x2")
+    assert empty.href is None
+
+
+def test_cards_skip_links_that_are_not_pages():
+    page = """
+    <div data-testid="unit-card">
+      <a href="javascript:void(0)">Unit B-312</a> <a href="tel:+15555550100">Call</a> <a href="#tour">Tour</a>
+      <p>2 Beds 2 Baths 1,134 sq ft $1,820</p>
+    </div>
+    <div data-testid="unit-card">
+      <a href="tel:+15555550100">Unit B-314</a> <a href="https://example.com/units/b-314">Details</a>
+      <p>2 Beds 2 Baths 1,140 sq ft $1,845</p>
+    </div>
+    """
+
+    assert [card.href for card in maa_parser.cards(page, "https://example.com/maa")] == [
+        None,
+        "https://example.com/units/b-314",
+    ]
+    units = maa_parser.parse_html(page, "https://example.com/maa")
+    assert [unit.source_url for unit in units] == ["https://example.com/maa", "https://example.com/units/b-314"]
+
+
+def test_apartments_com_parse_html():
+    units = apartments_com_parser.parse_html(APARTMENTS_COM_PAGE, "https://example.com/apts")
+
+    assert len(units) == 1
+    assert units[0].unit_number == "APT-001"
+    assert units[0].floor_plan_name == "2x2"
+    assert (units[0].beds, units[0].baths, units[0].price) == (2, 2.0, 1830)
+    assert units[0].source_url == "https://example.com/apts"
+
+
+def test_captured_fixtures_parse_offline():
+    html = (FIXTURES / "maa_rocky_point_page.html").read_text(encoding="utf-8")
+
+    assert maa_parser.is_blocked(page_title(parse_document(html)), html)
+    assert maa_parser.parse_html(html, "https://example.com/maa") == []
+    assert apartments_com_parser.parse_html("", "https://example.com/apts") == []
+
+
+def test_content_digest_ignores_markup_outside_cards():
+    noisy = MAA_PAGE.replace("<title>MAA Rocky Point</title>", "<title>MAA</title><script>var t=1</script>")
+    assert content_digest(FetchResult(html=MAA_PAGE), maa_parser.card_texts) == content_digest(
+        FetchResult(html=noisy), maa_parser.card_texts
+    )
+    assert content_digest(FetchResult(html=MAA_PAGE), maa_parser.card_texts) != content_digest(
+        FetchResult(html=MAA_PAGE.replace("$1,820", "$1,845")), maa_parser.card_texts
+    )
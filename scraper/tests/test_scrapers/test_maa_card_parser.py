@@ -0,0 +1,36 @@
+from scrapers.maa_parser import parse_card
+
+
+def test_parse_card_extracts_every_field():
+    unit = parse_card(
+        "$2,045/mo\nUnit b-312\nTownhome 3x2.5 | Garage\n3 Beds\n2.5 Baths\nAvailable on 03/15/2026\n"
+        "Look-and-Lease: $500 off\nTop Floor | Attached Garage",
+        index=0,
+        source_url="https://example.com",
+    )
+
+    assert unit is not None
+    assert unit.unit_number == "B-312"
+    assert unit.floor_plan_name == "Townhome 3x2.5"
+    assert (unit.beds, unit.baths, unit.price) == (3, 2.5, 2045)
+    assert unit.available_date == "03/15/2026"
+    assert unit.move_in_special == "Look-and-Lease: $500 off"
+    assert unit.feature_tags == ["Top Floor", "Attached Garage"]
+
+
+def test_parse_card_keeps_original_case_around_expanding_characters():
+    unit = parse_card("İ\nHOME #a-101\n2x2\nAvailable Now", index=4, source_url="https://example.com")
+
+    assert unit is not None
+    assert unit.unit_number == "A-101"
+    assert unit.floor_plan_name == "2x2"
+    assert (unit.beds, unit.baths) == (2, 2.0)
+
+
+def test_parse_card_falls_back_and_skips_empty_cards():
+    unit = parse_card("2 bed 1 bath", index=6, source_url="https://example.com")
+
+    assert unit is not None
+    assert unit.unit_number == "MAA-007"
+    assert unit.floor_plan_name == "Unknown Floor Plan"
+    assert parse_card("Call for details", index=0, source_url="https://example.com") is None
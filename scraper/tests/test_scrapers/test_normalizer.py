@@ -1,5 +1,5 @@
 from scrapers.base import ScrapedUnit
-from scrapers.normalizer import normalize_units
+from scrapers.normalizer import MATCH_THRESHOLD, StreamingNormalizer, normalize_units, reconcile_units, similarity
 
 
 def make_unit(source: str, unit: str, price: float | None):
@@ -28,3 +28,101 @@ def test_normalizer_prefers_maa_source():
     assert len(normalized) == 1
     assert normalized[0].source == "maa"
     assert normalized[0].price == 1820
+
+
+def test_streaming_normalizer_holds_units_a_better_source_may_replace():
+    normalizer = StreamingNormalizer([("maa-rocky-point", "maa"), ("maa-rocky-point", "apartments_com")])
+    listed_late = make_unit("apartments_com", "B-312", 1830)
+    only_on_apartments_com = make_unit("apartments_com", "C-101", 1700)
+
+    assert normalizer.add(listed_late) == []
+    assert normalizer.add(only_on_apartments_com) == []
+    assert normalizer.finish("maa-rocky-point", "apartments_com") == []
+
+    maa = make_unit("maa", "B-312", 1820)
+    assert normalizer.add(maa) == [maa]
+    assert normalizer.finish("maa-rocky-point", "maa") == [only_on_apartments_com]
+    assert sorted(u.unit_number for u in normalizer.units()) == sorted(
+        u.unit_number for u in normalize_units([listed_late, only_on_apartments_com, maa])
+    )
+    assert normalizer.units()[0].source == "maa"
+
+
+def listing(source: str, unit: str, plan: str, sq_ft: int | None, price: float | None) -> ScrapedUnit:
+    return ScrapedUnit(
+        unit_number=unit,
+        floor_plan_name=plan,
+        beds=2,
+        baths=2.0,
+        sq_ft=sq_ft,
+        price=price,
+        available_date=None,
+        move_in_special=None,
+        feature_tags=[],
+        source=source,
+        source_url="https://example.com",
+    )
+
+
+def test_cross_source_matching_folds_synthetic_listings_into_maa_units():
+    units = [
+        listing("apartments_com", "APT-001", "2x2", 1134, 1830),
+        listing("apartments_com", "APT-002", "2x2", 1134, 1825),
+        listing("apartments_com", "APT-003", "2x2", 1290, 2150),
+        listing("maa", "B-312", "Traditional 2x2", 1134, 1820),
+        listing("maa", "C-101", "Traditional 2x2", 1180, 1700),
+    ]
+
+    normalized, report = reconcile_units(units)
+
+    # One MAA unit absorbs at most one Apartments.com listing; the larger,
+    # pricier home has no counterpart and is kept.
+    assert [(u.source, u.unit_number) for u in normalized] == [
+        ("apartments_com", "APT-002"),
+        ("apartments_com", "APT-003"),
+        ("maa", "B-312"),
+        ("maa", "C-101"),
+    ]
+    assert (report.matched, report.unmatched) == (1, 2)
+    assert normalize_units(units) == normalized
+
+
+def test_real_unit_numbers_decide_matches_outright():
+    maa = listing("maa", "B-312", "Traditional 2x2", 1134, 1820)
+
+    assert similarity(maa, listing("rentcafe", "b-312", "B2", 1100, 1900)) == 1.0
+    assert similarity(maa, listing("rentcafe", "B-314", "Traditional 2x2", 1134, 1820)) == 0.0
+    assert similarity(maa, listing("apartments_com", "APT-001", "2x2", 1134, 1820)) >= MATCH_THRESHOLD
+
+
+def test_streaming_normalizer_matches_held_units_on_release():
+    normalizer = StreamingNormalizer([("maa-rocky-point", "maa"), ("maa-rocky-point", "apartments_com")])
+    duplicate = listing("apartments_com", "APT-001", "2x2", 1134, 1830)
+
+    assert normalizer.add(duplicate) == []
+    maa = listing("maa", "B-312", "Traditional 2x2", 1134, 1820)
+    assert normalizer.add(maa) == [maa]
+    assert normalizer.finish("maa-rocky-point", "maa") == []
+    assert normalizer.units() == [maa] and len(normalizer) == 1
+    assert normalizer.report.matched == 1
+
+
+def test_replaced_records_leave_the_match_index():
+    normalizer = StreamingNormalizer([("maa-rocky-point", "maa"), ("maa-rocky-point", "apartments_com")])
+    maa = listing("maa", "B-312", "Traditional 2x2", 1134, 1820)
+    assert normalizer.add(maa) == [maa]
+    assert normalizer.finish("maa-rocky-point", "maa") == []
+
+    # The same Apartments.com home arrives twice, the priced record last.
+    unpriced = listing("apartments_com", "APT-007", "2x2", 1290, None)
+    priced = listing("apartments_com", "APT-007", "2x2", 1290, 2150)
+    assert normalizer.add(unpriced) == [unpriced]
+    assert normalizer.add(priced) == [priced]
+    assert (normalizer.report.matched, normalizer.report.unmatched) == (0, 1)
+
+    # A third source's listing of that home matches the current record only.
+    rentcafe = listing("rentcafe", "", "2x2", 1290, 2150)
+    assert normalizer.add(rentcafe) == []
+    assert normalizer.finish("maa-rocky-point", "apartments_com") == []
+    assert (normalizer.report.matched, normalizer.report.unmatched) == (1, 1)
+    assert normalizer.units() == [maa, priced]
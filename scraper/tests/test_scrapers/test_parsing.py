@@ -1,4 +1,4 @@
-from utils.parsing import normalize_sq_ft, parse_price
+from utils.parsing import normalize_sq_ft, parse_card_numbers, parse_price
 
 
 def test_parse_price_variants():
@@ -14,3 +14,10 @@ def test_normalize_sq_ft_variants():
     assert normalize_sq_ft("1134 SF") == 1134
     assert normalize_sq_ft("1134") == 1134
     assert normalize_sq_ft("unknown") is None
+
+
+def test_parse_card_numbers_reads_labelled_values():
+    assert parse_card_numbers("Unit B-312\nTraditional 2x2\n1,134 sq ft\n$1,820/mo") == (1820, 1134)
+    assert parse_card_numbers("$2,045 - $2,300 | 1290 SF") == (2045, 1290)
+    assert parse_card_numbers("Home 1134\n2 bed 1 bath") == (None, 1134)
+    assert parse_card_numbers("Call, for details") == (None, None)
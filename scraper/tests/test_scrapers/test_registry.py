@@ -0,0 +1,55 @@
+import pytest
+
+from config import PropertyConfig, RoutingPolicy, ScraperSource
+from scrapers.maa_scraper import MAAScraper
+from scrapers.registry import build_scraper, build_scrapers, enabled_sources, load_scraper_class
+
+MAA_PATH = "scrapers.maa_scraper:MAAScraper"
+APARTMENTS_COM_PATH = "scrapers.apartments_com:ApartmentsComScraper"
+
+
+def test_build_scrapers_follows_config_and_skips_disabled():
+    routing = RoutingPolicy(allowed_domains=("example.com",))
+    sources = [
+        ScraperSource(name="maa", url="https://example.com/a", scraper=MAA_PATH, routing=routing),
+        ScraperSource(name="maa", url="https://example.com/b", scraper=MAA_PATH, enabled=False),
+    ]
+
+    scrapers = build_scrapers(None, sources)
+
+    assert len(scrapers) == 1
+    assert isinstance(scrapers[0], MAAScraper)
+    assert scrapers[0].source_url == "https://example.com/a"
+    assert scrapers[0].source.routing is routing
+
+
+def test_default_config_builds_enabled_sources_only():
+    names = [source.name for source in enabled_sources()]
+
+    assert "rentcafe" not in names
+    assert [scraper.source_name for scraper in build_scrapers()] == names
+    assert build_scraper("maa").source_url.startswith("https://www.maac.com/")
+
+
+def test_source_without_scraper_path_is_rejected():
+    with pytest.raises(ValueError, match="rentcafe"):
+        load_scraper_class(ScraperSource(name="rentcafe", url="https://example.com"))
+
+
+def test_each_property_gets_a_scraper_per_source_it_lists():
+    sources = [
+        ScraperSource(name="maa", url="https://example.com/rocky-point", scraper=MAA_PATH),
+        ScraperSource(name="apartments_com", url="https://example.com/apt", scraper=APARTMENTS_COM_PATH),
+    ]
+    properties = [
+        PropertyConfig(id="maa-rocky-point", name="MAA Rocky Point"),
+        PropertyConfig(id="maa-westshore", name="MAA Westshore", urls={"maa": "https://example.com/westshore"}),
+    ]
+
+    scrapers = build_scrapers(None, sources, properties)
+
+    assert [(s.property_id, s.source_name, s.source_url) for s in scrapers] == [
+        ("maa-rocky-point", "maa", "https://example.com/rocky-point"),
+        ("maa-rocky-point", "apartments_com", "https://example.com/apt"),
+        ("maa-westshore", "maa", "https://example.com/westshore"),
+    ]
@@ -0,0 +1,36 @@
+import json
+
+import scripts.benchmark
+from scripts.benchmark import main, synthetic_maa_page
+from scrapers import maa_parser
+
+
+def test_synthetic_page_parses_to_one_unit_per_card():
+    units = maa_parser.parse_html(synthetic_maa_page(120), "https://example.com/maa")
+
+    assert len(units) == 120
+    assert len({unit.unit_number for unit in units}) == 120
+    assert all(unit.price and unit.beds for unit in units)
+
+
+def test_benchmark_writes_every_stage(tmp_path):
+    output = tmp_path / "bench.json"
+
+    assert main(["--cards", "60", "--repeat", "1", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert results["meta"]["cards"] == 60
+    assert results["stages"]["maa_parse_html"]["items"] == 60
+    assert results["stages"]["persist_warm"]["round_trips"] > 0
+    assert all(stage["peak_bytes"] > 0 for stage in results["stages"].values())
+
+
+def test_only_builds_the_selected_stages_inputs(tmp_path, monkeypatch):
+    def unexpected(cards, seed=7):
+        raise AssertionError("synthetic page built for a stage that was not selected")
+
+    monkeypatch.setattr(scripts.benchmark, "synthetic_maa_page", unexpected)
+    output = tmp_path / "bench.json"
+
+    assert main(["--only", "fixture_pages", "--repeat", "1", "--output", str(output)]) == 0
+    assert list(json.loads(output.read_text())["stages"]) == ["fixture_pages"]
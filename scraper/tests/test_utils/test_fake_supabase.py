@@ -0,0 +1,66 @@
+import pytest
+
+from utils.fake_supabase import FakeSupabaseClient, FakeSupabaseError
+from utils.supabase_client import get_supabase_client
+
+
+def test_builder_chain_reads_and_writes_rows():
+    client = FakeSupabaseClient()
+
+    inserted = client.table("floor_plans").insert([{"name": "A", "beds": 1}, {"name": "B", "beds": 2}]).execute()
+    assert [row["id"] for row in inserted.data] == [1, 2]
+
+    client.table("floor_plans").upsert([{"id": 2, "name": "B", "beds": 3}], on_conflict="id").execute()
+    updated = client.table("floor_plans").update({"beds": 4}, count="exact", returning="minimal").eq("id", 1).execute()
+    assert (updated.data, updated.count) == ([], 1)
+
+    rows = client.table("floor_plans").select("name,beds").order("beds", desc=True).limit(1).execute()
+    assert rows.data == [{"name": "A", "beds": 4}]
+    assert client.table("floor_plans").select("id").in_("name", ["B", "C"]).execute().data == [{"id": 2}]
+
+    assert client.table("floor_plans").delete(returning="minimal").eq("name", "B").execute().data == []
+    assert [row["name"] for row in client.rows("floor_plans")] == ["A"]
+    assert client.table("floor_plans").select("id").eq("name", "B").execute().data == []
+
+
+def test_unique_columns_and_views_match_the_schema():
+    client = FakeSupabaseClient(tables={"apartments": [{"composite_key": "k", "is_available": True}]})
+
+    with pytest.raises(FakeSupabaseError):
+        client.table("apartments").insert({"composite_key": "k"}).execute()
+
+    client.table("price_history").insert(
+        [
+            {"apartment_id": 1, "price": 1800, "recorded_at": "2026-01-01"},
+            {"apartment_id": 1, "price": 1750, "recorded_at": "2026-02-01"},
+        ]
+    ).execute()
+    latest = client.table("latest_price_history").select("apartment_id,price").in_("apartment_id", [1]).execute()
+    assert latest.data == [{"apartment_id": 1, "price": 1750}]
+
+    assert client.rpc("mark_stale_units", {"seen_keys": []}).execute().data == 1
+    assert client.rows("apartments")[0]["is_available"] is False
+
+
+def test_counts_round_trips_per_table_and_storage():
+    client = FakeSupabaseClient(latency_ms=2)
+
+    client.table("price_history").insert([{"apartment_id": 1, "price": 1}] * 3).execute()
+    client.table("price_history").select("*").execute()
+    client.storage.from_("apt-images").upload("debug/a.png", b"png", {"upsert": True})
+
+    summary = client.summary()
+    assert summary["round_trips"] == 3
+    assert summary["simulated_latency_seconds"] == 0.006
+    assert summary["tables"]["price_history"] == {"requests": 2, "rows_read": 3, "rows_written": 3}
+    assert summary["tables"]["storage:apt-images"]["rows_written"] == 1
+    assert client.objects["apt-images"]["debug/a.png"] == b"png"
+
+
+def test_env_switch_returns_a_shared_fake(monkeypatch):
+    monkeypatch.setenv("SUPABASE_FAKE", "1")
+
+    client = get_supabase_client()
+
+    assert isinstance(client, FakeSupabaseClient)
+    assert get_supabase_client() is client
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+from utils.rate_limit import DomainRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_same_host_requests_are_spaced_and_other_hosts_are_not():
+    limiter = DomainRateLimiter(delay_range=(0.05, 0.05))
+
+    waits = await asyncio.gather(
+        limiter.wait("https://www.maac.com/a"),
+        limiter.wait("https://maac.com/b"),
+        limiter.wait("https://www.apartments.com/c"),
+        limiter.wait("https://www.maac.com/d"),
+    )
+
+    assert waits[0] == 0 and waits[2] == 0
+    assert waits[1] == pytest.approx(0.05, abs=0.01)
+    assert waits[3] == pytest.approx(0.10, abs=0.01)
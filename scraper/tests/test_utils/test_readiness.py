@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from utils.playwright_context import FeedRecorder, Readiness, goto_with_feed, wait_until_ready
+
+
+class FakePage:
+    url = "https://example.com"
+
+    def __init__(self, counts: list[int], idle_after: float | None = None):
+        self.counts = counts
+        self.idle_after = idle_after
+
+    async def evaluate(self, _script: str, _selector: str) -> int:
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+    async def wait_for_load_state(self, _state: str, timeout: float) -> None:
+        if self.idle_after is None:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError("networkidle")
+        await asyncio.sleep(self.idle_after)
+
+
+@pytest.mark.asyncio
+async def test_selector_count_must_settle():
+    page = FakePage(counts=[0, 3, 7, 12, 12])
+    readiness = Readiness(selector=".unit-card", network_idle=True, stable_ms=20, poll_ms=5, timeout_ms=1000)
+
+    result = await wait_until_ready(page, readiness)
+
+    assert result.condition == "selector"
+    assert page.counts == [12]
+    assert result.elapsed_ms < 1000
+
+
+class NavigatingPage(FakePage):
+    """Fails a count the way Playwright does when the page navigates mid-poll."""
+
+    async def evaluate(self, script: str, selector: str) -> int:
+        if self.counts[0] is None:
+            self.counts.pop(0)
+            raise RuntimeError("Execution context was destroyed, most likely because of a navigation")
+        return await super().evaluate(script, selector)
+
+
+@pytest.mark.asyncio
+async def test_selector_polling_survives_evaluate_errors():
+    page = NavigatingPage(counts=[0, 12, None, 12, 12, 12])
+    readiness = Readiness(selector=".unit-card", stable_ms=20, poll_ms=5, timeout_ms=1000)
+
+    result = await wait_until_ready(page, readiness)
+
+    assert result.condition == "selector"
+    assert page.counts == [12]
+
+
+@pytest.mark.asyncio
+async def test_network_idle_wins_when_no_cards_render():
+    page = FakePage(counts=[0], idle_after=0.01)
+    readiness = Readiness(selector=".unit-card", network_idle=True, stable_ms=20, poll_ms=5, timeout_ms=1000)
+
+    assert (await wait_until_ready(page, readiness)).condition == "network_idle"
+
+
+@pytest.mark.asyncio
+async def test_ceiling_returns_timeout():
+    page = FakePage(counts=[0])
+    readiness = Readiness(selector=".unit-card", stable_ms=20, poll_ms=5, timeout_ms=50)
+
+    result = await wait_until_ready(page, readiness)
+
+    assert result.condition == "timeout"
+    assert result.elapsed_ms >= 50
+
+
+class FakeRequest:
+    resource_type = "xhr"
+
+
+class FakeResponse:
+    request = FakeRequest()
+    headers = {"content-type": "application/json"}
+
+    def __init__(self, payload: object, delay: float = 0.0):
+        self.payload = payload
+        self.delay = delay
+
+    async def json(self) -> object:
+        await asyncio.sleep(self.delay)
+        return self.payload
+
+
+class FeedPage(FakePage):
+    """Serves its inventory as several XHR responses spread over ``gap`` seconds each."""
+
+    def __init__(self, payloads: list[object], gap: float, read_delay: float = 0.0):
+        super().__init__(counts=[0])
+        self.payloads = payloads
+        self.gap = gap
+        self.read_delay = read_delay
+        self.listeners = []
+        self.served: asyncio.Task[None] | None = None
+
+    def on(self, _event: str, listener) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, _event: str, listener) -> None:
+        self.listeners.remove(listener)
+
+    async def goto(self, _url: str, wait_until: str) -> None:
+        self.served = asyncio.ensure_future(self._serve())
+
+    async def _serve(self) -> None:
+        for payload in self.payloads:
+            for listener in list(self.listeners):
+                listener(FakeResponse(payload, self.read_delay))
+            await asyncio.sleep(self.gap)
+
+
+@pytest.mark.asyncio
+async def test_goto_with_feed_keeps_feeds_that_arrive_after_the_first():
+    page = FeedPage([{"page": 1}, {"page": 2}, {"page": 3}], gap=0.02, read_delay=0.01)
+    readiness = Readiness(selector=None, network_idle=False, timeout_ms=1000)
+
+    feeds = await goto_with_feed(page, "https://example.com", lambda _: True, readiness, quiet_ms=60, settle_ms=1000)
+
+    assert feeds == [{"page": 1}, {"page": 2}, {"page": 3}]
+    assert page.listeners == []
+
+
+@pytest.mark.asyncio
+async def test_goto_with_feed_fails_while_feeds_keep_arriving():
+    page = FeedPage([{"page": n} for n in range(50)], gap=0.01)
+    readiness = Readiness(selector=None, network_idle=False, timeout_ms=1000)
+
+    with pytest.raises(TimeoutError):
+        await goto_with_feed(page, "https://example.com", lambda _: True, readiness, quiet_ms=50, settle_ms=100)
+    page.served.cancel()
+
+
+@pytest.mark.asyncio
+async def test_settle_awaits_reads_in_flight():
+    page = FeedPage([], gap=0)
+    recorder = FeedRecorder(page, lambda _: True)
+    page.listeners[0](FakeResponse({"late": True}, delay=0.05))
+
+    assert await recorder.settle(quiet_ms=0, timeout_seconds=1)
+    assert recorder.feeds == [{"late": True}]
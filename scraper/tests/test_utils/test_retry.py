@@ -0,0 +1,33 @@
+from datetime import UTC, datetime, timedelta
+
+from utils.retry import CircuitBreaker, backoff_delay
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=UTC)
+
+
+def log_row(hours_ago, **results):
+    return {
+        "started_at": (NOW - timedelta(hours=hours_ago)).isoformat(),
+        "source_results": {source: {"status": status} for source, status in results.items()},
+    }
+
+
+def test_backoff_delay_doubles_within_jitter_range():
+    for attempt, (low, high) in ((1, (2, 5)), (2, (4, 10)), (3, (8, 20))):
+        assert low <= backoff_delay(attempt, (2, 5)) <= high
+
+
+def test_circuit_opens_after_consecutive_failures_until_cooldown():
+    rows = [
+        log_row(6, maa="success", apartments_com="failed"),
+        log_row(12, maa="failed", apartments_com="skipped"),
+        log_row(18, maa="failed", apartments_com="failed"),
+        log_row(24, maa="success", apartments_com="failed"),
+    ]
+    breaker = CircuitBreaker.from_scrape_logs(rows, threshold=3, cooldown=timedelta(hours=12))
+
+    assert breaker.open_reason("maa", NOW) is None
+    assert breaker.open_reason("apartments_com", NOW) == "circuit open after 3 consecutive failures"
+    # Cooldown counts from the last real attempt (6h ago), not the skipped run.
+    assert breaker.open_reason("apartments_com", NOW + timedelta(hours=6)) is None
+    assert breaker.open_reason("rentcafe", NOW) is None
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from scrapers import maa_parser
+from utils.fake_supabase import FakeSupabaseClient
+from utils.timing import NoopSpan, current_span, recording, span
+
+
+def test_spans_are_noops_outside_recording():
+    with span("parse") as parse_span:
+        parse_span.add(units=3)
+
+    assert isinstance(parse_span, NoopSpan)
+    assert current_span() is parse_span
+
+
+def test_nested_spans_record_paths_and_counts():
+    client = FakeSupabaseClient()
+
+    with recording() as timings:
+        with span("persist"):
+            with span("apartments", units=2) as apartments_span:
+                apartments_span.add(units=1)
+                client.table("apartments").select("*").execute()
+            with span("apartments"):
+                pass
+
+    phases = timings.as_dict()
+    assert list(phases) == ["persist.apartments", "persist"]
+    assert phases["persist.apartments"]["calls"] == 2
+    assert phases["persist.apartments"]["units"] == 3
+    assert phases["persist.apartments"]["db_requests"] == 1
+    assert phases["persist"]["seconds"] >= phases["persist.apartments"]["seconds"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_nest_under_their_own_spans():
+    async def fetch(source):
+        with span(f"fetch.{source}"):
+            await asyncio.sleep(0)
+            with span("navigate") as navigate_span:
+                navigate_span.add(responses=1)
+
+    with recording() as timings:
+        with span("sources"):
+            await asyncio.gather(fetch("maa"), fetch("apartments_com"))
+
+    phases = timings.as_dict()
+    assert phases["sources.fetch.maa.navigate"]["responses"] == 1
+    assert phases["sources.fetch.apartments_com.navigate"]["calls"] == 1
+
+
+def test_parsers_report_cards_seen():
+    html = '<html><body><div data-testid="unit-card">$1,820 Unit A-1 2 Beds</div></body></html>'
+
+    with recording() as timings:
+        with span("parse"):
+            maa_parser.parse_html(html, "https://example.com")
+
+    assert timings.as_dict()["parse.cards"]["cards"] == 1
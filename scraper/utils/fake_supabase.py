@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import operator
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from config import DEFAULT_PROPERTY_ID
+from utils.timing import current_span
+
+Row = dict[str, Any]
+
+# Unique columns enforced on insert, mirroring db/schema.sql.
+UNIQUE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "apartments": ("composite_key",),
+    "saved_apartments": ("apartment_id",),
+    "source_snapshots": ("source",),
+}
+
+# Primary keys that are not a serial ``id``.
+PRIMARY_KEYS: dict[str, str] = {"source_snapshots": "source"}
+
+
+def _copy_row(row: Row) -> Row:
+    # Rows are flat apart from JSONB columns, which are one level deep here.
+    return {
+        key: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value
+        for key, value in row.items()
+    }
+
+
+def _index_key(value: Any) -> Any:
+    # Lists and dicts (JSONB) are unhashable; they are never looked up by value.
+    return value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+
+
+class FakeSupabaseError(Exception):
+    """Raised where PostgREST would answer with an error."""
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    data: Any
+    count: int | None = None
+
+
+@dataclass(slots=True)
+class TableStats:
+    requests: int = 0
+    rows_read: int = 0
+    rows_written: int = 0
+
+
+def _latest_price_history(client: FakeSupabaseClient) -> list[Row]:
+    latest: dict[Any, Row] = {}
+    for row in client.rows("price_history"):
+        current = latest.get(row["apartment_id"])
+        if current is None or str(row.get("recorded_at") or "") >= str(current.get("recorded_at") or ""):
+            latest[row["apartment_id"]] = row
+    return [
+        {"apartment_id": row["apartment_id"], "price": row["price"], "recorded_at": row.get("recorded_at")}
+        for row in latest.values()
+    ]
+
+
+def _mark_stale_units(client: FakeSupabaseClient, params: dict[str, Any]) -> int:
+    seen = set(params.get("seen_keys") or [])
+    properties = params.get("property_ids")
+    now_iso = datetime.now(UTC).isoformat()
+    changed = 0
+    for row in client.rows("apartments"):
+        if properties is not None and row.get("property_id", DEFAULT_PROPERTY_ID) not in properties:
+            continue
+        if row.get("is_available") and row.get("composite_key") not in seen:
+            client.modify("apartments", row, {"is_available": False, "updated_at": now_iso})
+            changed += 1
+    client.stats["apartments"].rows_written += changed
+    return changed
+
+
+def _apartments_by_keys(client: FakeSupabaseClient, params: dict[str, Any]) -> list[Row]:
+    rows = [_copy_row(row) for row in client.lookup("apartments", "composite_key", set(params.get("keys") or []))]
+    client.stats["apartments"].rows_read += len(rows)
+    return rows
+
+
+# Read-only views computed from the base tables on every request.
+VIEWS: dict[str, Callable[[FakeSupabaseClient], list[Row]]] = {
+    "latest_price_history": _latest_price_history,
+}
+
+# Database functions reachable through ``rpc``.
+FUNCTIONS: dict[str, Callable[[FakeSupabaseClient, dict[str, Any]], Any]] = {
+    "mark_stale_units": _mark_stale_units,
+    "apartments_by_keys": _apartments_by_keys,
+}
+
+
+class FakeQuery:
+    """One PostgREST request being built; ``execute`` is the round trip."""
+
+    def __init__(self, client: FakeSupabaseClient, table: str) -> None:
+        self._client = client
+        self._table = table
+        self._op = "select"
+        self._columns: list[str] | None = None
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._count: str | None = None
+        self._returning = "representation"
+        self._filters: list[tuple[str, set[Any]]] = []
+        self._ranges: list[tuple[str, Callable[[Any, Any], bool], Any]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+
+    def select(self, columns: str = "*", count: str | None = None) -> FakeQuery:
+        self._op = "select"
+        self._columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",") if c.strip()]
+        self._count = count
+        return self
+
+    def insert(
+        self,
+        payload: Row | list[Row],
+        count: str | None = None,
+        returning: str = "representation",
+    ) -> FakeQuery:
+        self._op, self._payload, self._count, self._returning = "insert", payload, count, returning
+        return self
+
+    def upsert(
+        self,
+        payload: Row | list[Row],
+        on_conflict: str = "",
+        count: str | None = None,
+        returning: str = "representation",
+    ) -> FakeQuery:
+        self._op, self._payload, self._count, self._returning = "upsert", payload, count, returning
+        self._on_conflict = on_conflict or PRIMARY_KEYS.get(self._table, "id")
+        return self
+
+    def update(self, payload: Row, count: str | None = None, returning: str = "representation") -> FakeQuery:
+        self._op, self._payload, self._count, self._returning = "update", payload, count, returning
+        return self
+
+    def delete(self, count: str | None = None, returning: str = "representation") -> FakeQuery:
+        self._op, self._count, self._returning = "delete", count, returning
+        return self
+
+    def eq(self, column: str, value: Any) -> FakeQuery:
+        self._filters.append((column, {value}))
+        return self
+
+    def in_(self, column: str, values: list[Any]) -> FakeQuery:
+        self._filters.append((column, set(values)))
+        return self
+
+    def gt(self, column: str, value: Any) -> FakeQuery:
+        self._ranges.append((column, operator.gt, value))
+        return self
+
+    def gte(self, column: str, value: Any) -> FakeQuery:
+        self._ranges.append((column, operator.ge, value))
+        return self
+
+    def lt(self, column: str, value: Any) -> FakeQuery:
+        self._ranges.append((column, operator.lt, value))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> FakeQuery:
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> FakeQuery:
+        self._limit = size
+        return self
+
+    def execute(self) -> FakeResponse:
+        self._client.round_trip(self._table)
+        stats = self._client.stats[self._table]
+        if self._op == "select":
+            rows = self._select()
+            stats.rows_read += len(rows)
+            return FakeResponse(data=rows, count=len(rows) if self._count else None)
+
+        if self._table in VIEWS:
+            raise FakeSupabaseError(f"cannot {self._op} into view {self._table}")
+        write = {"insert": self._insert, "upsert": self._upsert, "update": self._update, "delete": self._delete}
+        written = write[self._op]()
+        stats.rows_written += len(written)
+        data = [] if self._returning == "minimal" else [_copy_row(row) for row in written]
+        return FakeResponse(data=data, count=len(written) if self._count else None)
+
+    def _matching(self) -> list[Row]:
+        if self._table in VIEWS:
+            rows = self._client.view_rows(self._table)
+        elif self._filters:
+            # Narrow through the first filter's index, then check the rest.
+            column, wanted = self._filters[0]
+            rows = self._client.lookup(self._table, column, wanted)
+        else:
+            rows = self._client.rows(self._table)
+        return [
+            row
+            for row in rows
+            if all(row.get(column) in wanted for column, wanted in self._filters)
+            and all(
+                row.get(column) is not None and compare(row[column], bound) for column, compare, bound in self._ranges
+            )
+        ]
+
+    def _select(self) -> list[Row]:
+        rows = self._matching()
+        for column, desc in reversed(self._order):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        if self._limit is not None:
+            rows = rows[: self._limit]
+        if self._columns is None:
+            return [_copy_row(row) for row in rows]
+        return [_copy_row({column: row.get(column) for column in self._columns}) for row in rows]
+
+    def _payload_rows(self) -> list[Row]:
+        return [self._payload] if isinstance(self._payload, dict) else list(self._payload)
+
+    def _insert(self) -> list[Row]:
+        payloads = self._payload_rows()
+        # A statement is atomic: check every row before writing any.
+        for column in UNIQUE_COLUMNS.get(self._table, ()):
+            taken = {row.get(column) for row in self._client.rows(self._table)}
+            for payload in payloads:
+                value = payload.get(column)
+                if value in taken:
+                    raise FakeSupabaseError(
+                        f'duplicate key value violates unique constraint "{self._table}_{column}_key"'
+                    )
+                taken.add(value)
+        return [self._client.store(self._table, _copy_row(payload)) for payload in payloads]
+
+    def _upsert(self) -> list[Row]:
+        written: list[Row] = []
+        for payload in self._payload_rows():
+            existing = self._client.lookup(self._table, self._on_conflict, {payload.get(self._on_conflict)})
+            if existing:
+                row = existing[0]
+                self._client.modify(self._table, row, _copy_row(payload))
+            else:
+                row = self._client.store(self._table, _copy_row(payload))
+            written.append(row)
+        return written
+
+    def _delete(self) -> list[Row]:
+        matched = self._matching()
+        self._client.remove(self._table, matched)
+        return matched
+
+    def _update(self) -> list[Row]:
+        matched = self._matching()
+        for row in matched:
+            self._client.modify(self._table, row, _copy_row(self._payload))
+        return matched
+
+
+class FakeRpc:
+    def __init__(self, client: FakeSupabaseClient, name: str, params: dict[str, Any]) -> None:
+        self._client = client
+        self._name = name
+        self._params = params
+
+    def execute(self) -> FakeResponse:
+        self._client.round_trip(f"rpc:{self._name}")
+        function = FUNCTIONS.get(self._name)
+        if function is None:
+            raise FakeSupabaseError(f"function {self._name} does not exist")
+        return FakeResponse(data=function(self._client, self._params))
+
+
+class FakeBucket:
+    def __init__(self, client: FakeSupabaseClient, bucket: str) -> None:
+        self._client = client
+        self._bucket = bucket
+
+    def upload(self, path: str, file: bytes, file_options: dict[str, Any] | None = None) -> FakeResponse:
+        key = f"storage:{self._bucket}"
+        self._client.round_trip(key)
+        objects = self._client.objects[self._bucket]
+        if path in objects and not (file_options or {}).get("upsert"):
+            raise FakeSupabaseError(f"object {path} already exists")
+        objects[path] = bytes(file)
+        self._client.stats[key].rows_written += 1
+        return FakeResponse(data={"path": path})
+
+
+class FakeStorage:
+    def __init__(self, client: FakeSupabaseClient) -> None:
+        self._client = client
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self._client, bucket)
+
+
+class FakeSupabaseClient:
+    """In-memory stand-in for the subset of ``supabase.Client`` the scraper uses.
+
+    Every ``execute``/``upload`` counts as one round trip against its table,
+    RPC or bucket and sleeps ``latency_ms`` to approximate network cost.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, tables: dict[str, list[Row]] | None = None) -> None:
+        self.latency_ms = latency_ms
+        self.stats: defaultdict[str, TableStats] = defaultdict(TableStats)
+        self.objects: defaultdict[str, dict[str, bytes]] = defaultdict(dict)
+        self.storage = FakeStorage(self)
+        self._tables: defaultdict[str, list[Row]] = defaultdict(list)
+        self._indexes: defaultdict[str, dict[str, dict[Any, list[Row]]]] = defaultdict(dict)
+        self._views: dict[str, tuple[int, list[Row]]] = {}
+        self._writes = 0
+        self._next_id: defaultdict[str, int] = defaultdict(lambda: 1)
+        for name, rows in (tables or {}).items():
+            for row in rows:
+                self.store(name, _copy_row(row))
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict[str, Any] | None = None) -> FakeRpc:
+        return FakeRpc(self, name, params or {})
+
+    def rows(self, table: str) -> list[Row]:
+        """The live rows of a table; change them through ``modify`` to keep indexes valid."""
+
+        return self._tables[table]
+
+    def view_rows(self, name: str) -> list[Row]:
+        """A view's rows, recomputed only after a write since the last read."""
+
+        cached = self._views.get(name)
+        if cached is None or cached[0] != self._writes:
+            cached = self._views[name] = (self._writes, VIEWS[name](self))
+        return cached[1]
+
+    def lookup(self, table: str, column: str, values: set[Any]) -> list[Row]:
+        """Rows whose ``column`` is in ``values``, via an index built on first use."""
+
+        index = self._indexes[table].get(column)
+        if index is None:
+            index = self._indexes[table][column] = defaultdict(list)
+            for row in self._tables[table]:
+                index[_index_key(row.get(column))].append(row)
+        return [row for value in values for row in index.get(_index_key(value), ())]
+
+    def modify(self, table: str, row: Row, changes: Row) -> None:
+        self._writes += 1
+        row.update(changes)
+        for column in changes.keys() & self._indexes[table].keys():
+            del self._indexes[table][column]
+
+    def remove(self, table: str, rows: list[Row]) -> None:
+        doomed = {id(row) for row in rows}
+        self._writes += 1
+        self._tables[table] = [row for row in self._tables[table] if id(row) not in doomed]
+        self._indexes[table].clear()
+
+    def store(self, table: str, row: Row) -> Row:
+        if table not in PRIMARY_KEYS:
+            if row.get("id") is None:
+                row["id"] = self._next_id[table]
+            self._next_id[table] = max(self._next_id[table], int(row["id"]) + 1)
+        self._writes += 1
+        self._tables[table].append(row)
+        for column, index in self._indexes[table].items():
+            index[_index_key(row.get(column))].append(row)
+        return row
+
+    def round_trip(self, key: str) -> None:
+        self.stats[key].requests += 1
+        current_span().add(db_requests=1)
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(stats.requests for stats in self.stats.values())
+
+    @property
+    def simulated_latency_seconds(self) -> float:
+        return self.round_trips * self.latency_ms / 1000
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "round_trips": self.round_trips,
+            "simulated_latency_seconds": round(self.simulated_latency_seconds, 3),
+            "tables": {name: asdict(stats) for name, stats in sorted(self.stats.items())},
+        }
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
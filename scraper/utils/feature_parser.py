@@ -1,15 +1,122 @@
 from __future__ import annotations
 
+from functools import lru_cache
 
-def parse_feature_flags(tags: list[str]) -> dict[str, bool]:
-    normalized = [tag.lower() for tag in tags]
-
-    return {
-        "has_garage": any("garage" in tag for tag in normalized),
-        "has_fireplace": any("fireplace" in tag for tag in normalized),
-        "is_renovated": any("renov" in tag or "upgrade" in tag for tag in normalized),
-        "has_smart_home": any("smart" in tag for tag in normalized),
-        "is_top_floor": any("top floor" in tag for tag in normalized),
-        "has_sunroom": any("sunroom" in tag for tag in normalized),
-        "has_balcony": any("balcony" in tag for tag in normalized),
+import ahocorasick
+
+# Amenity tags we recognise verbatim in listing text, in the order they are
+# reported on a unit.
+KNOWN_TAGS: tuple[str, ...] = (
+    "Top Floor",
+    "Wood Burning Fireplace",
+    "Attached Garage",
+    "Detached Garage",
+    "Renovation Renewal Prog",
+    "Kitchen and Bath Upgrade",
+    "Smart Home Technology",
+    "Sunroom",
+    "Balcony",
+    "Courtyard View",
+    "Garden View",
+    "Bay View",
+    "Roommate Plan",
+    "End Unit",
+    "Washer/Dryer",
+)
+
+# Keywords looked for inside any tag (known or not) and the boolean column each
+# one sets. Adding a column is a new entry here, not a new scan.
+FLAG_KEYWORDS: dict[str, str] = {
+    "garage": "has_garage",
+    "fireplace": "has_fireplace",
+    "renov": "is_renovated",
+    "upgrade": "is_renovated",
+    "smart": "has_smart_home",
+    "top floor": "is_top_floor",
+    "sunroom": "has_sunroom",
+    "balcony": "has_balcony",
+    "end unit": "is_end_unit",
+    "washer": "has_washer_dryer",
+    "dryer": "has_washer_dryer",
+}
+
+# Keywords that set apartments.view_type; the first in this order wins.
+VIEW_KEYWORDS: dict[str, str] = {
+    "courtyard view": "courtyard",
+    "garden view": "garden",
+    "bay view": "bay",
+    "pool view": "pool",
+    "water view": "water",
+}
+
+FLAG_COLUMNS: tuple[str, ...] = tuple(dict.fromkeys(FLAG_KEYWORDS.values()))
+VIEW_TYPES: tuple[str, ...] = tuple(dict.fromkeys(VIEW_KEYWORDS.values()))
+_VIEW_SHIFT = len(FLAG_COLUMNS)
+
+
+def _build_automaton(words: dict[str, int]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for word, value in words.items():
+        automaton.add_word(word, value)
+    automaton.make_automaton()
+    return automaton
+
+
+# Values are tag indexes, so matches can be put back into KNOWN_TAGS order.
+_TAG_AUTOMATON = _build_automaton({tag.lower(): i for i, tag in enumerate(KNOWN_TAGS)})
+
+# Values are bitmasks: one bit per flag column, then one per view type.
+_KEYWORD_AUTOMATON = _build_automaton(
+    {
+        **{word: 1 << FLAG_COLUMNS.index(column) for word, column in FLAG_KEYWORDS.items()},
+        **{word: 1 << (_VIEW_SHIFT + VIEW_TYPES.index(view)) for word, view in VIEW_KEYWORDS.items()},
     }
+)
+
+
+def _scan_mask(lowered: str) -> int:
+    mask = 0
+    for _end, bit in _KEYWORD_AUTOMATON.iter(lowered):
+        mask |= bit
+    return mask
+
+
+_KNOWN_TAG_MASKS: dict[str, int] = {tag: _scan_mask(tag.lower()) for tag in KNOWN_TAGS}
+
+
+def match_known_tags(lowered_text: str) -> list[str]:
+    """Known tags found in already-lowercased text, in one pass over it."""
+
+    found = {index for _end, index in _TAG_AUTOMATON.iter(lowered_text)}
+    return [KNOWN_TAGS[index] for index in sorted(found)]
+
+
+def feature_mask(tags: list[str]) -> int:
+    mask = 0
+    unknown: list[str] = []
+    for tag in tags:
+        known = _KNOWN_TAG_MASKS.get(tag)
+        if known is None:
+            unknown.append(tag.lower())
+        else:
+            mask |= known
+    if unknown:
+        # Keywords never contain a newline, so joining can't create matches
+        # that span two tags.
+        mask |= _scan_mask("\n".join(unknown))
+    return mask
+
+
+@lru_cache(maxsize=256)
+def _flags_for_mask(mask: int) -> tuple[tuple[str, bool | str | None], ...]:
+    flags: list[tuple[str, bool | str | None]] = [
+        (column, bool(mask & (1 << i))) for i, column in enumerate(FLAG_COLUMNS)
+    ]
+    view_bits = mask >> _VIEW_SHIFT
+    view_type = next((view for i, view in enumerate(VIEW_TYPES) if view_bits & (1 << i)), None)
+    flags.append(("view_type", view_type))
+    return tuple(flags)
+
+
+def parse_feature_flags(tags: list[str]) -> dict[str, bool | str | None]:
+    return dict(_flags_for_mask(feature_mask(tags)))
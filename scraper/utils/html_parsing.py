@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
+
+from lxml import html as lxml_html
+from lxml.etree import ParserError
+
+HtmlElement = lxml_html.HtmlElement
+
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+        "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+        "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+        "table", "tbody", "td", "th", "thead", "tr", "ul",
+    }
+)
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template"})
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+
+
+@dataclass(slots=True)
+class CardSnapshot:
+    """A listing card's text plus the attributes worth keeping from its markup."""
+
+    text: str
+    # First http(s) link in the card, absolute; usually the unit's own page.
+    href: str | None = None
+
+
+def parse_document(html: str) -> HtmlElement | None:
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html)
+    except ParserError:
+        return None
+
+
+def page_title(tree: HtmlElement | None) -> str:
+    if tree is None:
+        return ""
+    return (tree.findtext(".//title") or "").strip()
+
+
+def element_text(element: HtmlElement) -> str:
+    """Approximate ``innerText``: block elements break lines, whitespace collapses.
+
+    Card regexes stop at line breaks (e.g. floor plan names), so keeping the
+    browser's line structure matters more than exact spacing.
+    """
+
+    parts: list[str] = []
+
+    def walk(node: HtmlElement) -> None:
+        tag = node.tag if isinstance(node.tag, str) else ""
+        if tag in _SKIPPED_TAGS:
+            return
+        block = tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if tag and node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    lines = (_SPACES.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _page_link(href: str, base_url: str) -> str | None:
+    """``href`` made absolute, or None unless it leads to a web page (not ``tel:``, ``javascript:``, ``#``)."""
+
+    href = href.strip()
+    if not href or href.startswith("#"):
+        return None
+    url = urljoin(base_url, href)
+    return url if urlsplit(url).scheme in {"http", "https"} else None
+
+
+def card_snapshot(element: HtmlElement, base_url: str) -> CardSnapshot:
+    links = (_page_link(link.get("href"), base_url) for link in element.xpath("descendant-or-self::a[@href]"))
+    return CardSnapshot(text=element_text(element), href=next((link for link in links if link), None))
+
+
+def select_first(tree: HtmlElement, xpaths: list[str]) -> list[HtmlElement]:
+    """Return matches for the first XPath that finds anything."""
+
+    for xpath in xpaths:
+        matches = tree.xpath(xpath)
+        if matches:
+            return matches
+    return []
+
+
+def class_contains(fragment: str) -> str:
+    """XPath predicate equivalent to CSS ``[class*='fragment']``."""
+
+    return f"contains(@class, '{fragment}')"
+
+
+def has_class(name: str) -> str:
+    """XPath predicate equivalent to CSS ``.name``."""
+
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
@@ -2,24 +2,58 @@ from __future__ import annotations
 
 import re
 
+_PRICE = re.compile(r"\$?([0-9,]+(?:\.[0-9]{1,2})?)")
+_SQ_FT = re.compile(r"([0-9]{3,4})")
+# Every number on a listing card, with a leading "$" or a trailing sq ft unit
+# when it has one.
+_CARD_NUMBER = re.compile(
+    r"(\$\s*)?([0-9][0-9,]*(?:\.[0-9]{1,2})?)(\s*(?:sq\.?\s*ft|sqft|sf|square\s+feet)\b)?",
+    re.IGNORECASE,
+)
+
 
 def parse_price(value: str | None) -> float | None:
     if not value:
         return None
 
-    matches = re.findall(r"\$?([0-9,]+(?:\.[0-9]{1,2})?)", value)
-    if not matches:
+    match = _PRICE.search(value)
+    if not match:
         return None
 
-    return float(matches[0].replace(",", ""))
+    return float(match.group(1).replace(",", ""))
 
 
 def normalize_sq_ft(value: str | None) -> int | None:
     if not value:
         return None
 
-    match = re.search(r"([0-9]{3,4})", value.replace(",", ""))
+    match = _SQ_FT.search(value.replace(",", ""))
     if not match:
         return None
 
     return int(match.group(1))
+
+
+def parse_card_numbers(text: str) -> tuple[float | None, int | None]:
+    """Price and sq_ft of a listing card's text in one pass.
+
+    The price is the first dollar amount. The sq_ft is the first number
+    labelled as square feet, else the first bare three- or four-digit number.
+    """
+
+    price: float | None = None
+    sq_ft: int | None = None
+    bare: int | None = None
+    for match in _CARD_NUMBER.finditer(text):
+        value = match.group(2).replace(",", "")
+        if match.group(1):
+            if price is None:
+                price = float(value)
+        elif match.group(3):
+            if sq_ft is None:
+                sq_ft = int(float(value))
+        elif bare is None and 3 <= len(value.partition(".")[0]) <= 4:
+            bare = int(float(value))
+        if price is not None and sq_ft is not None:
+            break
+    return price, sq_ft if sq_ft is not None else bare
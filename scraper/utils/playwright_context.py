@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import random
-import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 from urllib.parse import unquote, urlsplit
 
-from playwright.async_api import BrowserContext, Page, async_playwright
-from playwright_stealth import Stealth
+import structlog
 
-from config import USER_AGENTS
+from config import (
+    BROWSER_MAX_PAGES,
+    FEED_QUIET_MS,
+    FEED_SETTLE_MS,
+    READY_STABLE_MS,
+    READY_TIMEOUT_MS,
+    USER_AGENTS,
+    RoutingPolicy,
+)
+from utils.request_router import RequestRouter, TrafficStats
+from utils.timing import current_span, span
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright, Response
+
+logger = structlog.get_logger(__name__)
 
 
 @dataclass(slots=True)
@@ -56,55 +73,312 @@ def _proxy_from_env() -> ProxyConfig | None:
     )
 
 
-@asynccontextmanager
-async def browser_page() -> tuple[BrowserContext, Page]:
-    """Async context manager providing (context, page).
+def _proxy_settings(proxy: ProxyConfig | None) -> dict[str, str] | None:
+    if not proxy:
+        return None
+    return {
+        "server": proxy.server,
+        **({"username": proxy.username} if proxy.username else {}),
+        **({"password": proxy.password} if proxy.password else {}),
+    }
 
-    Keeps Playwright alive for the lifetime of the context manager.
+
+class BrowserPool:
+    """One Chromium process shared by every page of a run.
+
+    Each ``page()`` gets a fresh context with its own user agent, proxy,
+    stealth patches and request routing, so sessions stay isolated while the
+    browser launch cost is paid once. At most ``max_pages`` are open at a time.
+    Every context's requests are tallied into ``traffic`` for the run.
+    Playwright itself is imported on the first launch.
     """
 
-    proxy = _proxy_from_env()
-    user_agent = random.choice(USER_AGENTS)
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            proxy=(
-                {
-                    "server": proxy.server,
-                    **({"username": proxy.username} if proxy and proxy.username else {}),
-                    **({"password": proxy.password} if proxy and proxy.password else {}),
-                }
-                if proxy
-                else None
-            ),
-        )
+    def __init__(self, max_pages: int = BROWSER_MAX_PAGES, headless: bool = True) -> None:
+        self.max_pages = max(max_pages, 1)
+        self.headless = headless
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._start_lock = asyncio.Lock()
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self.traffic = TrafficStats()
+
+    async def __aenter__(self) -> BrowserPool:
+        return self
 
+    async def __aexit__(self, *_exc_info: object) -> None:
+        await self.close()
+
+    async def start(self) -> Browser:
+        async with self._start_lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        return self._browser
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def new_context(self, routing: RoutingPolicy | None = None) -> BrowserContext:
+        browser = await self.start()
         context = await browser.new_context(
-            user_agent=user_agent,
+            user_agent=random.choice(USER_AGENTS),
+            proxy=_proxy_settings(_proxy_from_env()),
             locale="en-US",
             extra_http_headers={
                 "Accept-Language": "en-US,en;q=0.9",
             },
         )
+        # Responses count against the span open when the page was requested.
+        router = RequestRouter(routing or RoutingPolicy(), self.traffic, current_span())
+        await context.route("**/*", router.handle)
+        context.on("response", router.on_response)
+        return context
+
+    @asynccontextmanager
+    async def page(self, routing: RoutingPolicy | None = None) -> AsyncIterator[tuple[BrowserContext, Page]]:
+        from playwright_stealth import Stealth
+
+        async with self._semaphore:
+            context = await self.new_context(routing)
+            try:
+                page = await context.new_page()
+                await Stealth().apply_stealth_async(page)
+                yield context, page
+            finally:
+                await context.close()
+
+
+@asynccontextmanager
+async def browser_page(
+    pool: BrowserPool | None = None,
+    routing: RoutingPolicy | None = None,
+) -> AsyncIterator[tuple[BrowserContext, Page]]:
+    """Async context manager providing (context, page).
+
+    Borrows a page from ``pool`` when given; otherwise launches a one-page pool
+    that lives for the duration of the context manager.
+    """
+
+    if pool is not None:
+        async with pool.page(routing) as pair:
+            yield pair
+        return
+
+    async with BrowserPool(max_pages=1) as own_pool:
+        async with own_pool.page(routing) as pair:
+            yield pair
+
+
+@dataclass(slots=True)
+class FeedRecorder:
+    """Records JSON XHR/fetch responses that pass ``accept`` while a page loads.
+
+    Attach before navigating; ``wait`` returns as soon as the first accepted
+    payload arrives so callers can skip rendering the rest of the page.
+    Inventory can span several responses, so ``settle`` then waits for the
+    rest before the feeds are used.
+    """
+
+    page: Page
+    accept: Callable[[Any], bool]
+    feeds: list[Any] = field(default_factory=list)
+    _arrived: asyncio.Event = field(default_factory=asyncio.Event)
+    _pending: set[asyncio.Task[None]] = field(default_factory=set)
+    # time.monotonic() of the last JSON response seen.
+    _last_response: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.page.on("response", self._on_response)
+
+    def detach(self) -> None:
+        self.page.remove_listener("response", self._on_response)
+        for task in self._pending:
+            task.cancel()
+
+    async def wait(self, timeout_seconds: float) -> bool:
+        try:
+            await asyncio.wait_for(self._arrived.wait(), timeout_seconds)
+        except TimeoutError:
+            return False
+        return True
 
-        async def _block_heavy(route, request):  # type: ignore[no-untyped-def]
-            # Proxy bandwidth saver: we don't need images/media/fonts for scraping.
-            # Keep scripts + XHR so the app can still load availability data.
-            if request.resource_type in {"image", "media", "font"}:
-                await route.abort()
+    async def settle(self, quiet_ms: int, timeout_seconds: float) -> bool:
+        """Wait until no JSON response has come in for ``quiet_ms`` and every read has finished.
+
+        Returns False if that doesn't happen within ``timeout_seconds``.
+        """
+
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            now = time.monotonic()
+            quiet_for = now - self._last_response
+            if not self._pending and quiet_for * 1000 >= quiet_ms:
+                return True
+            if now >= deadline:
+                return False
+            if self._pending:
+                await asyncio.wait(set(self._pending), timeout=deadline - now)
             else:
-                await route.continue_()
+                await asyncio.sleep(min(quiet_ms / 1000 - quiet_for, deadline - now))
+
+    def _on_response(self, response: Response) -> None:
+        if response.request.resource_type not in {"xhr", "fetch"}:
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        self._last_response = time.monotonic()
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response: Response) -> None:
+        try:
+            payload = await response.json()
+        except Exception:  # noqa: BLE001
+            return
+        if self.accept(payload):
+            self.feeds.append(payload)
+            self._arrived.set()
 
-        await context.route("**/*", _block_heavy)
 
-        page = await context.new_page()
-        await Stealth().apply_stealth_async(page)
+@dataclass(slots=True)
+class Readiness:
+    """Per-source conditions that mean a page has loaded enough to parse.
+
+    Whichever configured condition is met first wins; ``timeout_ms`` is the
+    ceiling after which the caller proceeds with whatever has rendered.
+    """
+
+    selector: str | None = None
+    response: Callable[[Response], bool] | None = None
+    network_idle: bool = False
+    timeout_ms: int = READY_TIMEOUT_MS
+    stable_ms: int = READY_STABLE_MS
+    poll_ms: int = 250
 
+
+@dataclass(slots=True)
+class ReadinessResult:
+    condition: str
+    elapsed_ms: float
+
+
+_COUNT_SCRIPT = "selector => document.querySelectorAll(selector).length"
+
+
+async def _selector_stable(page: Page, selector: str, stable_ms: int, poll_ms: int) -> None:
+    loop = asyncio.get_running_loop()
+    last_count = -1
+    stable_since = loop.time()
+    while True:
         try:
-            yield context, page
-        finally:
-            await browser.close()
+            count = await page.evaluate(_COUNT_SCRIPT, selector)
+        except Exception:  # noqa: BLE001
+            # Client-side navigation destroys the execution context mid-poll;
+            # the count is unknown, so start the stable window over. The
+            # readiness ceiling still bounds the loop.
+            count = -1
+        now = loop.time()
+        if count != last_count:
+            last_count, stable_since = count, now
+        elif count > 0 and (now - stable_since) * 1000 >= stable_ms:
+            return
+        await asyncio.sleep(poll_ms / 1000)
+
+
+async def _feed_arrived(recorder: FeedRecorder, timeout_seconds: float) -> None:
+    if not await recorder.wait(timeout_seconds):
+        raise TimeoutError("no availability feed")
+
+
+async def wait_until_ready(
+    page: Page,
+    readiness: Readiness,
+    feed: FeedRecorder | None = None,
+) -> ReadinessResult:
+    """Wait until the first readiness condition holds, or the ceiling passes."""
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    timeout_seconds = readiness.timeout_ms / 1000
+
+    conditions: dict[str, Awaitable[Any]] = {}
+    if feed is not None:
+        conditions["feed"] = _feed_arrived(feed, timeout_seconds)
+    if readiness.selector:
+        conditions["selector"] = _selector_stable(
+            page, readiness.selector, readiness.stable_ms, readiness.poll_ms
+        )
+    if readiness.response:
+        conditions["response"] = page.wait_for_event(
+            "response", predicate=readiness.response, timeout=readiness.timeout_ms
+        )
+    if readiness.network_idle:
+        conditions["network_idle"] = page.wait_for_load_state("networkidle", timeout=readiness.timeout_ms)
+
+    tasks = {asyncio.ensure_future(awaitable): name for name, awaitable in conditions.items()}
+    pending = set(tasks)
+    condition = "timeout"
+    try:
+        while pending and condition == "timeout":
+            remaining = timeout_seconds - (loop.time() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # A condition that errored (e.g. its own timeout) just drops out.
+                if not task.cancelled() and task.exception() is None:
+                    condition = tasks[task]
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+
+    result = ReadinessResult(condition=condition, elapsed_ms=(loop.time() - started) * 1000)
+    logger.info("page_ready", url=page.url, condition=result.condition, elapsed_ms=round(result.elapsed_ms))
+    return result
+
+
+async def goto_with_feed(
+    page: Page,
+    url: str,
+    accept: Callable[[Any], bool],
+    readiness: Readiness,
+    quiet_ms: int = FEED_QUIET_MS,
+    settle_ms: int = FEED_SETTLE_MS,
+) -> list[Any]:
+    """Navigate to ``url`` and return any availability payloads captured.
+
+    An accepted JSON feed counts as a readiness condition, so navigation stops
+    as soon as it arrives, then waits for the page's JSON traffic to go quiet
+    so feeds split over several responses are all read. Otherwise the page's
+    own readiness conditions decide when DOM parsing can take over.
+
+    Raises TimeoutError if feed responses are still arriving at the
+    ``settle_ms`` ceiling: returning part of the inventory would let stale
+    marking retire the units that hadn't loaded yet.
+    """
+
+    recorder = FeedRecorder(page, accept)
+    try:
+        with span("navigate"):
+            await page.goto(url, wait_until="commit")
+        with span("wait_ready") as ready_span:
+            await wait_until_ready(page, readiness, feed=recorder)
+            if recorder.feeds and not await recorder.settle(quiet_ms, settle_ms / 1000):
+                raise TimeoutError("availability feed still loading")
+            ready_span.add(feeds=len(recorder.feeds))
+        return list(recorder.feeds)
+    finally:
+        recorder.detach()
 
 
 async def upload_block_snapshot(supabase, source_name: str, page: Page) -> str | None:
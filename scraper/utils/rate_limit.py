@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from urllib.parse import urlsplit
+
+from config import REQUEST_DELAY_SECONDS
+
+
+class DomainRateLimiter:
+    """Spaces out page loads to the same host by a random ``delay_range`` pause.
+
+    Each call reserves the host's next slot before sleeping, so concurrent
+    workers queue up behind one another instead of all firing once the pause
+    ends. Different hosts never wait on each other.
+    """
+
+    def __init__(self, delay_range: tuple[float, float] = REQUEST_DELAY_SECONDS) -> None:
+        self.delay_range = delay_range
+        self._next_slot: dict[str, float] = {}
+
+    async def wait(self, url: str) -> float:
+        """Sleep until ``url``'s host may be requested again; returns seconds waited."""
+
+        host = (urlsplit(url).hostname or "").removeprefix("www.")
+        if not host:
+            return 0.0
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + random.uniform(*self.delay_range)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return slot - now
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import structlog
+
+from config import RoutingPolicy
+from utils.timing import NoopSpan, Span
+
+if TYPE_CHECKING:
+    from playwright.async_api import Request, Response, Route
+
+logger = structlog.get_logger(__name__)
+
+def host_matches(host: str, domains: tuple[str, ...]) -> bool:
+    """True if ``host`` is one of ``domains`` or a subdomain of one."""
+
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+@dataclass(slots=True)
+class TrafficCounter:
+    requests: int = 0
+    blocked: int = 0
+    bytes: int = 0
+
+
+@dataclass(slots=True)
+class TrafficStats:
+    """Browser requests and response bytes for a run, by resource type and host.
+
+    Bytes come from ``content-length``, so chunked responses count as zero;
+    good enough to rank what is worth blocking.
+    """
+
+    by_type: dict[str, TrafficCounter] = field(default_factory=dict)
+    by_domain: dict[str, TrafficCounter] = field(default_factory=dict)
+    blocked_by: dict[str, int] = field(default_factory=dict)
+
+    def record_request(self, resource_type: str, host: str, blocked_reason: str | None) -> None:
+        for counter in self._counters(resource_type, host):
+            counter.requests += 1
+            if blocked_reason is not None:
+                counter.blocked += 1
+        if blocked_reason is not None:
+            self.blocked_by[blocked_reason] = self.blocked_by.get(blocked_reason, 0) + 1
+
+    def record_response(self, resource_type: str, host: str, size: int) -> None:
+        for counter in self._counters(resource_type, host):
+            counter.bytes += size
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(counter.bytes for counter in self.by_type.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-ready summary, heaviest types and domains first."""
+
+        def ranked(counters: dict[str, TrafficCounter]) -> dict[str, dict[str, int]]:
+            ordered = sorted(counters.items(), key=lambda item: (-item[1].bytes, -item[1].requests, item[0]))
+            return {name: asdict(counter) for name, counter in ordered}
+
+        return {
+            "requests": sum(counter.requests for counter in self.by_type.values()),
+            "blocked": sum(self.blocked_by.values()),
+            "bytes": self.total_bytes,
+            "blocked_by": dict(sorted(self.blocked_by.items())),
+            "by_type": ranked(self.by_type),
+            "by_domain": ranked(self.by_domain),
+        }
+
+    def _counters(self, resource_type: str, host: str) -> tuple[TrafficCounter, TrafficCounter]:
+        return (
+            self.by_type.setdefault(resource_type, TrafficCounter()),
+            self.by_domain.setdefault(host or "-", TrafficCounter()),
+        )
+
+
+class RequestRouter:
+    """Applies a source's ``RoutingPolicy`` to every request of a browser context."""
+
+    def __init__(self, policy: RoutingPolicy, stats: TrafficStats, span: Span | NoopSpan) -> None:
+        self.policy = policy
+        self.stats = stats
+        self.span = span
+
+    def blocked_reason(self, resource_type: str, host: str, main_navigation: bool = False) -> str | None:
+        """Why a request should be aborted, or None to let it through.
+
+        The page's own navigation always goes through so a policy can never
+        blank the page being scraped.
+        """
+
+        if main_navigation:
+            return None
+        if resource_type in self.policy.blocked_resource_types:
+            return "resource_type"
+        if host_matches(host, self.policy.blocked_hosts):
+            return "blocked_host"
+        if self.policy.allowed_domains and not host_matches(host, self.policy.allowed_domains):
+            return "not_allowed"
+        return None
+
+    async def handle(self, route: Route, request: Request) -> None:
+        host = urlsplit(request.url).hostname or ""
+        reason = self.blocked_reason(request.resource_type, host, _is_main_navigation(request))
+        self.stats.record_request(request.resource_type, host, reason)
+        if reason is None:
+            await route.continue_()
+        else:
+            # A host the page needs showing up here as not_allowed means the
+            # source's allowed_domains is missing it.
+            logger.debug("request_blocked", host=host, resource_type=request.resource_type, reason=reason)
+            await route.abort("blockedbyclient")
+
+    def on_response(self, response: Response) -> None:
+        size = int(response.headers.get("content-length") or 0)
+        self.stats.record_response(response.request.resource_type, urlsplit(response.url).hostname or "", size)
+        self.span.add(responses=1, bytes=size)
+
+
+def _is_main_navigation(request: Request) -> bool:
+    try:
+        return request.is_navigation_request() and request.frame.parent_frame is None
+    except Exception:  # noqa: BLE001
+        # Service worker requests have no frame.
+        return False
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from config import CIRCUIT_COOLDOWN_HOURS, CIRCUIT_FAILURE_THRESHOLD, REQUEST_DELAY_SECONDS
+
+
+def backoff_delay(attempt: int, base: tuple[float, float] = REQUEST_DELAY_SECONDS) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based).
+
+    A random pick from ``base`` doubled per attempt, so sources that fail
+    together don't retry in lockstep.
+    """
+
+    low, high = base
+    return random.uniform(low, high) * 2 ** max(attempt - 1, 0)
+
+
+@dataclass(slots=True)
+class SourceHealth:
+    consecutive_failures: int = 0
+    last_attempt_at: datetime | None = None
+
+
+class CircuitBreaker:
+    """Skips sources that failed on each of their last ``threshold`` runs.
+
+    Built from recent ``scrape_logs.source_results``. Runs where a source was
+    skipped neither break nor extend its streak. Once ``cooldown`` has passed
+    since its last real attempt the source gets one trial run; another failure
+    re-opens the circuit for a further cooldown.
+    """
+
+    def __init__(
+        self,
+        health: dict[str, SourceHealth],
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: timedelta = timedelta(hours=CIRCUIT_COOLDOWN_HOURS),
+    ) -> None:
+        self.health = health
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+    @classmethod
+    def from_scrape_logs(cls, rows: Iterable[dict[str, Any]], **kwargs: Any) -> CircuitBreaker:
+        """``rows`` newest first, each with ``started_at`` and ``source_results``."""
+
+        health: dict[str, SourceHealth] = {}
+        settled: set[str] = set()
+        for row in rows:
+            started_at = _parse_timestamp(row.get("started_at"))
+            for source, result in (row.get("source_results") or {}).items():
+                status = (result or {}).get("status")
+                if source in settled or status == "skipped":
+                    continue
+                entry = health.setdefault(source, SourceHealth())
+                if entry.last_attempt_at is None:
+                    entry.last_attempt_at = started_at
+                if status == "failed":
+                    entry.consecutive_failures += 1
+                else:
+                    settled.add(source)
+        return cls(health, **kwargs)
+
+    def open_reason(self, source: str, now: datetime) -> str | None:
+        """Why ``source`` should be skipped this run, or None to scrape it."""
+
+        entry = self.health.get(source)
+        if entry is None or entry.consecutive_failures < self.threshold:
+            return None
+        if entry.last_attempt_at is not None and now - entry.last_attempt_at >= self.cooldown:
+            return None
+        return f"circuit open after {entry.consecutive_failures} consecutive failures"
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
@@ -1,20 +1,57 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from supabase import Client, create_client
+from utils.fake_supabase import FakeSupabaseClient
+from utils.timing import current_span
 
+if TYPE_CHECKING:
+    import httpx
+    from supabase import Client
 
-def get_supabase_client() -> Client | None:
+
+def _count_response(response: httpx.Response) -> None:
+    current_span().add(db_requests=1, db_bytes=int(response.headers.get("content-length") or 0))
+
+
+def _instrument(client: Client) -> Client:
+    """Count every PostgREST and Storage response against the open timing span."""
+
+    import httpx
+
+    for session in (client.postgrest.session, getattr(client.storage, "_client", None)):
+        if isinstance(session, httpx.Client):
+            session.event_hooks["response"].append(_count_response)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _fake_client(latency_ms: float) -> FakeSupabaseClient:
+    # One instance per process so every caller's round trips land in the same stats.
+    return FakeSupabaseClient(latency_ms=latency_ms)
+
+
+def get_supabase_client() -> Client | FakeSupabaseClient | None:
     """Create a Supabase client using service-role creds when available.
 
     Uses env vars:
     - SUPABASE_URL
     - SUPABASE_SERVICE_ROLE_KEY
+    - SUPABASE_FAKE: when set to 1, return an in-memory FakeSupabaseClient
+      instead (no credentials needed)
+    - SUPABASE_FAKE_LATENCY_MS: simulated latency per fake round trip
     """
 
+    if os.getenv("SUPABASE_FAKE") == "1":
+        return _fake_client(float(os.getenv("SUPABASE_FAKE_LATENCY_MS") or 0))
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
     if not url or not key:
         return None
-    return create_client(url, key)
+
+    from supabase import create_client
+
+    return _instrument(create_client(url, key))
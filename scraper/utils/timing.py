@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True)
+class PhaseTotals:
+    seconds: float = 0.0
+    calls: int = 0
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+class PhaseTimings:
+    """Per-phase totals for one run, keyed by dotted span path.
+
+    Spans of concurrent sources overlap, so phase seconds can add up to more
+    than the run's wall time.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, PhaseTotals] = {}
+
+    def record(self, path: str, seconds: float, counts: dict[str, int]) -> None:
+        totals = self.phases.setdefault(path, PhaseTotals())
+        totals.seconds += seconds
+        totals.calls += 1
+        for key, value in counts.items():
+            totals.counts[key] = totals.counts.get(key, 0) + value
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """JSON-ready breakdown for ``scrape_logs.phase_timings``."""
+
+        return {
+            path: {"seconds": round(totals.seconds, 3), "calls": totals.calls, **totals.counts}
+            for path, totals in self.phases.items()
+        }
+
+
+class Span:
+    """A timed phase; counts added while it is open are reported with it."""
+
+    __slots__ = ("path", "counts", "_recorder", "_started", "_token")
+
+    def __init__(self, path: str, recorder: PhaseTimings, counts: dict[str, int]) -> None:
+        self.path = path
+        self.counts = counts
+        self._recorder = recorder
+        self._started = 0.0
+        self._token: Any = None
+
+    def add(self, **counts: int) -> None:
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def __enter__(self) -> Span:
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_exc: object) -> None:
+        seconds = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        self._recorder.record(self.path, seconds, self.counts)
+        logger.info(
+            "phase_timing",
+            phase=self.path,
+            duration_ms=round(seconds * 1000, 1),
+            failed=exc_type is not None,
+            **self.counts,
+        )
+
+
+class NoopSpan:
+    """Returned when no run is recording, so instrumented code costs one lookup."""
+
+    __slots__ = ()
+
+    def add(self, **_counts: int) -> None:
+        return None
+
+    def __enter__(self) -> NoopSpan:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        return None
+
+
+_NOOP_SPAN = NoopSpan()
+_recorder: ContextVar[PhaseTimings | None] = ContextVar("phase_recorder", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def span(name: str, **counts: int) -> Span | NoopSpan:
+    """Time a phase, nested under whichever span is open in this task.
+
+    Use as ``with span("parse") as s: ...; s.add(units=n)``. Outside
+    ``recording()`` this returns a shared no-op span.
+    """
+
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    path = f"{parent.path}.{name}" if parent is not None else name
+    return Span(path, recorder, dict(counts))
+
+
+def current_span() -> Span | NoopSpan:
+    """The innermost open span, for adding counts from code that did not open it."""
+
+    return _current_span.get() or _NOOP_SPAN
+
+
+@contextmanager
+def recording() -> Iterator[PhaseTimings]:
+    """Collect spans opened in this context (and tasks started from it)."""
+
+    timings = PhaseTimings()
+    token = _recorder.set(timings)
+    try:
+        yield timings
+    finally:
+        _recorder.reset(token)